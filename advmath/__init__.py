@@ -1,36 +1,78 @@
-"""Advanced Mathematics Package"""
+"""Advanced Mathematics Package
+
+Public functions are imported lazily (PEP 562): ``import advmath`` loads no
+submodule, and ``advmath.gcd_iterative`` imports :mod:`advmath.gcd` on first
+access.  ``from advmath import gcd_iterative`` works as before.
+"""
 
 __version__ = "0.2.0"
 
-# Export factorial functions
-from advmath.factorial import factorial_iterative, factorial_recursive
-
-# Export fibonacci functions
-from advmath.fibonacci import fibonacci_iterative, fibonacci_recursive
-
-# Export power functions
-from advmath.power import power_iterative, power_recursive
-
-# Export gcd functions
-from advmath.gcd import gcd_iterative, gcd_recursive
-
-# Export lcm functions
-from advmath.lcm import lcm_iterative, lcm_recursive
-
-# Export prime functions
-from advmath.prime import is_prime_iterative, is_prime_recursive
-
-__all__ = [
-    "factorial_iterative",
-    "factorial_recursive",
-    "fibonacci_iterative",
-    "fibonacci_recursive",
-    "power_iterative",
-    "power_recursive",
-    "gcd_iterative",
-    "gcd_recursive",
-    "lcm_iterative",
-    "lcm_recursive",
-    "is_prime_iterative",
-    "is_prime_recursive",
-]
\ No newline at end of file
+# Public name -> submodule that defines it
+_EXPORTS = {
+    # factorial functions
+    "factorial_iterative": "advmath.factorial",
+    "factorial_recursive": "advmath.factorial",
+    "factorial_native": "advmath.factorial",
+    # fibonacci functions
+    "fibonacci_iterative": "advmath.fibonacci",
+    "fibonacci_recursive": "advmath.fibonacci",
+    # power functions
+    "power_iterative": "advmath.power",
+    "power_recursive": "advmath.power",
+    "power_native": "advmath.power",
+    # gcd functions
+    "gcd_iterative": "advmath.gcd",
+    "gcd_recursive": "advmath.gcd",
+    "gcd_binary": "advmath.gcd",
+    "gcd_lehmer": "advmath.gcd",
+    "gcd_native": "advmath.gcd",
+    "gcd_fast": "advmath.gcd",
+    "extended_gcd": "advmath.gcd",
+    "mod_inverse": "advmath.gcd",
+    "batch_mod_inverse": "advmath.gcd",
+    "batch_gcd": "advmath.gcd",
+    "crt": "advmath.gcd",
+    "CrtBasis": "advmath.gcd",
+    # lcm functions
+    "lcm_iterative": "advmath.lcm",
+    "lcm_recursive": "advmath.lcm",
+    "lcm_native": "advmath.lcm",
+    "lcm_range": "advmath.lcm",
+    "lcm_range_log": "advmath.lcm",
+    "LcmAccumulator": "advmath.lcm",
+    # prime functions
+    "is_prime_iterative": "advmath.prime",
+    "is_prime_recursive": "advmath.prime",
+    "is_prime_miller_rabin": "advmath.prime",
+    "primes_up_to": "advmath.prime",
+    "prime_certificate": "advmath.prime",
+    "verify_certificate": "advmath.prime",
+    "PrimalityCertificate": "advmath.prime",
+    # arithmetic functions
+    "euler_phi": "advmath.arithmetic",
+    "carmichael": "advmath.arithmetic",
+    "divisors": "advmath.arithmetic",
+    "multiplicative_order": "advmath.arithmetic",
+    # backend selection
+    "set_backend": "advmath.backend",
+    "get_backend": "advmath.backend",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
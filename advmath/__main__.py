@@ -1,6 +1,6 @@
 """CLI entry point for Advanced Mathematics package"""
 
-from advmath.cli import app
+from advmath.launcher import main
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    main()
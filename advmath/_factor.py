@@ -0,0 +1,162 @@
+"""Integer factorisation kernels shared by the number-theory code.
+
+Trial division by a table of small primes, then Pollard's p − 1 method and
+Pollard's rho with Brent's cycle detection for what is left.  These helpers
+are internal; they perform no validation.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import gcd, isqrt
+from typing import Optional
+
+from advmath.prime import _miller_rabin_kernel
+
+# Trial division bound: p − 1 and rho are only tried on cofactors without factors below.
+_TRIAL_BOUND = 1 << 12
+
+# Stage 1 bound of Pollard's p − 1 method.
+_PM1_BOUND = 1 << 16
+
+# Products of GCD accumulation in Brent's loop between actual gcd() calls.
+_BATCH = 128
+
+
+def _small_primes(bound: int) -> list[int]:
+    sieve = bytearray([1]) * bound
+    sieve[0] = sieve[1] = 0
+    for p in range(2, isqrt(bound - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, bound, p)))
+    return [p for p, flag in enumerate(sieve) if flag]
+
+
+_SMALL_PRIMES = _small_primes(_TRIAL_BOUND)
+
+
+def trial_divide(n: int, factors: dict[int, int]) -> int:
+    """Divide the primes below ``_TRIAL_BOUND`` out of ``n >= 1``, adding
+    them to *factors*, and return the cofactor."""
+    for p in _SMALL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            count = 0
+            while n % p == 0:
+                n //= p
+                count += 1
+            factors[p] = factors.get(p, 0) + count
+    if 1 < n < _TRIAL_BOUND * _TRIAL_BOUND:
+        # No factor below the bound, so what is left is prime.
+        factors[n] = factors.get(n, 0) + 1
+        n = 1
+    return n
+
+
+def pollard_pm1(n: int, bound: int = _PM1_BOUND) -> Optional[int]:
+    """Return a non-trivial factor *d* of the odd composite *n* for which
+    ``d − 1`` is *bound*-smooth, or ``None``."""
+    a = 2
+    for i, p in enumerate(_primes_below(bound)):
+        power = p
+        while power * p <= bound:
+            power *= p
+        a = pow(a, power, n)
+        if i % 64 == 63:
+            g = gcd(a - 1, n)
+            if g == n:
+                return None
+            if g > 1:
+                return g
+    g = gcd(a - 1, n)
+    return g if 1 < g < n else None
+
+
+@lru_cache(maxsize=4)
+def _primes_below(bound: int) -> list[int]:
+    return _SMALL_PRIMES if bound == _TRIAL_BOUND else _small_primes(bound)
+
+
+def pollard_rho(n: int, max_iterations: Optional[int] = None) -> Optional[int]:
+    """Return a non-trivial factor of the odd composite *n*, or ``None`` if
+    none was found within *max_iterations* steps (per polynomial)."""
+    limit = max_iterations if max_iterations is not None else 1 << 62
+    for c in range(1, 20):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        steps = 0
+        while g == 1 and steps < limit:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(_BATCH, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += _BATCH
+            steps += r
+            r *= 2
+        if g == n:
+            # The batch overshot: step back one at a time.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if 1 < g < n:
+            return g
+        if steps >= limit:
+            return None
+    return None
+
+
+def _split(m: int, max_iterations: Optional[int]) -> Optional[int]:
+    """Return a non-trivial factor of the composite *m* (no factor below
+    ``_TRIAL_BOUND``), or ``None``."""
+    root = isqrt(m)
+    if root * root == m:
+        return root
+    return pollard_pm1(m) or pollard_rho(m, max_iterations)
+
+
+def factorize(
+    n: int,
+    max_iterations: Optional[int] = None,
+    target: Optional[int] = None,
+) -> tuple[dict[int, int], int]:
+    """Factor ``n >= 1`` as far as possible.
+
+    Returns ``(factors, cofactor)``: a ``{prime: exponent}`` dict and the
+    product of the parts left unfactored (``1`` when *n* was factored
+    completely).  Primes above ``_TRIAL_BOUND`` are probable primes
+    (Miller–Rabin; exact below ``3.3e24``).  With *target*, stops splitting
+    as soon as the factored part reaches it, smallest parts first.
+    """
+    factors: dict[int, int] = {}
+    rest = trial_divide(n, factors)
+    pending = [rest] if rest > 1 else []
+    unsplit = 1
+    while pending:
+        if target is not None and n // (unsplit * _product(pending)) >= target:
+            break
+        pending.sort(reverse=True)
+        m = pending.pop()
+        if _miller_rabin_kernel(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _split(m, max_iterations)
+        if d is None:
+            unsplit *= m
+        else:
+            pending += (d, m // d)
+    return factors, unsplit * _product(pending)
+
+
+def _product(values: list[int]) -> int:
+    result = 1
+    for value in values:
+        result *= value
+    return result
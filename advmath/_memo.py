@@ -0,0 +1,119 @@
+"""Memoisation for the recursive kernels, safe under free threading.
+
+On a regular build :func:`memoize` is ``functools.lru_cache(maxsize=None)``:
+the GIL already serialises the threads, and the C implementation is the
+fastest option.  On a free-threaded build (``python3.13t`` with the GIL
+disabled) every lookup in one ``lru_cache`` contends for that cache's lock,
+so :func:`memoize` returns a :class:`ShardedCache` instead: the table is
+split into shards by key hash, each with its own lock, and the wrapped
+function runs outside any lock.
+
+Both flavours guarantee that concurrent calls never corrupt the table or
+return a wrong value.  Two threads that miss on the same key at the same
+time may both compute it; one result is kept.  ``ADVMATH_SHARDED_CACHES=1``
+selects the sharded flavour on a regular build too.
+
+Because :class:`ShardedCache` is implemented in Python, every level of a
+memoised recursion costs one extra interpreter frame, so the recursive
+variants reach the recursion limit at about half the input size.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import threading
+from typing import Any, Callable, NamedTuple, Optional
+
+# True on a free-threaded interpreter running without the GIL.
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Number of shards (a power of two): comfortably above typical core counts.
+DEFAULT_SHARDS = 64
+
+
+class CacheInfo(NamedTuple):
+    """Same fields as ``functools.lru_cache().cache_info()``."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class _Shard:
+    __slots__ = ("lock", "table", "hits", "misses")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.table: dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+
+class ShardedCache:
+    """Unbounded memo of a function of hashable positional arguments,
+    with one lock per shard.
+
+    Exposes ``cache_info()`` and ``cache_clear()`` like ``lru_cache``.
+    """
+
+    def __init__(self, func: Callable[..., Any], shards: int = DEFAULT_SHARDS) -> None:
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._mask = shards - 1
+        self._shards = tuple(_Shard() for _ in range(shards))
+
+    def __call__(self, *args: Any) -> Any:
+        shard = self._shards[hash(args) & self._mask]
+        with shard.lock:
+            try:
+                value = shard.table[args]
+            except KeyError:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                return value
+        value = self._func(*args)
+        with shard.lock:
+            return shard.table.setdefault(args, value)
+
+    def cache_info(self) -> CacheInfo:
+        hits = misses = size = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                size += len(shard.table)
+        return CacheInfo(hits, misses, None, size)
+
+    def cache_clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.table.clear()
+                shard.hits = shard.misses = 0
+
+
+SHARDED = FREE_THREADED or os.environ.get("ADVMATH_SHARDED_CACHES") == "1"
+
+
+def memoize(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Unbounded memoisation suited to the running interpreter (see the
+    module docstring)."""
+    if SHARDED:
+        return ShardedCache(func)
+    return functools.lru_cache(maxsize=None)(func)
+
+
+def share_cache(public: Callable[..., Any], kernel: Callable[..., Any]) -> None:
+    """Expose the memo of *kernel* as ``cache_info`` / ``cache_clear`` of
+    the validating *public* function that calls it.
+
+    The memo lives on the kernel, not on the public function, so that
+    arguments are validated once per call, not once per recursion level.
+    """
+    public.cache_info = kernel.cache_info
+    public.cache_clear = kernel.cache_clear
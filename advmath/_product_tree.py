@@ -0,0 +1,38 @@
+"""Balanced product trees shared by the batch algorithms.
+
+Multiplying a long list of integers left to right makes every step pay for
+the full size of the running product.  Pairing neighbours level by level keeps
+operands balanced so CPython's Karatsuba multiplication is used efficiently.
+These helpers are internal; they perform no validation.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+
+def _next_level(level: list[int]) -> list[int]:
+    """Multiply neighbouring pairs of *level*; an odd tail is carried up."""
+    return [
+        level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+        for i in range(0, len(level), 2)
+    ]
+
+
+def product_tree(values: Iterable[int]) -> list[list[int]]:
+    """Return all levels of the product tree, leaves first, root last.
+
+    An empty input yields a single level holding the empty product ``1``.
+    """
+    levels = [list(values) or [1]]
+    while len(levels[-1]) > 1:
+        levels.append(_next_level(levels[-1]))
+    return levels
+
+
+def tree_product(values: Iterable[int]) -> int:
+    """Return the product of *values*, multiplied as a balanced tree."""
+    level = list(values) or [1]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
@@ -0,0 +1,33 @@
+"""Whole-batch argument checks shared by the batch functions.
+
+Per-element ``isinstance`` and sign checks cost more than the arithmetic for
+small operands.  These helpers check a whole sequence with a couple of
+C-level passes; callers fall back to their per-element checks only when a
+batch fails, so error messages stay exactly the same.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+# array.array type codes holding integers, and the unsigned ones among them.
+_INT_TYPECODES = frozenset("bBhHiIlLqQ")
+_UNSIGNED_TYPECODES = frozenset("BHILQ")
+
+
+def all_ints(values: Any) -> bool:
+    """Return ``True`` if every element of the sequence *values* is an
+    :class:`int` (``bool`` excluded).  Integer arrays are accepted without
+    looking at their elements."""
+    if isinstance(values, array):
+        return values.typecode in _INT_TYPECODES
+    return set(map(type, values)) <= {int}
+
+
+def all_at_least(values: Any, minimum: int) -> bool:
+    """Return ``True`` if *values* are all integers ``>= minimum`` (an empty
+    sequence qualifies)."""
+    if isinstance(values, array) and values.typecode in _UNSIGNED_TYPECODES and minimum <= 0:
+        return True
+    return all_ints(values) and (not len(values) or min(values) >= minimum)
@@ -0,0 +1,370 @@
+"""Awaitable versions of the public functions for asyncio services.
+
+Every function in ``advmath.__all__`` has a coroutine counterpart of the same
+name here::
+
+    import asyncio
+    from advmath import aio
+
+    async def main():
+        small = await aio.gcd_iterative(48, 64)            # runs inline
+        big = await aio.is_prime_iterative(10**15 + 37)    # runs in a worker
+
+    asyncio.run(main())
+
+Calls whose cost estimate (:func:`advmath.cost.estimate`) is below
+``inline_seconds`` run directly on the event loop; blocking it for that long
+is cheaper than a round trip to another process.  Everything else is sent to
+a shared pool of long-lived worker processes.  Processes rather than threads
+are used because a thread cannot be interrupted: cancelling an offloaded call
+(``task.cancel()``, :func:`asyncio.wait_for` timeouts, ...) terminates the
+worker running it, and a fresh worker is started on demand.
+
+The number of concurrent offloaded calls is limited per function (see
+:func:`set_limit`) and overall by the pool size (see :func:`configure`).
+
+Primes proven by an offloaded :func:`~advmath.prime.prime_certificate` or
+:func:`~advmath.prime.verify_certificate` are added to this process's cache
+of proven primes too, so later ``is_prime_*`` calls here answer them without
+testing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+import advmath
+
+# Estimated run time below which a call is evaluated on the event loop.
+DEFAULT_INLINE_SECONDS = 1e-3
+
+_settings: dict[str, Any] = {
+    "inline_seconds": DEFAULT_INLINE_SECONDS,
+    "max_workers": os.cpu_count() or 1,
+}
+
+# Function name -> maximum concurrent offloaded calls (default: pool size).
+_limits: dict[str, int] = {}
+
+# Public names that are not calculations (or, like the divisors() generator,
+# return nothing that could be sent back from a worker).
+_EXCLUDED = {
+    "LcmAccumulator", "PrimalityCertificate", "CrtBasis", "set_backend", "get_backend", "divisors",
+}
+
+# Simple-size functions outside the registry: seconds per unit of n.
+_LINEAR_COST = {"primes_up_to": 5e-8, "lcm_range": 1e-7, "lcm_range_log": 1e-7}
+_GCD_LIKE = {"gcd_fast", "extended_gcd", "mod_inverse"}
+
+
+# ---------------------------------------------------------------------------
+# Inline or offload
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _registry_entry(name: str) -> Optional[tuple[str, str]]:
+    from advmath.registry import _ALGORITHMS
+
+    for op, methods in _ALGORITHMS.items():
+        for method, public in methods.items():
+            if public == name:
+                return op, method
+    return None
+
+
+def estimate_seconds(name: str, *args: Any) -> Optional[float]:
+    """Return the predicted run time of ``advmath.<name>(*args)``, or
+    ``None`` if it cannot be predicted (e.g. for iterable arguments)."""
+    if not args or not all(isinstance(a, int) for a in args):
+        return None
+
+    from advmath.cost import estimate
+
+    entry = _registry_entry(name)
+    if entry is not None:
+        op, method = entry
+        return estimate(op, *args, method=method).seconds
+    if name in _LINEAR_COST:
+        return max(args[0], 0) * _LINEAR_COST[name]
+    if name in _GCD_LIKE and len(args) >= 2:
+        return estimate("gcd", abs(args[0]), abs(args[1])).seconds
+    return None
+
+
+def _runs_inline(name: str, args: tuple, kwargs: dict) -> bool:
+    if kwargs.get("spill_dir") is not None:
+        return False
+    seconds = estimate_seconds(name, *args)
+    return seconds is not None and seconds < _settings["inline_seconds"]
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+def _worker_main(conn) -> None:
+    """Evaluate ``(name, args, kwargs)`` messages until ``None`` arrives."""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        name, args, kwargs = message
+        try:
+            reply = (True, getattr(advmath, name)(*args, **kwargs))
+        except Exception as exc:  # noqa: BLE001 – re-raised in the caller
+            reply = (False, exc)
+        conn.send(reply)
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def call(self, name: str, args: tuple, kwargs: dict) -> Any:
+        """Blocking round trip; runs in a thread of the loop's executor."""
+        try:
+            self.conn.send((name, args, kwargs))
+            return self.conn.recv()
+        except (EOFError, OSError) as exc:
+            raise RuntimeError("advmath.aio worker process exited unexpectedly") from exc
+
+    def kill(self) -> None:
+        # The pipe is left to the thread blocked on it, which sees EOF.
+        self.process.terminate()
+        self.process.join()
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class _Pool:
+    """Idle workers shared by every event loop in the process."""
+
+    def __init__(self) -> None:
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._context = None
+
+    def _new_worker(self) -> _Worker:
+        if self._context is None:
+            methods = multiprocessing.get_all_start_methods()
+            self._context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+        return _Worker(self._context)
+
+    def acquire(self) -> _Worker:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._new_worker()
+
+    def release(self, worker: _Worker) -> None:
+        with self._lock:
+            if len(self._idle) < _settings["max_workers"]:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+_pool = _Pool()
+
+# Event loop -> {"*": pool-size semaphore, name: per-function semaphore};
+# asyncio primitives must not be shared between loops.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_in_flight: dict[str, int] = {}
+
+
+def _semaphore(key: str, size: int) -> asyncio.Semaphore:
+    per_loop = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_loop.get(key)
+    if semaphore is None:
+        semaphore = per_loop[key] = asyncio.Semaphore(size)
+    return semaphore
+
+
+async def _offload(name: str, args: tuple, kwargs: dict) -> Any:
+    limit = _limits.get(name, _settings["max_workers"])
+    async with _semaphore(name, limit), _semaphore("*", _settings["max_workers"]):
+        _in_flight[name] = _in_flight.get(name, 0) + 1
+        loop = asyncio.get_running_loop()
+        acquiring = loop.run_in_executor(None, _pool.acquire)
+        try:
+            worker = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # Hand the worker back once it exists.
+            acquiring.add_done_callback(
+                lambda done: done.exception() is None and _pool.release(done.result())
+            )
+            _in_flight[name] -= 1
+            raise
+        try:
+            ok, value = await loop.run_in_executor(None, worker.call, name, args, kwargs)
+        except BaseException:
+            # Cancelled (or the worker died): stop whatever it is running.
+            worker.kill()
+            raise
+        finally:
+            _in_flight[name] -= 1
+        _pool.release(worker)
+    if not ok:
+        raise value
+    _adopt_proofs(name, args, kwargs, value)
+    return value
+
+
+def _adopt_proofs(name: str, args: tuple, kwargs: dict, value: Any) -> None:
+    """Remember in this process the primes a worker proved, which
+    :mod:`advmath.prime` only remembered in the worker."""
+    if name == "prime_certificate":
+        certificate = value
+    elif name == "verify_certificate" and value is True:
+        certificate = args[0] if args else kwargs.get("certificate")
+    else:
+        return
+    from advmath.prime import PrimalityCertificate, _remember_certificate
+
+    _remember_certificate(PrimalityCertificate(*certificate))
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+async def call(name: str, *args: Any, **kwargs: Any) -> Any:
+    """Evaluate ``advmath.<name>(*args, **kwargs)`` without blocking the
+    event loop for longer than ``inline_seconds``.
+
+    Raises
+    ------
+    AttributeError
+        If *name* is not a public calculation.
+    """
+    if name not in advmath.__all__ or name in _EXCLUDED:
+        raise AttributeError(f"advmath.aio has no function {name!r}")
+    if _runs_inline(name, args, kwargs):
+        return getattr(advmath, name)(*args, **kwargs)
+    return await _offload(name, args, kwargs)
+
+
+def configure(
+    max_workers: Optional[int] = None,
+    inline_seconds: Optional[float] = None,
+) -> None:
+    """Change the pool size and/or the inline threshold.
+
+    Raises
+    ------
+    ValueError
+        If *max_workers* is not a positive integer or *inline_seconds* is
+        negative.
+    """
+    if max_workers is not None:
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        _settings["max_workers"] = max_workers
+        _semaphores.clear()
+    if inline_seconds is not None:
+        if not isinstance(inline_seconds, (int, float)) or inline_seconds < 0:
+            raise ValueError("inline_seconds must be non-negative")
+        _settings["inline_seconds"] = float(inline_seconds)
+
+
+def set_limit(name: str, limit: Optional[int]) -> None:
+    """Allow at most *limit* concurrent offloaded calls of *name*
+    (``None`` restores the default, the pool size).
+
+    Raises
+    ------
+    ValueError
+        If *limit* is not a positive integer.
+    """
+    if limit is None:
+        _limits.pop(name, None)
+    elif not isinstance(limit, int) or limit < 1:
+        raise ValueError("Limit must be a positive integer")
+    else:
+        _limits[name] = limit
+    for per_loop in _semaphores.values():
+        per_loop.pop(name, None)
+
+
+def in_flight(name: Optional[str] = None) -> int:
+    """Return the number of offloaded calls of *name* (default: all
+    functions) currently running in workers."""
+    if name is None:
+        return sum(_in_flight.values())
+    return _in_flight.get(name, 0)
+
+
+def shutdown() -> None:
+    """Stop the idle worker processes.  New ones start on demand."""
+    _pool.shutdown()
+
+
+def _coroutine(name: str) -> Callable[..., Any]:
+    target = getattr(advmath, name)
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await call(name, *args, **kwargs)
+
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__doc__ = f"Awaitable :func:`advmath.{name}`.\n\n{target.__doc__ or ''}"
+    return wrapper
+
+
+_FUNCTIONS = [name for name in advmath.__all__ if name not in _EXCLUDED]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _FUNCTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _coroutine(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = [
+    "DEFAULT_INLINE_SECONDS",
+    "call",
+    "configure",
+    "estimate_seconds",
+    "in_flight",
+    "set_limit",
+    "shutdown",
+    *_FUNCTIONS,
+]
@@ -0,0 +1,258 @@
+"""Arithmetic functions of a single integer.
+
+- :func:`euler_phi` – Euler's totient φ(n).
+- :func:`carmichael` – Carmichael's function λ(n), the exponent of the
+  multiplicative group modulo *n*.
+- :func:`divisors` – the divisors of *n*, generated lazily in increasing
+  order.
+- :func:`multiplicative_order` – the order of *a* modulo *n*.
+
+All of them start from the prime factorisation of *n* (trial division, then
+Pollard's p − 1 and rho, see :mod:`advmath._factor`).  The factorisations
+of the last :data:`FACTORIZATION_CACHE_SIZE` distinct *n* are kept, so asking
+several of these functions about the same *n* factors it only once::
+
+    >>> from advmath.arithmetic import carmichael, euler_phi
+    >>> n = 2**64 + 1                   # 274177 * 67280421310721
+    >>> euler_phi(n), carmichael(n)     # factors n once
+    (18446676793287966720, 72057331223781120)
+
+For every ``k <= n`` at once, use the tables of :mod:`advmath.sieve`
+instead.
+"""
+
+from __future__ import annotations
+
+import functools
+import heapq
+from typing import Iterator
+
+from advmath import backend
+from advmath._factor import factorize
+from advmath.gcd import _euclid_kernel
+
+# Number of recent factorisations kept (least recently used are dropped).
+FACTORIZATION_CACHE_SIZE = 1024
+
+
+# ---------------------------------------------------------------------------
+# Validation helpers
+# ---------------------------------------------------------------------------
+
+def _validate_positive(n: int) -> None:
+    """Validate that *n* is a positive integer.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an :class:`int`.
+    ValueError
+        If *n* is not positive.
+    """
+    if not isinstance(n, int):
+        raise TypeError("Arithmetic functions require an integer")
+    if n < 1:
+        raise ValueError("Must be a positive integer")
+
+
+# ---------------------------------------------------------------------------
+# Factorisation
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=FACTORIZATION_CACHE_SIZE)
+def _factorization(n: int) -> tuple[tuple[int, int], ...]:
+    """``((p, e), ...)`` with ``n == prod(p**e)``, primes increasing."""
+    factors, cofactor = factorize(n)
+    if cofactor != 1:
+        raise ValueError(f"Could not factor {cofactor}")
+    return tuple(sorted(factors.items()))
+
+
+def _prime_power_lambda(p: int, e: int) -> int:
+    if p == 2 and e >= 3:
+        return 1 << (e - 2)
+    return backend.current().power(p, e - 1) * (p - 1)
+
+
+def _carmichael_kernel(n: int) -> int:
+    lcm = backend.current().lcm
+    result = 1
+    for p, e in _factorization(n):
+        result = lcm(result, _prime_power_lambda(p, e))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def euler_phi(n: int) -> int:
+    """Return Euler's totient φ(n), the number of ``1 <= k <= n`` coprime
+    to *n*.
+
+    Parameters
+    ----------
+    n : int
+        Positive integer.
+
+    Returns
+    -------
+    int
+        ``prod(p**(e - 1) * (p - 1))`` over the prime powers ``p**e`` of *n*.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an integer.
+    ValueError
+        If *n* is not positive.
+
+    Examples
+    --------
+    >>> euler_phi(36)
+    12
+    >>> euler_phi(1)
+    1
+    """
+    _validate_positive(n)
+    power = backend.current().power
+    result = 1
+    for p, e in _factorization(n):
+        result *= power(p, e - 1) * (p - 1)
+    return result
+
+
+def carmichael(n: int) -> int:
+    """Return Carmichael's function λ(n), the smallest ``m >= 1`` with
+    ``a**m ≡ 1 (mod n)`` for every *a* coprime to *n*.
+
+    Parameters
+    ----------
+    n : int
+        Positive integer.
+
+    Returns
+    -------
+    int
+        The LCM of λ over the prime powers of *n*, where
+        ``λ(p**e) = p**(e - 1) * (p - 1)`` except ``λ(2**e) = 2**(e - 2)``
+        for ``e >= 3``.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an integer.
+    ValueError
+        If *n* is not positive.
+
+    Examples
+    --------
+    >>> carmichael(36)
+    6
+    >>> carmichael(561)
+    80
+    """
+    _validate_positive(n)
+    return _carmichael_kernel(n)
+
+
+def divisors(n: int) -> Iterator[int]:
+    """Generate the positive divisors of *n* in increasing order.
+
+    The divisors are produced lazily from a heap, so taking the first few
+    of a highly composite *n* does not build all of them.
+
+    Parameters
+    ----------
+    n : int
+        Positive integer.
+
+    Yields
+    ------
+    int
+        Every divisor of *n*, from ``1`` to *n*.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an integer.
+    ValueError
+        If *n* is not positive.
+
+    Examples
+    --------
+    >>> list(divisors(36))
+    [1, 2, 3, 4, 6, 9, 12, 18, 36]
+    """
+    # Validate (and factor) before the first next(), not inside it.
+    _validate_positive(n)
+    return _divisors(_factorization(n))
+
+
+def _divisors(factors: tuple[tuple[int, int], ...]) -> Iterator[int]:
+    # Every divisor d > 1 is reached once, from d / p where p is the largest
+    # prime of d.  Heap entries are (d, index of that prime, its exponent).
+    heap = [(1, 0, 0)]
+    while heap:
+        d, i, k = heapq.heappop(heap)
+        yield d
+        if k and k < factors[i][1]:
+            heapq.heappush(heap, (d * factors[i][0], i, k + 1))
+        for j in range(i + 1 if k else 0, len(factors)):
+            heapq.heappush(heap, (d * factors[j][0], j, 1))
+
+
+def multiplicative_order(a: int, n: int) -> int:
+    """Return the order of *a* modulo *n*, the smallest ``k >= 1`` with
+    ``a**k ≡ 1 (mod n)``.
+
+    The order divides λ(n); it is found by dividing the prime factors of
+    λ(n) out for as long as ``a**(λ(n) / q) ≡ 1`` still holds.
+
+    Parameters
+    ----------
+    a : int
+        Integer coprime to *n* (reduced modulo *n* first).
+    n : int
+        Positive modulus.
+
+    Returns
+    -------
+    int
+        The multiplicative order of *a* (``1`` for ``n == 1``).
+
+    Raises
+    ------
+    TypeError
+        If *a* or *n* is not an integer.
+    ValueError
+        If *n* is not positive, or *a* is not coprime to *n*.
+
+    Examples
+    --------
+    >>> multiplicative_order(2, 7)
+    3
+    >>> multiplicative_order(10, 17)
+    16
+    """
+    if not isinstance(a, int):
+        raise TypeError("Arithmetic functions require an integer")
+    _validate_positive(n)
+    residue = a % n
+    if _euclid_kernel(residue, n) != 1:
+        raise ValueError(f"{a} is not coprime to {n}")
+    powmod = backend.current().powmod
+    order = _carmichael_kernel(n)
+    for q, _ in _factorization(order):
+        while order % q == 0 and powmod(residue, order // q, n) == 1 % n:
+            order //= q
+    return order
+
+
+__all__ = [
+    "FACTORIZATION_CACHE_SIZE",
+    "carmichael",
+    "divisors",
+    "euler_phi",
+    "multiplicative_order",
+]
@@ -0,0 +1,230 @@
+"""Pluggable arithmetic backends.
+
+The ``*_native`` functions (``method="native"`` in :mod:`advmath.registry`)
+and the primality kernels hand their arithmetic to the active backend:
+
+``"gmpy2"``
+    GMP through :mod:`gmpy2`, if it is installed.
+``"stdlib"``
+    CPython's C routines: :func:`math.factorial`, :func:`math.gcd`,
+    :func:`math.lcm`, :func:`math.isqrt` and :func:`pow`.
+``"python"``
+    The package's own pure Python algorithms, kept as a reference.
+
+The first available backend in that order is used unless the
+``ADVMATH_BACKEND`` environment variable or :func:`set_backend` says
+otherwise::
+
+    >>> from advmath import backend
+    >>> previous = backend.get_backend()
+    >>> backend.set_backend("python")
+    'python'
+    >>> backend.current().gcd(48, 64)
+    16
+    >>> _ = backend.set_backend(previous)
+
+Backend functions are unchecked kernels: arguments are validated by the
+public functions before dispatch, so every backend raises the same errors.
+The backend is resolved on first use, so importing this module never imports
+:mod:`gmpy2`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import os
+from typing import Callable, NamedTuple, Optional
+
+BACKENDS = ("gmpy2", "stdlib", "python")
+
+BACKEND_ENV = "ADVMATH_BACKEND"
+
+
+class Backend(NamedTuple):
+    """Kernels of one backend.  All take and return :class:`int`."""
+
+    name: str
+    factorial: Callable[[int], int]
+    gcd: Callable[[int, int], int]
+    lcm: Callable[[int, int], int]
+    isqrt: Callable[[int], int]
+    power: Callable[[int, int], int]
+    powmod: Callable[[int, int, int], int]
+
+
+# ---------------------------------------------------------------------------
+# Pure Python kernels
+# ---------------------------------------------------------------------------
+
+def _py_factorial(n: int) -> int:
+    from advmath._product_tree import tree_product
+
+    return tree_product(range(2, n + 1))
+
+
+def _py_gcd(a: int, b: int) -> int:
+    from advmath.gcd import _select_gcd_kernel
+
+    return _select_gcd_kernel(a, b)(a, b)
+
+
+def _py_lcm(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return a // _py_gcd(a, b) * b
+
+
+def _py_isqrt(n: int) -> int:
+    """Newton's iteration from an initial guess above the root."""
+    if n == 0:
+        return 0
+    x = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        y = (x + n // x) // 2
+        if y >= x:
+            return x
+        x = y
+
+
+def _py_power(base: int, exponent: int) -> int:
+    result = 1
+    while exponent:
+        if exponent & 1:
+            result *= base
+        exponent >>= 1
+        if exponent:
+            base *= base
+    return result
+
+
+def _py_powmod(base: int, exponent: int, modulus: int) -> int:
+    result = 1 % modulus
+    base %= modulus
+    while exponent:
+        if exponent & 1:
+            result = result * base % modulus
+        exponent >>= 1
+        base = base * base % modulus
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Backend construction
+# ---------------------------------------------------------------------------
+
+def _make_python() -> Backend:
+    return Backend("python", _py_factorial, _py_gcd, _py_lcm, _py_isqrt, _py_power, _py_powmod)
+
+
+def _make_stdlib() -> Backend:
+    return Backend("stdlib", math.factorial, math.gcd, math.lcm, math.isqrt, pow, pow)
+
+
+def _make_gmpy2() -> Backend:
+    gmpy2 = importlib.import_module("gmpy2")
+    mpz = gmpy2.mpz
+
+    def power(base, exponent):
+        # gmpy2 only handles integers; other bases (e.g. floats) use pow.
+        if type(base) is not int:
+            return pow(base, exponent)
+        return int(mpz(base) ** exponent)
+
+    return Backend(
+        "gmpy2",
+        lambda n: int(gmpy2.fac(n)),
+        lambda a, b: int(gmpy2.gcd(a, b)),
+        lambda a, b: int(gmpy2.lcm(a, b)),
+        lambda n: int(gmpy2.isqrt(n)),
+        power,
+        lambda base, exponent, modulus: int(gmpy2.powmod(base, exponent, modulus)),
+    )
+
+
+_FACTORIES: dict[str, Callable[[], Backend]] = {
+    "gmpy2": _make_gmpy2,
+    "stdlib": _make_stdlib,
+    "python": _make_python,
+}
+
+_active: Optional[Backend] = None
+
+
+def _load(name: str) -> Optional[Backend]:
+    try:
+        return _FACTORIES[name]()
+    except ImportError:
+        return None
+
+
+def _backend_error() -> ValueError:
+    names = [f"'{name}'" for name in ("auto", *BACKENDS)]
+    return ValueError(f"Backend must be {', '.join(names[:-1])} or {names[-1]}")
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def available_backends() -> list[str]:
+    """Return the backends that can be used on this interpreter, fastest
+    first."""
+    return [name for name in BACKENDS if _load(name) is not None]
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the backend and return its name.
+
+    Parameters
+    ----------
+    name : str
+        ``"gmpy2"``, ``"stdlib"``, ``"python"`` or ``"auto"`` (the fastest
+        available one).  Case-insensitive.
+
+    Raises
+    ------
+    ValueError
+        If *name* is unknown, or names a backend that is not installed.
+    """
+    global _active
+    if not isinstance(name, str):
+        raise _backend_error()
+    name = name.lower()
+    if name == "auto":
+        for candidate in BACKENDS:
+            backend = _load(candidate)
+            if backend is not None:
+                break
+    elif name in _FACTORIES:
+        backend = _load(name)
+        if backend is None:
+            raise ValueError(f"Backend {name!r} is not available (is it installed?)")
+    else:
+        raise _backend_error()
+    _active = backend
+    return backend.name
+
+
+def current() -> Backend:
+    """Return the active backend, choosing it on first use from
+    ``$ADVMATH_BACKEND`` (default ``"auto"``)."""
+    if _active is None:
+        set_backend(os.environ.get(BACKEND_ENV) or "auto")
+    return _active
+
+
+def get_backend() -> str:
+    """Return the name of the active backend."""
+    return current().name
+
+
+__all__ = [
+    "BACKENDS",
+    "BACKEND_ENV",
+    "Backend",
+    "available_backends",
+    "current",
+    "get_backend",
+    "set_backend",
+]
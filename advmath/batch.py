@@ -0,0 +1,254 @@
+"""Batch (NDJSON) processing for the CLI.
+
+Each input line is a JSON object describing one calculation, for example::
+
+    {"op": "gcd", "args": [48, 64], "method": "recursive", "id": 7}
+
+and produces exactly one JSON output line holding either ``result`` or
+``error``.  Errors are reported inline so that one bad record does not abort
+the stream.  Input is consumed lazily and output is flushed every
+``chunk_size`` records, so memory use is constant and results appear promptly
+when used in a Unix pipe.
+
+With ``jobs > 1`` records are evaluated in a pool of worker processes.  The
+input is still read in bounded windows of ``chunk_size * jobs`` lines, so
+memory stays constant however long the stream is.  Workers live for the whole
+run, which means the ``lru_cache``s of the recursive implementations are
+built once per worker and reused by every record it handles.
+
+This module deliberately does not import :mod:`typer`; the CLI's ``batch``
+command is a thin wrapper around :func:`run_batch`.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+from advmath.registry import compute
+
+# Request operation name (matching the CLI commands) -> registry operation.
+# Implementations are resolved through :mod:`advmath.registry`, which imports
+# only the math modules a stream actually uses.
+_OPERATIONS: dict[str, str] = {
+    "fact": "factorial",
+    "gcd": "gcd",
+    "lcm": "lcm",
+    "prime": "prime",
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _registry_op(op: Any) -> str:
+    """Return the registry operation for the request operation *op*.
+
+    Raises
+    ------
+    ValueError
+        If the operation is unknown.
+    """
+    try:
+        return _OPERATIONS[op]
+    except (KeyError, TypeError):
+        raise ValueError(
+            f"Unknown operation {op!r}; expected one of: {', '.join(_OPERATIONS)}"
+        ) from None
+
+
+def process_record(
+    record: Any,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> dict[str, Any]:
+    """Evaluate one decoded request and return the response object.
+
+    The response echoes ``op``, ``args`` and (if present) ``id`` and adds
+    either ``result`` or ``error``.  Never raises for bad input.
+
+    A record may carry its own ``max_seconds`` / ``max_result_bits``; they
+    override the limits passed here (see :mod:`advmath.cost`).
+    """
+    if not isinstance(record, dict):
+        return {"error": "Record must be a JSON object"}
+
+    response: dict[str, Any] = {}
+    if "id" in record:
+        response["id"] = record["id"]
+    op = record.get("op")
+    args = record.get("args", [])
+    response["op"] = op
+    response["args"] = args
+    try:
+        if not isinstance(args, list):
+            raise ValueError("'args' must be a JSON array")
+        response["result"] = compute(
+            _registry_op(op),
+            *args,
+            method=record.get("method", "iterative"),
+            max_seconds=record.get("max_seconds", max_seconds),
+            max_result_bits=record.get("max_result_bits", max_result_bits),
+        )
+    except Exception as exc:  # noqa: BLE001 – reported inline per record
+        response["error"] = str(exc)
+    return response
+
+
+# Integer results with more bits than this are written with the fast decimal
+# converter; ``json.dumps`` would hit the int-to-str digit limit and is
+# quadratic anyway.
+_BIG_RESULT_BITS = 8000
+
+
+def encode_response(response: dict[str, Any]) -> str:
+    """Serialise *response*, turning encoding failures into inline errors.
+
+    Huge integer results are still emitted as JSON numbers.
+    """
+    result = response.get("result")
+    if type(result) is int and result.bit_length() > _BIG_RESULT_BITS:
+        from advmath.output import to_decimal_string
+
+        rest = {k: v for k, v in response.items() if k != "result"}
+        head = json.dumps(rest)[:-1]
+        return f'{head}{", " if rest else ""}"result": {to_decimal_string(result)}}}'
+    try:
+        return json.dumps(response)
+    except ValueError as exc:
+        response.pop("result", None)
+        response["error"] = str(exc)
+        return json.dumps(response)
+
+
+def _handle_line(
+    item: tuple[int, str],
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> Optional[tuple[str, bool]]:
+    """Decode, evaluate and encode one numbered input line.
+
+    Returns ``None`` for blank lines, otherwise the encoded response and
+    whether it is an error.  Runs in worker processes when ``jobs > 1``.
+    """
+    lineno, line = item
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        response = {"error": f"Invalid JSON: {exc}"}
+    else:
+        response = process_record(record, max_seconds, max_result_bits)
+    response = {"line": lineno, **response}
+    return encode_response(response), "error" in response
+
+
+def _init_worker() -> None:
+    """Pool initializer: leave Ctrl-C handling to the parent process."""
+    import signal
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _windows(items: Iterator[tuple[int, str]], size: int) -> Iterator[list[tuple[int, str]]]:
+    """Yield consecutive lists of at most *size* items."""
+    while True:
+        window = list(islice(items, size))
+        if not window:
+            return
+        yield window
+
+
+def _parallel_results(
+    handle: Callable[[tuple[int, str]], Optional[tuple[str, bool]]],
+    numbered: Iterator[tuple[int, str]],
+    chunk_size: int,
+    jobs: int,
+    ordered: bool,
+) -> Iterator[Optional[tuple[str, bool]]]:
+    """Evaluate *numbered* lines in a process pool, one bounded window at a
+    time."""
+    import multiprocessing
+
+    window_size = chunk_size * jobs
+    pool_chunksize = max(1, chunk_size // 4)
+    with multiprocessing.Pool(jobs, initializer=_init_worker) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for window in _windows(numbered, window_size):
+            yield from mapper(handle, window, pool_chunksize)
+
+
+def run_batch(
+    lines: Iterable[str],
+    out: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    jobs: int = 1,
+    ordered: bool = True,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> int:
+    """Process NDJSON *lines* and write one NDJSON response per request.
+
+    Blank lines are skipped.  Every response carries the 1-based input
+    ``line`` number.  *out* is flushed after every *chunk_size* responses
+    and once at the end.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Input lines, consumed lazily.
+    out : TextIO
+        Stream receiving the responses.
+    chunk_size : int
+        Flush interval; with ``jobs > 1`` also the number of lines handed to
+        each worker per window.
+    jobs : int
+        Number of worker processes.  ``1`` evaluates in-process.
+    ordered : bool
+        With ``jobs > 1``, ``False`` writes responses as soon as they are
+        ready instead of in input order (use the ``line`` field to match
+        them up).
+    max_seconds, max_result_bits : optional
+        Default per-record budget (see :mod:`advmath.cost`); over-budget
+        records get an inline error.
+
+    Returns
+    -------
+    int
+        The number of responses that carry an ``error``.
+    """
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    if not isinstance(jobs, int) or jobs < 1:
+        raise ValueError("Jobs must be a positive integer")
+
+    handle = functools.partial(
+        _handle_line, max_seconds=max_seconds, max_result_bits=max_result_bits
+    )
+    numbered = enumerate(lines, start=1)
+    if jobs == 1:
+        results = map(handle, numbered)
+    else:
+        results = _parallel_results(handle, numbered, chunk_size, jobs, ordered)
+
+    errors = 0
+    pending = 0
+    for result in results:
+        if result is None:
+            continue
+        encoded, is_error = result
+        errors += is_error
+
+        out.write(encoded)
+        out.write("\n")
+        pending += 1
+        if pending >= chunk_size:
+            out.flush()
+            pending = 0
+    out.flush()
+    return errors
+
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "encode_response", "process_record", "run_batch"]
@@ -0,0 +1,367 @@
+"""Benchmark suite comparing the package's implementations.
+
+For every operation the suite sweeps a range of input sizes and times each
+registered method (see :mod:`advmath.registry`) next to the standard library
+equivalent where one exists (``math.factorial``, ``math.gcd``, ``math.lcm``,
+``pow``) and the unchecked :mod:`advmath.fast` kernel, so the cost of argument
+validation shows up as the gap between ``native`` and ``fast``.  Factorial is
+also timed as ``parallel`` (``factorial_native(n, workers=...)`` with one
+worker per CPU, at least two) at the sizes where the process pool is used;
+the pool is started once and reused by every repeat, and those results carry
+a ``speedup`` over ``native`` at the same size::
+
+    >>> from advmath.bench import run_benchmarks
+    >>> report = run_benchmarks(["gcd"], quick=True, repeat=3)
+    >>> sorted(report["results"][0])[:4]
+    ['max_seconds', 'mean_seconds', 'method', 'min_seconds']
+
+Each result records latency percentiles, throughput and the peak memory
+allocated by one call (measured separately under :mod:`tracemalloc`, which
+would otherwise distort the timings).  Reports are plain JSON; :func:`compare`
+flags results that got slower or hungrier than a saved baseline report.
+
+Recursive implementations are memoised, so their caches are cleared before
+every call.  Once a method fails at some size (typically ``RecursionError``),
+the larger sizes of that method are skipped.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import platform
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Optional
+
+from advmath.profiling import clear_caches
+from advmath.registry import _ALGORITHMS, resolve
+
+REPORT_VERSION = 1
+
+# Standard library reference implementations.
+_REFERENCES: dict[str, Callable[..., Any]] = {
+    "factorial": math.factorial,
+    "power": pow,
+    "gcd": math.gcd,
+    "lcm": math.lcm,
+}
+
+# Operation -> (meaning of "size", full sweep, quick sweep)
+_SIZES: dict[str, tuple[str, list[int], list[int]]] = {
+    "factorial": ("n", [100, 1000, 10_000, 100_000], [100, 1000, 10_000]),
+    "fibonacci": ("n", [100, 1000, 10_000, 100_000], [100, 1000, 10_000]),
+    "power": ("exponent", [100, 1000, 10_000, 100_000], [100, 1000, 10_000]),
+    "gcd": ("bits", [64, 1024, 8192, 65_536], [64, 1024, 8192]),
+    "lcm": ("bits", [64, 1024, 8192, 65_536], [64, 1024, 8192]),
+    "prime": ("bits", [16, 24, 32, 40], [16, 24, 32]),
+}
+
+OPERATIONS = tuple(_SIZES)
+
+# Relative slowdown (or memory growth) reported as a regression.
+DEFAULT_THRESHOLD = 0.25
+
+
+def _make_args(op: str, size: int, rng: random.Random) -> tuple:
+    if op in ("factorial", "fibonacci"):
+        return (size,)
+    if op == "power":
+        return (3, size)
+    if op in ("gcd", "lcm"):
+        # Share a factor so the result is not trivially 1.
+        common = rng.getrandbits(size // 4) | 1
+        return tuple(
+            common * (rng.getrandbits(size - size // 4) | (1 << (size - size // 4 - 1)))
+            for _ in range(2)
+        )
+    # prime: the largest prime below 2**size is the worst case for trial
+    # division.
+    from advmath.prime import _miller_rabin_kernel
+
+    n = (1 << size) - 1
+    while not _miller_rabin_kernel(n):
+        n -= 2
+    return (n,)
+
+
+def _implementations(op: str, methods: Optional[Iterable[str]]) -> dict[str, Callable[..., Any]]:
+    names = list(methods) if methods is not None else [*_ALGORITHMS[op], "math", "fast", "parallel"]
+    impls = {}
+    for name in names:
+        if name == "parallel":
+            if op == "factorial":
+                workers = max(2, os.cpu_count() or 1)
+                impls[name] = functools.partial(resolve(op, "native"), workers=workers)
+        elif name == "math":
+            if op in _REFERENCES:
+                impls[name] = _REFERENCES[op]
+        elif name == "fast":
+            from advmath import fast
+
+            impls[name] = getattr(fast, "is_prime" if op == "prime" else op)
+        elif name in _ALGORITHMS[op]:
+            impls[name] = resolve(op, name)
+    return impls
+
+
+def _parallel_min() -> int:
+    from advmath import factorial
+
+    return factorial._PARALLEL_MIN
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _peak_bytes(func: Callable[..., Any], args: tuple) -> int:
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        clear_caches()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func(*args)
+        return max(0, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def bench_case(
+    func: Callable[..., Any],
+    args: tuple,
+    repeat: int = 20,
+    max_seconds: float = 1.0,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Time ``func(*args)``.
+
+    Parameters
+    ----------
+    func : callable
+        Function under test.
+    args : tuple
+        Arguments passed on every call.
+    repeat : int
+        Maximum number of timed calls.
+    max_seconds : float
+        Stop early once this much time was spent (at least three calls are
+        always made).
+    memory : bool
+        Also measure peak allocation with :mod:`tracemalloc`.
+
+    Returns
+    -------
+    dict
+        ``samples``, ``min_seconds``, ``p50_seconds``, ``p90_seconds``,
+        ``p99_seconds``, ``max_seconds``, ``mean_seconds``,
+        ``ops_per_second`` and (if *memory*) ``peak_bytes``.
+    """
+    samples: list[float] = []
+    started = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        clear_caches()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+        if len(samples) >= 3 and time.perf_counter() - started >= max_seconds:
+            break
+    ordered = sorted(samples)
+    total = sum(samples)
+    result = {
+        "samples": len(samples),
+        "min_seconds": ordered[0],
+        "p50_seconds": _percentile(ordered, 0.50),
+        "p90_seconds": _percentile(ordered, 0.90),
+        "p99_seconds": _percentile(ordered, 0.99),
+        "max_seconds": ordered[-1],
+        "mean_seconds": total / len(samples),
+        "ops_per_second": len(samples) / total if total > 0 else float("inf"),
+    }
+    if memory:
+        result["peak_bytes"] = _peak_bytes(func, args)
+    return result
+
+
+def _add_speedups(results: list[dict[str, Any]]) -> None:
+    """Give every ``parallel`` result the ratio of the ``native`` median
+    latency to its own."""
+    native = {
+        (e["op"], e["size"]): e["p50_seconds"]
+        for e in results
+        if e["method"] == "native" and "p50_seconds" in e
+    }
+    for entry in results:
+        serial = native.get((entry["op"], entry["size"]))
+        if entry["method"] == "parallel" and serial and entry.get("p50_seconds"):
+            entry["speedup"] = serial / entry["p50_seconds"]
+
+
+def run_benchmarks(
+    ops: Optional[Iterable[str]] = None,
+    methods: Optional[Iterable[str]] = None,
+    sizes: Optional[Iterable[int]] = None,
+    quick: bool = False,
+    repeat: int = 20,
+    max_seconds: float = 1.0,
+    memory: bool = True,
+    seed: int = 39,
+) -> dict[str, Any]:
+    """Sweep input sizes for each operation and return a JSON-ready report.
+
+    Parameters
+    ----------
+    ops : iterable of str, optional
+        Operations to run (default: all of :data:`OPERATIONS`).
+    methods : iterable of str, optional
+        Registry method names, ``"math"`` for the standard library
+        reference, ``"fast"`` for the unchecked kernel and/or
+        ``"parallel"`` for the process-pool factorial (default: all of
+        them).  Names an operation does not have are ignored.
+    sizes : iterable of int, optional
+        Override the per-operation size sweep.
+    quick : bool
+        Use the shorter sweep.
+    repeat, max_seconds, memory
+        Passed to :func:`bench_case`.
+    seed : int
+        Seed for the random operands, so reports are comparable.
+
+    Returns
+    -------
+    dict
+        ``{"version", "python", "implementation", "machine", "results"}``
+        where every result has ``op``, ``method``, ``size``, ``size_unit``
+        and either the :func:`bench_case` fields or an ``error``.
+
+    Raises
+    ------
+    ValueError
+        If an operation is unknown.
+    """
+    ops = list(ops) if ops is not None else list(OPERATIONS)
+    for op in ops:
+        if op not in _SIZES:
+            raise ValueError(f"Unknown operation {op!r}; expected one of {', '.join(OPERATIONS)}")
+
+    rng = random.Random(seed)
+    results = []
+    for op in ops:
+        unit, full, short = _SIZES[op]
+        impls = _implementations(op, methods)
+        failed: set[str] = set()
+        for size in sizes if sizes is not None else (short if quick else full):
+            args = _make_args(op, size, rng)
+            for name, func in impls.items():
+                if name == "parallel" and size < _parallel_min():
+                    # Below the threshold the call is plain native.
+                    continue
+                entry: dict[str, Any] = {"op": op, "method": name, "size": size, "size_unit": unit}
+                if name in failed:
+                    entry["error"] = "skipped"
+                else:
+                    try:
+                        entry.update(bench_case(func, args, repeat, max_seconds, memory))
+                    except (RecursionError, ValueError, OverflowError) as exc:
+                        failed.add(name)
+                        entry["error"] = type(exc).__name__
+                results.append(entry)
+    clear_caches()
+    _add_speedups(results)
+
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def load_report(path: str) -> dict[str, Any]:
+    """Read a report written by :func:`save_report`.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a benchmark report.
+    """
+    with open(path, encoding="utf-8") as fh:
+        report = json.load(fh)
+    if not isinstance(report, dict) or not isinstance(report.get("results"), list):
+        raise ValueError(f"{path} is not an advmath benchmark report")
+    return report
+
+
+def save_report(report: dict[str, Any], path: str) -> None:
+    """Write *report* to *path* as JSON."""
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+        fh.write("\n")
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Return the regressions of *report* relative to *baseline*.
+
+    A result regresses when its median latency (``p50_seconds``) or its
+    ``peak_bytes`` exceeds the baseline value for the same operation,
+    method and size by more than *threshold* (a fraction, ``0.25`` = 25%).
+    Results missing from either report, or that errored, are ignored.
+
+    Returns
+    -------
+    list of dict
+        One ``{"op", "method", "size", "metric", "baseline", "current",
+        "ratio"}`` entry per regressed metric.
+    """
+    if threshold < 0:
+        raise ValueError("Threshold must be non-negative")
+
+    def key(entry: dict[str, Any]) -> tuple:
+        return entry.get("op"), entry.get("method"), entry.get("size")
+
+    previous = {key(e): e for e in baseline.get("results", []) if "error" not in e}
+    regressions = []
+    for entry in report.get("results", []):
+        old = previous.get(key(entry))
+        if old is None or "error" in entry:
+            continue
+        for metric in ("p50_seconds", "peak_bytes"):
+            before, after = old.get(metric), entry.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            if ratio > 1 + threshold:
+                regressions.append({
+                    "op": entry["op"],
+                    "method": entry["method"],
+                    "size": entry["size"],
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "ratio": ratio,
+                })
+    return regressions
+
+
+__all__ = [
+    "DEFAULT_THRESHOLD",
+    "OPERATIONS",
+    "bench_case",
+    "compare",
+    "load_report",
+    "run_benchmarks",
+    "save_report",
+]
@@ -1,61 +1,150 @@
 """CLI for Advanced Mathematics Package.
 
 The CLI has been refactored to centralise method validation, remove duplicate
-error‑handling logic, and provide consistent error messages.  A simple
-``_validate_method`` helper now raises a :class:`ValueError` with the
-standardised message ``"Method must be 'iterative' or 'recursive'"``.  The
+error‑handling logic, and provide consistent error messages.  The
+``_validate_method`` helper checks the ``--method`` option against the
+algorithm registry (:mod:`advmath.registry`) and raises a :class:`ValueError`
+with the standardised message listing the valid methods, e.g.
+``"Method must be 'auto', 'iterative' or 'recursive'"``.  The
 ``handle_errors`` decorator continues to catch any exception and prints it to
 stderr.
 """
 
 from __future__ import annotations
 
+import functools
+import json
 import sys
-from typing import Literal
+from contextlib import contextmanager
+from typing import Optional
 
 import typer
 
-# Import the math routines
-from advmath.factorial import factorial_iterative, factorial_recursive
-from advmath.fibonacci import fibonacci_iterative, fibonacci_recursive
-from advmath.gcd import gcd_iterative, gcd_recursive
-from advmath.lcm import lcm_iterative, lcm_recursive
-from advmath.prime import is_prime_iterative, is_prime_recursive
+# The math routines are resolved through the registry inside the helpers below
+# so that startup (including ``--help``) only pays for the module a command
+# actually uses.
+from advmath.batch import DEFAULT_CHUNK_SIZE, run_batch
 
 app = typer.Typer()
 
+# Resource limits set by the global --max-time / --max-bits options.
+_budget_limits: dict = {"max_seconds": None, "max_result_bits": None}
+
+# Global --timing / --profile options, plus the last computed result so that
+# --timing can report its size.
+_instrumentation: dict = {"timing": False, "profile": None, "result": None}
+
+
+@app.callback()
+def main(
+    max_time: Optional[float] = typer.Option(
+        None,
+        "--max-time",
+        help="Reject or abort calculations predicted or running over this many seconds",
+    ),
+    max_bits: Optional[int] = typer.Option(
+        None,
+        "--max-bits",
+        help="Reject or abort calculations whose result exceeds this many bits",
+    ),
+    timing: bool = typer.Option(
+        False,
+        "--timing",
+        help="Print wall/CPU time, result size and cache activity as JSON on stderr",
+    ),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        help="Profile the command: 'cprofile' prints stats to stderr, anything else is a pstats file to write",
+    ),
+    disk_cache: Optional[str] = typer.Option(
+        None,
+        "--disk-cache",
+        envvar="ADVMATH_DISK_CACHE",
+        help="Reuse and store expensive results in this SQLite file, shared across processes and runs",
+    ),
+    disk_cache_mb: int = typer.Option(
+        256,
+        "--disk-cache-mb",
+        min=1,
+        help="Evict least recently used results beyond this many MiB",
+    ),
+):
+    """Advanced Mathematics command line."""
+    _budget_limits["max_seconds"] = max_time
+    _budget_limits["max_result_bits"] = max_bits
+    _instrumentation["timing"] = timing
+    _instrumentation["profile"] = profile
+    if disk_cache:
+        from advmath import diskcache
+
+        diskcache.enable(disk_cache, max_bytes=disk_cache_mb * 1024 * 1024)
+    elif "advmath.diskcache" in sys.modules:
+        # Left enabled by an earlier invocation in the same process.
+        sys.modules["advmath.diskcache"].disable()
+
 # -------------------------------
 # Utility helpers
 # -------------------------------
 
-CALC_METHOD = Literal["iterative", "recursive"]
+# A method name registered for the operation in :mod:`advmath.registry`, or
+# ``"auto"``.
+CALC_METHOD = str
 
 
-def _validate_method(method: str) -> CALC_METHOD:
-    """Validate the ``method`` option.
+def _validate_method(method: str, op: str) -> CALC_METHOD:
+    """Validate the ``method`` option for the registry operation *op*.
 
     Raises
     ------
     ValueError
-        If *method* is not ``"iterative"`` or ``"recursive"``.
+        If *method* is not ``"auto"`` or a method registered for *op*.
     """
-    if method.lower() not in ("iterative", "recursive"):
-        raise ValueError("Method must be 'iterative' or 'recursive'")
-    return method.lower()  # type: ignore[return-value]
+    from advmath.registry import validate_method
+
+    return validate_method(op, method)
 
 
 # -------------------------------
 # Centralised error handling decorator
 # -------------------------------
 
+@contextmanager
+def _instrumented(command: str):
+    """Apply the global --timing / --profile options around a command."""
+    from advmath.profiling import measure, profiled
+
+    _instrumentation["result"] = None
+    status = "error"
+    try:
+        with measure() as stats, profiled(_instrumentation["profile"]):
+            yield
+        status = "ok"
+    finally:
+        if _instrumentation["timing"]:
+            result = _instrumentation["result"]
+            report = {
+                "command": command,
+                "status": status,
+                "result_bits": result.bit_length() if isinstance(result, int) else None,
+                **stats,
+            }
+            typer.echo(json.dumps({"timing": report}), err=True)
+
+
 def handle_errors(func):
     """Decorator that catches all exceptions, prints an error message to
     stderr, and exits with status code 1.
+
+    It also applies the global ``--timing`` and ``--profile`` options, so
+    every command decorated with it is instrumented.
     """
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):  # pragma: no cover – exercised via CLI tests
         try:
-            return func(*args, **kwargs)
+            with _instrumented(func.__name__):
+                return func(*args, **kwargs)
         except Exception as exc:  # noqa: BLE001 – catching all for CLI
             typer.echo(f"Error: {exc}", err=True)
             sys.exit(1)
@@ -66,25 +155,34 @@ def handle_errors(func):
 # Helper wrappers
 # -------------------------------
 
+def _compute(op: str, *args: int, method: CALC_METHOD) -> int:
+    """Run *op* through the registry with the global budget and remember the
+    result for --timing."""
+    from advmath.registry import compute
+
+    result = compute(op, *args, method=method, **_budget_limits)
+    _instrumentation["result"] = result
+    return result
+
 # Factorial
 
 def _calculate_factorial(n: int, method: CALC_METHOD = "iterative") -> int:
-    return factorial_iterative(n) if method == "iterative" else factorial_recursive(n)
+    return _compute("factorial", n, method=method)
 
 # GCD
 
 def _calculate_gcd(a: int, b: int, method: CALC_METHOD = "iterative") -> int:
-    return gcd_iterative(a, b) if method == "iterative" else gcd_recursive(a, b)
+    return _compute("gcd", a, b, method=method)
 
 # LCM
 
 def _calculate_lcm(a: int, b: int, method: CALC_METHOD = "iterative") -> int:
-    return lcm_iterative(a, b) if method == "iterative" else lcm_recursive(a, b)
+    return _compute("lcm", a, b, method=method)
 
 # Prime
 
 def _check_prime(n: int, method: CALC_METHOD = "iterative") -> bool:
-    return is_prime_iterative(n) if method == "iterative" else is_prime_recursive(n)
+    return _compute("prime", n, method=method)
 
 # -------------------------------
 # Commands
@@ -99,7 +197,7 @@ def fact(
         "--method",
         "-m",
         case_sensitive=False,
-        help="Calculation method (iterative|recursive)",
+        help="Calculation method (auto|iterative|recursive|native)",
     ),
     verbose: bool = typer.Option(
         False,
@@ -107,14 +205,40 @@ def fact(
         "-v",
         help="Show verbose output",
     ),
+    fmt: str = typer.Option(
+        "dec",
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Output format (dec|hex|bin|raw)",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write the result to this file instead of stdout",
+    ),
 ):
     """Calculate factorial of a number."""
-    method = _validate_method(method)
+    from advmath.output import FORMATS, save_int, write_int
+
+    method = _validate_method(method, "factorial")
+    fmt = fmt.lower()
+    if fmt not in FORMATS:
+        raise ValueError("Format must be 'dec', 'hex', 'bin' or 'raw'")
     result = _calculate_factorial(n, method)
+
+    if output is not None:
+        size = save_int(result, output, fmt)
+        if verbose:
+            typer.echo(f"Factorial of {n} written to {output} ({size} bytes)")
+        return
     if verbose:
-        typer.echo(f"Factorial of {n} is {result}")
-    else:
-        typer.echo(result)
+        sys.stdout.write(f"Factorial of {n} is ")
+    write_int(result, sys.stdout, fmt)
+    if fmt != "raw":
+        sys.stdout.write("\n")
+    sys.stdout.flush()
 
 
 @app.command()
@@ -127,11 +251,11 @@ def gcd(
         "--method",
         "-m",
         case_sensitive=False,
-        help="Calculation method (iterative|recursive)",
+        help="Calculation method (auto|iterative|recursive|binary|lehmer|native)",
     ),
 ):
     """Calculate GCD of two numbers."""
-    method = _validate_method(method)
+    method = _validate_method(method, "gcd")
     result = _calculate_gcd(a, b, method)
     typer.echo(f"GCD of {a} and {b} is {result}")
 
@@ -146,11 +270,11 @@ def lcm(
         "--method",
         "-m",
         case_sensitive=False,
-        help="Calculation method (iterative|recursive)",
+        help="Calculation method (auto|iterative|recursive|native)",
     ),
 ):
     """Calculate LCM of two numbers."""
-    method = _validate_method(method)
+    method = _validate_method(method, "lcm")
     result = _calculate_lcm(a, b, method)
     typer.echo(f"LCM of {a} and {b} is {result}")
 
@@ -164,15 +288,170 @@ def prime(
         "--method",
         "-m",
         case_sensitive=False,
-        help="Calculation method (iterative|recursive)",
+        help="Calculation method (auto|iterative|recursive|miller_rabin)",
     ),
 ):
     """Check if a number is prime."""
-    method = _validate_method(method)
+    method = _validate_method(method, "prime")
     result = _check_prime(n, method)
     typer.echo(f"{n} is {'prime' if result else 'not prime'}")
 
 
+@app.command()
+@handle_errors
+def batch(
+    input_file: Optional[str] = typer.Argument(
+        None,
+        help="NDJSON file to read (default: stdin, also selected by '-')",
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE,
+        "--chunk-size",
+        help="Flush output after this many results",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Number of worker processes",
+    ),
+    unordered: bool = typer.Option(
+        False,
+        "--unordered",
+        help="With --jobs, write results as they finish instead of in input order",
+    ),
+):
+    """Process NDJSON requests line by line and write NDJSON results."""
+    if input_file is None or input_file == "-":
+        run_batch(sys.stdin, sys.stdout, chunk_size, jobs, not unordered, **_budget_limits)
+    else:
+        with open(input_file, encoding="utf-8") as fh:
+            run_batch(fh, sys.stdout, chunk_size, jobs, not unordered, **_budget_limits)
+
+
+@app.command()
+@handle_errors
+def serve(
+    socket_path: Optional[str] = typer.Option(
+        None,
+        "--socket",
+        help="Listen on this Unix socket instead of TCP",
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="TCP host to listen on"),
+    port: int = typer.Option(8765, "--port", help="TCP port to listen on"),
+    jobs: Optional[int] = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        help="Worker processes for expensive requests (default: CPU count)",
+    ),
+    metrics_port: Optional[int] = typer.Option(
+        None,
+        "--metrics-port",
+        help="Record metrics and serve them in Prometheus format at http://HOST:PORT/metrics",
+    ),
+):
+    """Run a long-lived NDJSON calculation server with warm caches."""
+    from advmath.server import serve as run_server
+
+    run_server(host, port, socket_path, jobs, metrics_port, **_budget_limits)
+
+
+@app.command()
+@handle_errors
+def calibrate(
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Config file to write (default: $ADVMATH_CONFIG or ~/.config/advmath/thresholds.json)",
+    ),
+    quick: bool = typer.Option(False, "--quick", help="Measure fewer, smaller sizes"),
+):
+    """Measure algorithm crossover points on this host and save them."""
+    from advmath.registry import calibrate as measure, save_thresholds
+
+    thresholds = measure(quick=quick)
+    path = save_thresholds(thresholds, output)
+    for key, value in sorted(thresholds.items()):
+        typer.echo(f"{key} = {value}")
+    typer.echo(f"Saved to {path}")
+
+
+@app.command()
+@handle_errors
+def bench(
+    ops: Optional[list[str]] = typer.Option(
+        None,
+        "--op",
+        help="Operation to benchmark (repeatable; default: all)",
+    ),
+    methods: Optional[list[str]] = typer.Option(
+        None,
+        "--method",
+        help="Method to benchmark, 'math' for the standard library, 'fast' for the unchecked kernel or 'parallel' for the process-pool factorial (repeatable; default: all)",
+    ),
+    quick: bool = typer.Option(False, "--quick", help="Sweep fewer, smaller sizes"),
+    repeat: int = typer.Option(20, "--repeat", help="Maximum timed calls per case"),
+    no_memory: bool = typer.Option(False, "--no-memory", help="Skip tracemalloc peak measurement"),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write the JSON report to this file instead of stdout",
+    ),
+    baseline: Optional[str] = typer.Option(
+        None,
+        "--baseline",
+        help="Compare against a saved report and exit 1 on regressions",
+    ),
+    threshold: float = typer.Option(
+        0.25,
+        "--threshold",
+        help="Relative slowdown or memory growth counted as a regression",
+    ),
+):
+    """Sweep input sizes and report latency, throughput and peak memory as JSON."""
+    from advmath.bench import compare, load_report, run_benchmarks, save_report
+
+    previous = load_report(baseline) if baseline else None
+    report = run_benchmarks(ops, methods, quick=quick, repeat=repeat, memory=not no_memory)
+    if previous is not None:
+        report["regressions"] = compare(report, previous, threshold)
+    if output:
+        save_report(report, output)
+    else:
+        typer.echo(json.dumps(report, indent=2))
+    for entry in report.get("regressions", ()):
+        typer.echo(
+            f"Regression: {entry['op']} {entry['method']} size={entry['size']} "
+            f"{entry['metric']} {entry['ratio']:.2f}x baseline",
+            err=True,
+        )
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+@app.command()
+@handle_errors
+def cache(
+    path: Optional[str] = typer.Argument(
+        None,
+        help="Cache file (default: --disk-cache, $ADVMATH_DISK_CACHE or ~/.cache/advmath/results.sqlite3)",
+    ),
+    clear: bool = typer.Option(False, "--clear", help="Delete every stored result"),
+):
+    """Show (or clear) the persistent result cache as JSON."""
+    from advmath import diskcache
+
+    store = diskcache.active() if path is None else None
+    if store is None:
+        store = diskcache.DiskCache(path)
+    if clear:
+        store.clear()
+    typer.echo(json.dumps(store.stats(), indent=2))
+
+
 @app.command()
 def info():
     """Show information about the Advanced Mathematics package."""
@@ -183,12 +462,27 @@ def info():
     typer.echo("  - GCD: gcd")
     typer.echo("  - LCM: lcm")
     typer.echo("  - Prime check: prime")
+    typer.echo("  - NDJSON batch processing: batch")
+    typer.echo("  - Calculation server: serve")
+    typer.echo("  - Algorithm calibration: calibrate")
+    typer.echo("  - Benchmark suite: bench")
+    typer.echo("  - Persistent result cache: cache")
     typer.echo()
     typer.echo("Usage examples:")
-    typer.echo("  advmath fact <n> [--method iterative|recursive] [--verbose]")
-    typer.echo("  advmath gcd <a> <b> [--method iterative|recursive]")
-    typer.echo("  advmath lcm <a> <b> [--method iterative|recursive]")
-    typer.echo("  advmath prime <n> [--method iterative|recursive]")
+    typer.echo("  advmath [--max-time SECONDS] [--max-bits BITS] <command> ...")
+    typer.echo("  advmath [--timing] [--profile cprofile|FILE] <command> ...")
+    typer.echo("  advmath [--disk-cache FILE] [--disk-cache-mb MIB] <command> ...")
+    typer.echo("  advmath fact <n> [--method auto|iterative|recursive|native] [--verbose]")
+    typer.echo("               [--format dec|hex|bin|raw] [--output FILE]")
+    typer.echo("  advmath gcd <a> <b> [--method auto|iterative|recursive|binary|lehmer|native]")
+    typer.echo("  advmath lcm <a> <b> [--method auto|iterative|recursive|native]")
+    typer.echo("  advmath prime <n> [--method auto|iterative|recursive|miller_rabin]")
+    typer.echo("  advmath batch [FILE|-] [--chunk-size N] [--jobs N] [--unordered]")
+    typer.echo("  advmath serve [--socket PATH | --host H --port P] [--jobs N] [--metrics-port P]")
+    typer.echo("  advmath calibrate [--output FILE] [--quick]")
+    typer.echo("  advmath bench [--op OP]... [--method M]... [--quick] [--output FILE]")
+    typer.echo("                [--baseline FILE] [--threshold FRACTION]")
+    typer.echo("  advmath cache [FILE] [--clear]")
 
 
 if __name__ == "__main__":
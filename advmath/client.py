@@ -0,0 +1,105 @@
+"""Lightweight blocking client for ``advmath serve``.
+
+Example::
+
+    with Client(path="/tmp/advmath.sock") as client:
+        client.call("gcd", 48, 64)                     # -> 16
+        client.pipeline([{"op": "prime", "args": [n]} for n in range(100)])
+
+Only the standard library is used, so importing this module is cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+from typing import Any, Iterable, Optional
+
+# Where ``advmath serve`` listens by default.  Defined here rather than in
+# :mod:`advmath.server` so that the client does not import the server.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Requests sent before reading responses back in :meth:`Client.pipeline`.
+# Bounded so neither side can block on a full socket buffer.
+_PIPELINE_WINDOW = 256
+
+
+class Client:
+    """Connection to an ``advmath serve`` instance.
+
+    Parameters
+    ----------
+    path : str, optional
+        Unix socket path.  If omitted, connect over TCP.
+    host, port : optional
+        TCP address of the server.
+    timeout : float, optional
+        Socket timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(path)
+        else:
+            self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._sock.makefile("rwb")
+
+    def _send(self, request: dict[str, Any]) -> None:
+        self._file.write(json.dumps(request).encode() + b"\n")
+
+    def _receive(self) -> dict[str, Any]:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return json.loads(line)
+
+    def pipeline(self, requests: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Send many requests and return the raw responses in order."""
+        responses = []
+        window = 0
+        for request in requests:
+            self._send(request)
+            window += 1
+            if window == _PIPELINE_WINDOW:
+                self._file.flush()
+                responses.extend(self._receive() for _ in range(window))
+                window = 0
+        self._file.flush()
+        responses.extend(self._receive() for _ in range(window))
+        return responses
+
+    def call(self, op: str, *args: int, method: str = "iterative") -> Any:
+        """Evaluate one operation and return its result.
+
+        Raises
+        ------
+        ValueError
+            With the server's message if the request failed.
+        """
+        (response,) = self.pipeline([{"op": op, "args": list(args), "method": method}])
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = ["DEFAULT_HOST", "DEFAULT_PORT", "Client"]
@@ -0,0 +1,345 @@
+"""Cost estimation and resource budgets.
+
+:func:`estimate` predicts, from the arguments alone, how large a result will
+be and roughly how much work computing it takes.  :func:`budget` sets limits
+for the current thread or task::
+
+    >>> from advmath.cost import budget, estimate
+    >>> estimate("factorial", 10).result_bits
+    22
+    >>> with budget(max_seconds=0.5):
+    ...     pass
+
+Limits are enforced twice: :func:`check_budget` rejects a call up front when
+its estimate is already over budget, and the long-running loops of the
+iterative implementations call :func:`checkpoint` periodically so that a
+computation that overruns anyway aborts cleanly with
+:class:`BudgetExceededError`.  Without an active budget a checkpoint costs a
+single context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, NamedTuple, Optional
+
+# Rough cost of one machine-word operation inside a bigint loop, and of one
+# interpreted loop iteration, used to turn operation counts into seconds.
+_SECONDS_PER_WORD_OP = 2e-9
+_SECONDS_PER_STEP = 5e-8
+
+# Primality methods and their bases count for Miller–Rabin.
+_MR_ROUNDS = 13
+
+# Exponent of Karatsuba multiplication, used by the C routines (and the pure
+# Python product tree) behind the "native" methods.
+_KARATSUBA = math.log2(3)
+
+
+class BudgetExceededError(ValueError):
+    """Raised when a computation is, or is predicted to be, over budget."""
+
+
+class CostEstimate(NamedTuple):
+    """Predicted size and cost of one call.
+
+    ``result_bits`` never exceeds the actual size (it is exact, or for GCD
+    and LCM a lower bound), so rejecting on it never refuses a call whose
+    result fits.
+    """
+
+    result_bits: int
+    operations: int
+    seconds: float
+
+
+# (deadline on the monotonic clock, max_seconds, max_result_bits)
+_budget: ContextVar[Optional[tuple[Optional[float], Optional[float], Optional[int]]]] = (
+    ContextVar("advmath_budget", default=None)
+)
+
+
+# ---------------------------------------------------------------------------
+# Estimation
+# ---------------------------------------------------------------------------
+
+def _bits(x: int) -> int:
+    return max(1, abs(x).bit_length())
+
+
+# Integers up to this many bits convert to float without overflow.
+_FLOAT_BITS = 1000
+
+
+def _seconds(steps: float = 0, word_ops: float = 0) -> float:
+    """Run time of *steps* loop iterations and *word_ops* word operations
+    (``inf`` for counts too large for a float)."""
+    try:
+        return steps * _SECONDS_PER_STEP + word_ops * _SECONDS_PER_WORD_OP
+    except OverflowError:
+        return math.inf
+
+
+def _karatsuba_ops(bits: int, factor: float = 1.0) -> float:
+    """Word operations of *factor* Karatsuba products of *bits*-bit operands."""
+    try:
+        return factor * (bits // 64 + 1) ** _KARATSUBA
+    except OverflowError:
+        return math.inf
+
+
+def _factorial_bits(n: int) -> int:
+    if n < 2:
+        return 1
+    if n.bit_length() < _FLOAT_BITS:
+        return int(math.lgamma(n + 1) / math.log(2)) + 1
+    # log2(n!) > n * (log2(n) - 1.45) > n * (bit_length - 3): a lower bound.
+    return n * (n.bit_length() - 3)
+
+
+def _power_bits(base: int, exponent: int) -> int:
+    if abs(base) < 2:
+        return 1
+    if exponent.bit_length() < _FLOAT_BITS:
+        return int(exponent * math.log2(abs(base))) + 1
+    # log2|base| >= bit_length - 1: a lower bound.
+    return exponent * (abs(base).bit_length() - 1) + 1
+
+
+def _estimate_growing_product(steps: int, result_bits: int) -> CostEstimate:
+    """Loop of *steps* single-word updates to an accumulator that grows
+    linearly to *result_bits* (factorial, Fibonacci)."""
+    word_ops = steps * (result_bits // 64 + 1) // 2
+    return CostEstimate(result_bits, steps, _seconds(steps, word_ops))
+
+
+def _gcd_lcm_bits(op: str, a: int, b: int) -> int:
+    """Smallest possible result size: a GCD may be 1, and an LCM is at least
+    as large as its larger operand.  (Upper bounds would reject calls whose
+    result fits; the exact size is checked after the call.)"""
+    return 1 if op == "gcd" else max(_bits(a), _bits(b))
+
+
+def _native_backend() -> str:
+    from advmath import backend
+
+    return backend.current().name
+
+
+def _estimate_native(op: str, args: tuple) -> Optional[CostEstimate]:
+    """Estimate of a ``"native"`` method, or ``None`` where the active
+    backend runs the same interpreted loop as ``"iterative"``."""
+    python = _native_backend() == "python"
+    if op == "factorial":
+        (n,) = args
+        bits = _factorial_bits(n)
+        # Binary splitting: about log2(n) / 2 levels of Karatsuba
+        # multiplications, each level costing about one full-size product.
+        word_ops = _karatsuba_ops(bits, max(1, n.bit_length()) / 2)
+        return CostEstimate(bits, n, _seconds(n if python else 0, word_ops))
+    if python:
+        return None
+    if op == "power":
+        base, exponent = args
+        bits = _power_bits(base, exponent)
+        squarings = exponent.bit_length()
+        # The squarings form a geometric series dominated by the last ones.
+        return CostEstimate(bits, 2 * squarings, _seconds(0, _karatsuba_ops(bits, 4)))
+    if op in ("gcd", "lcm"):
+        a, b = args
+        big = max(_bits(a), _bits(b))
+        # Lehmer's algorithm in C: quadratic in the word count, with a
+        # small constant (the LCM adds a sub-quadratic multiply).
+        words = big // 64 + 1
+        word_ops = 9 * words * words // 4
+        bits = _gcd_lcm_bits(op, a, b)
+        return CostEstimate(bits, int(1.44 * min(_bits(a), _bits(b))) + 1, _seconds(0, word_ops))
+    return None
+
+
+def estimate(op: str, *args: Any, method: str = "iterative") -> CostEstimate:
+    """Predict the result size and cost of ``compute(op, *args)``.
+
+    Parameters
+    ----------
+    op : str
+        Registry operation name (``"factorial"``, ``"gcd"``, ...).
+    *args
+        The call's arguments.  Non-integer arguments yield a zero estimate;
+        validation is left to the implementation.
+    method : str
+        Implementation to estimate for.  ``"native"`` (factorial, power,
+        GCD, LCM) is priced as the active backend's C routine, ``"miller_rabin"``
+        as Miller–Rabin rather than trial division; every other method is
+        priced as the iterative loop.
+
+    Returns
+    -------
+    CostEstimate
+        Predicted ``result_bits``, ``operations`` and ``seconds``.
+    """
+    if not args or not all(isinstance(a, int) for a in args) or any(a < 0 for a in args[-1:]):
+        return CostEstimate(0, 0, 0.0)
+
+    if method == "native" and op in ("factorial", "power", "gcd", "lcm"):
+        native = _estimate_native(op, args)
+        if native is not None:
+            return native
+
+    if op == "factorial":
+        (n,) = args
+        return _estimate_growing_product(n, _factorial_bits(n))
+
+    if op == "fibonacci":
+        (n,) = args
+        return _estimate_growing_product(n, n * 6943 // 10000 + 1)
+
+    if op == "power":
+        base, exponent = args
+        bits = _power_bits(base, exponent)
+        squarings = exponent.bit_length()
+        # Squarings dominate; the last one is on an operand of ~bits/2.
+        word_ops = (bits // 64 + 1) ** 2 // 8
+        return CostEstimate(bits, 2 * squarings, _seconds(squarings, word_ops))
+
+    if op in ("gcd", "lcm"):
+        a, b = args
+        small = min(_bits(a), _bits(b))
+        # Euclid takes at most ~1.44 * bits steps, each a full-width division.
+        steps = int(1.44 * small) + 1
+        word_ops = steps * (max(_bits(a), _bits(b)) // 64 + 1)
+        bits = _gcd_lcm_bits(op, a, b)
+        return CostEstimate(bits, steps, _seconds(steps, word_ops))
+
+    if op == "prime":
+        (n,) = args
+        if method == "miller_rabin":
+            bits = _bits(n)
+            steps = _MR_ROUNDS * bits
+            word_ops = steps * (bits // 64 + 1) ** 2
+            return CostEstimate(1, steps, _seconds(steps, word_ops))
+        steps = math.isqrt(n) // 2 + 1
+        return CostEstimate(1, steps, _seconds(steps))
+
+    return CostEstimate(0, 0, 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Budgets
+# ---------------------------------------------------------------------------
+
+def _validate_limits(max_seconds: Optional[float], max_result_bits: Optional[int]) -> None:
+    if max_seconds is not None and (
+        not isinstance(max_seconds, (int, float)) or max_seconds <= 0
+    ):
+        raise ValueError("max_seconds must be a positive number")
+    if max_result_bits is not None and (
+        not isinstance(max_result_bits, int) or max_result_bits <= 0
+    ):
+        raise ValueError("max_result_bits must be a positive integer")
+
+
+@contextmanager
+def budget(
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> Iterator[None]:
+    """Limit computations in this context (thread or asyncio task).
+
+    Nested budgets are combined: the tighter of each limit applies.
+    """
+    _validate_limits(max_seconds, max_result_bits)
+    outer = _budget.get()
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    if outer is not None:
+        outer_deadline, outer_seconds, outer_bits = outer
+        if outer_deadline is not None and (deadline is None or outer_deadline < deadline):
+            deadline, max_seconds = outer_deadline, outer_seconds
+        if outer_bits is not None and (max_result_bits is None or outer_bits < max_result_bits):
+            max_result_bits = outer_bits
+    token = _budget.set((deadline, max_seconds, max_result_bits))
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+def checkpoint(partial: Optional[int] = None) -> None:
+    """Abort the running computation if the active budget is exhausted.
+
+    Parameters
+    ----------
+    partial : int, optional
+        The intermediate result so far, checked against ``max_result_bits``.
+
+    Raises
+    ------
+    BudgetExceededError
+        If the deadline has passed or *partial* is too large.
+    """
+    active = _budget.get()
+    if active is None:
+        return
+    deadline, max_seconds, max_result_bits = active
+    if deadline is not None and time.monotonic() > deadline:
+        raise BudgetExceededError(f"Time budget of {max_seconds} seconds exceeded")
+    if (
+        max_result_bits is not None
+        and partial is not None
+        and abs(partial).bit_length() > max_result_bits
+    ):
+        raise BudgetExceededError(f"Result exceeds the budget of {max_result_bits} bits")
+
+
+def check_budget(
+    op: str,
+    *args: Any,
+    method: str = "iterative",
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> CostEstimate:
+    """Reject a call whose estimate is over budget; return the estimate.
+
+    Limits default to those of the active :func:`budget`, if any.
+
+    Raises
+    ------
+    BudgetExceededError
+        If the predicted result size or run time exceeds a limit.
+    """
+    _validate_limits(max_seconds, max_result_bits)
+    remaining = max_seconds
+    active = _budget.get()
+    if active is not None:
+        deadline, active_seconds, active_bits = active
+        if max_seconds is None and deadline is not None:
+            max_seconds = active_seconds
+            remaining = max(deadline - time.monotonic(), 0.0)
+        if max_result_bits is None:
+            max_result_bits = active_bits
+
+    cost = estimate(op, *args, method=method)
+    if max_result_bits is not None and cost.result_bits > max_result_bits:
+        raise BudgetExceededError(
+            f"Predicted result of {cost.result_bits} bits exceeds the budget "
+            f"of {max_result_bits} bits"
+        )
+    if remaining is not None and cost.seconds > remaining:
+        raise BudgetExceededError(
+            f"Predicted run time of {cost.seconds:.3g} seconds exceeds the budget "
+            f"of {max_seconds} seconds"
+        )
+    return cost
+
+
+__all__ = [
+    "BudgetExceededError",
+    "CostEstimate",
+    "budget",
+    "check_budget",
+    "checkpoint",
+    "estimate",
+]
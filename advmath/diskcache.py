@@ -0,0 +1,424 @@
+"""Persistent result cache shared across processes and runs.
+
+The ``lru_cache``s only live as long as one process.  For workloads that
+recompute the same large factorials, Fibonacci numbers or primality verdicts
+across processes and restarts, :func:`enable` puts a SQLite-backed cache in
+front of every registry function (see :mod:`advmath.registry`)::
+
+    >>> import advmath
+    >>> from advmath import diskcache
+    >>> cache = diskcache.enable("/tmp/advmath-doctest.sqlite3")
+    >>> advmath.factorial_iterative(20000).bit_length()   # computed, stored
+    256909
+    >>> advmath.factorial_native(20000).bit_length()      # read back
+    256909
+    >>> diskcache.disable()
+
+Like :func:`advmath.metrics.enable`, :func:`enable` replaces the functions
+*on the package namespace*, so :func:`advmath.registry.compute`, the CLI,
+``advmath batch`` and ``advmath serve`` all use the cache.  Entries are keyed
+by ``(operation, arguments, algorithm version)``: the exact methods of an
+operation share them, while probabilistic methods (see
+:data:`PROBABILISTIC_METHODS`) get entries of their own, so a Miller–Rabin
+verdict is never served to ``is_prime_iterative``.  Bumping
+:data:`ALGORITHM_VERSIONS` for an operation orphans its old entries.  Only calls whose arguments are all
+integers and whose cost estimate (:func:`advmath.cost.estimate`) is at least
+``min_seconds`` go through the cache; a lookup costs tens of microseconds,
+more than cheap calls take to compute.
+
+Storage
+    Integers are stored as signed little-endian bytes (a 1-byte type tag
+    plus ``ceil(bits / 8)`` bytes), not as decimal text.
+Eviction
+    When the stored values exceed ``max_bytes``, the least recently used
+    entries are deleted down to 90% of the limit.  Recency is refreshed at
+    most once a minute per entry, so hits rarely write.
+Concurrency
+    The database runs in WAL mode: readers never block, writers queue on
+    SQLite's file lock (waiting up to :data:`BUSY_TIMEOUT` seconds).  Each
+    thread and each process (forked workers included) opens its own
+    connection.  A cache that cannot be read or written is skipped, never
+    an error: the result is computed as if caching were off.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import advmath
+
+# Bump an operation's version when its results change (a bug fix), so that
+# entries written by older releases are no longer returned.
+ALGORITHM_VERSIONS: dict[str, int] = {
+    "factorial": 1,
+    "fibonacci": 1,
+    "power": 1,
+    "gcd": 1,
+    "lcm": 1,
+    # 2: Miller–Rabin verdicts moved out of the shared "prime" entries.
+    "prime": 2,
+}
+
+# Methods whose results are not proven: cached under "<op>:<method>" instead
+# of the entries shared by the exact methods of the operation.
+PROBABILISTIC_METHODS: dict[str, frozenset[str]] = {
+    "prime": frozenset({"miller_rabin"}),
+}
+
+DISK_CACHE_ENV = "ADVMATH_DISK_CACHE"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Estimated run time below which a call bypasses the cache.
+DEFAULT_MIN_SECONDS = 1e-3
+
+# Seconds a connection waits for another process's write lock.
+BUSY_TIMEOUT = 30.0
+
+# Minimum age of an entry's access time before a hit refreshes it.
+_TOUCH_INTERVAL = 60.0
+
+# Eviction deletes down to this fraction of max_bytes.
+_LOW_WATER = 0.9
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = f"""
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    op TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    args BLOB NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    UNIQUE (op, version, args)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+PRAGMA user_version = {_SCHEMA_VERSION};
+COMMIT;
+"""
+
+
+def default_path() -> str:
+    """Return ``$XDG_CACHE_HOME/advmath/results.sqlite3`` (default
+    ``~/.cache/advmath/results.sqlite3``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "advmath", "results.sqlite3")
+
+
+# ---------------------------------------------------------------------------
+# Binary encoding
+# ---------------------------------------------------------------------------
+
+def _int_bytes(n: int) -> bytes:
+    return n.to_bytes(n.bit_length() // 8 + 1, "little", signed=True)
+
+
+def encode_args(args: tuple) -> bytes:
+    """Encode integer arguments as length-prefixed signed bytes."""
+    parts = []
+    for arg in args:
+        data = _int_bytes(arg)
+        parts.append(len(data).to_bytes(4, "little"))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def encode_value(value: Any) -> Optional[bytes]:
+    """Encode a result, or return ``None`` if its type is not cacheable."""
+    if type(value) is bool:
+        return b"T" if value else b"F"
+    if type(value) is int:
+        return b"i" + _int_bytes(value)
+    return None
+
+
+def decode_value(data: bytes) -> Any:
+    """Inverse of :func:`encode_value`.
+
+    Raises
+    ------
+    ValueError
+        If *data* was not produced by :func:`encode_value`.
+    """
+    tag = data[:1]
+    if tag == b"i":
+        return int.from_bytes(data[1:], "little", signed=True)
+    if tag in (b"T", b"F"):
+        return tag == b"T"
+    raise ValueError("Not an encoded advmath result")
+
+
+def _entry_op(op: str, method: Optional[str]) -> str:
+    if method is not None and method in PROBABILISTIC_METHODS.get(op, ()):
+        return f"{op}:{method}"
+    return op
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class DiskCache:
+    """SQLite store of encoded results.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file (default :func:`default_path`); its directory is
+        created if needed.
+    max_bytes : int
+        Limit on the total size of the stored values.
+
+    Raises
+    ------
+    ValueError
+        If *max_bytes* is not a positive integer.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self.path = os.path.abspath(path or default_path())
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            # First use in this thread, or inherited across a fork: SQLite
+            # connections must not be shared with another process.
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                # Idempotent, so processes racing to create it are harmless.
+                conn.executescript(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def get(self, op: str, args: tuple, method: Optional[str] = None) -> tuple[bool, Any]:
+        """Return ``(True, value)`` for a stored result, else
+        ``(False, None)``.  *method* only matters for
+        :data:`PROBABILISTIC_METHODS`."""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT id, value, accessed FROM results WHERE op = ? AND version = ? AND args = ?",
+            (_entry_op(op, method), ALGORITHM_VERSIONS[op], encode_args(args)),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        now = time.time()
+        if now - row[2] > _TOUCH_INTERVAL:
+            conn.execute("UPDATE results SET accessed = ? WHERE id = ?", (now, row[0]))
+        return True, decode_value(row[1])
+
+    def put(self, op: str, args: tuple, value: Any, method: Optional[str] = None) -> bool:
+        """Store *value*; return ``False`` if it is not cacheable or larger
+        than ``max_bytes``.  Evicts least recently used entries as needed."""
+        data = encode_value(value)
+        if data is None or len(data) > self.max_bytes:
+            return False
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO results (op, version, args, value, size, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                (_entry_op(op, method), ALGORITHM_VERSIONS[op], encode_args(args), data, len(data),
+                 time.time()),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        excess = conn.execute("SELECT bytes FROM usage").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        excess += int(self.max_bytes * (1 - _LOW_WATER))
+        victims = []
+        for entry_id, size in conn.execute("SELECT id, size FROM results ORDER BY accessed"):
+            victims.append((entry_id,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE id = ?", victims)
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        self._connection().execute("DELETE FROM results")
+
+    def stats(self) -> dict[str, Any]:
+        """Return ``path``, ``entries``, ``bytes``, ``max_bytes`` and this
+        object's ``hits`` and ``misses``."""
+        conn = self._connection()
+        entries = conn.execute("SELECT count(*) FROM results").fetchone()[0]
+        stored = conn.execute("SELECT bytes FROM usage").fetchone()[0]
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": stored,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Close this thread's connection (others close when their thread
+        or process ends)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+
+# ---------------------------------------------------------------------------
+# Enabling
+# ---------------------------------------------------------------------------
+
+_active: Optional[DiskCache] = None
+
+# Public name -> (original function, installed wrapper) while enabled.
+_installed: dict[str, tuple[Callable[..., Any], Callable[..., Any]]] = {}
+
+
+def _cached(op: str, method: str, func: Callable[..., Any], cache: DiskCache,
+            min_seconds: float) -> Callable[..., Any]:
+    from advmath.cost import estimate
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if kwargs or not args or not all(type(a) is int for a in args):
+            return func(*args, **kwargs)
+        if estimate(op, *args, method=method).seconds < min_seconds:
+            return func(*args)
+        try:
+            found, value = cache.get(op, args, method)
+        except (sqlite3.Error, OSError, ValueError):
+            found = False
+        if found:
+            return value
+        value = func(*args)
+        try:
+            cache.put(op, args, value, method)
+        except (sqlite3.Error, OSError):
+            pass
+        return value
+
+    if hasattr(func, "cache_info"):
+        wrapper.cache_info = func.cache_info
+        wrapper.cache_clear = func.cache_clear
+    return wrapper
+
+
+def enable(
+    path: Optional[str] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> DiskCache:
+    """Cache the registry functions in the database at *path* and return
+    the store.  Calling it again switches to the new settings.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file (default :func:`default_path`).
+    max_bytes : int
+        Size limit enforced by LRU eviction.
+    min_seconds : float
+        Calls estimated to be cheaper than this bypass the cache.
+
+    Raises
+    ------
+    ValueError
+        If *max_bytes* or *min_seconds* is invalid.
+    """
+    global _active
+    if not isinstance(min_seconds, (int, float)) or min_seconds < 0:
+        raise ValueError("min_seconds must be non-negative")
+    cache = DiskCache(path, max_bytes)
+    disable()
+
+    from advmath.registry import _ALGORITHMS
+
+    for op, methods in _ALGORITHMS.items():
+        for method, name in methods.items():
+            current = getattr(advmath, name)
+            wrapper = _cached(op, method, current, cache, float(min_seconds))
+            _installed[name] = (current, wrapper)
+            setattr(advmath, name, wrapper)
+    _active = cache
+    return cache
+
+
+def disable() -> None:
+    """Stop caching and restore the functions :func:`enable` replaced."""
+    global _active
+    for name, (original, wrapper) in _installed.items():
+        # Leave the name alone if something wrapped it again since.
+        if getattr(advmath, name, None) is wrapper:
+            setattr(advmath, name, original)
+    _installed.clear()
+    if _active is not None:
+        _active.close()
+    _active = None
+
+
+def is_enabled() -> bool:
+    """Return ``True`` while :func:`enable` is in effect."""
+    return _active is not None
+
+
+def active() -> Optional[DiskCache]:
+    """Return the store in use, or ``None``."""
+    return _active
+
+
+__all__ = [
+    "ALGORITHM_VERSIONS",
+    "BUSY_TIMEOUT",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MIN_SECONDS",
+    "DISK_CACHE_ENV",
+    "DiskCache",
+    "PROBABILISTIC_METHODS",
+    "active",
+    "decode_value",
+    "default_path",
+    "disable",
+    "enable",
+    "encode_args",
+    "encode_value",
+    "is_enabled",
+]
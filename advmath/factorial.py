@@ -1,7 +1,18 @@
 """Factorial Module - Iterative and Recursive Implementations"""
 
-from functools import lru_cache
-from typing import Union
+import math
+import threading
+from typing import Optional, Union
+
+from advmath import backend
+from advmath._memo import memoize, share_cache
+from advmath.cost import checkpoint
+
+# Loop iterations between budget checkpoints.
+_CHECK_INTERVAL = 1024
+
+# Below this n a process pool costs more than it saves.
+_PARALLEL_MIN = 100_000
 
 
 def factorial_iterative(n: int) -> int:
@@ -32,12 +43,21 @@ def factorial_iterative(n: int) -> int:
         raise ValueError("Factorial is not defined for negative numbers")
 
     result = 1
-    for i in range(2, n + 1):
-        result *= i
+    for start in range(2, n + 1, _CHECK_INTERVAL):
+        for i in range(start, min(start + _CHECK_INTERVAL, n + 1)):
+            result *= i
+        checkpoint(result)
     return result
 
 
-@lru_cache(maxsize=None)
+@memoize
+def _factorial_recursive_kernel(n: int) -> int:
+    """Unchecked memoised recursion behind :func:`factorial_recursive`."""
+    if n < 2:
+        return 1
+    return n * _factorial_recursive_kernel(n - 1)
+
+
 def factorial_recursive(n: int) -> int:
     """
     Calculate factorial recursively with memoization.
@@ -65,9 +85,161 @@ def factorial_recursive(n: int) -> int:
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers")
 
-    if n < 2:
+    return _factorial_recursive_kernel(n)
+
+
+share_cache(factorial_recursive, _factorial_recursive_kernel)
+
+
+def factorial_native(n: int, parallel: bool = False, workers: Optional[int] = None) -> int:
+    """
+    Calculate factorial with the active arithmetic backend.
+
+    Uses ``gmpy2.fac``, :func:`math.factorial` or a pure Python product tree
+    depending on :func:`advmath.backend.get_backend`.  The computation runs
+    in C, so it is not interrupted by budget checkpoints.
+
+    With *parallel* or *workers*, ``2..n`` is split into one range per
+    worker process, balanced by the bit length of the partial products.
+    The partial products come back as ``int.to_bytes`` buffers and are
+    multiplied pairwise in the pool until two are left; the last
+    multiplication runs in the calling process.  The pool is started on
+    first use and kept for later calls with the same number of workers.
+    Inputs below 100000, and calls from a daemon process (such as an
+    :mod:`advmath.aio` worker, which may not start children), are always
+    computed serially.
+
+    Args:
+        n: The number to calculate factorial for (non-negative)
+        parallel: Use one worker process per CPU
+        workers: Number of worker processes (overrides *parallel*)
+
+    Returns:
+        The factorial of n
+
+    Raises:
+        ValueError: If n is negative or not an integer
+        ValueError: If workers is not a positive integer
+
+    Examples:
+        >>> factorial_native(5)
+        120
+    """
+    if not isinstance(n, int):
+        raise ValueError("Factorial is only defined for integers")
+
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers")
+
+    if workers is not None and (
+        not isinstance(workers, int) or isinstance(workers, bool) or workers < 1
+    ):
+        raise ValueError("workers must be a positive integer")
+    if workers is None and parallel:
+        import os
+
+        workers = os.cpu_count() or 1
+
+    if workers is None or workers < 2 or n < _PARALLEL_MIN:
+        return backend.current().factorial(n)
+
+    import multiprocessing
+
+    if multiprocessing.current_process().daemon:
+        return backend.current().factorial(n)
+    return _parallel_factorial(n, workers)
+
+
+def _split_points(n: int, parts: int) -> list[int]:
+    """Return ``1 = k0 <= k1 <= ... <= k_parts = n`` such that the products
+    of ``(k_i, k_i+1]`` have about the same bit length."""
+    total = math.lgamma(n + 1)
+    points = [1]
+    for j in range(1, parts):
+        target = total * j / parts
+        lo, hi = points[-1], n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if math.lgamma(mid + 1) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        points.append(lo)
+    points.append(n)
+    return points
+
+
+def _to_bytes(value: int) -> bytes:
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+
+def _range_product(task: tuple[int, int, bool]) -> bytes:
+    """Pool task: product of ``(lo, hi]`` as little-endian bytes."""
+    lo, hi, pure_python = task
+    if pure_python:
+        from advmath._product_tree import tree_product
+
+        return _to_bytes(tree_product(range(lo + 1, hi + 1)))
+    # math.perm(hi, hi - lo) == hi! / lo!, computed in C.
+    return _to_bytes(math.perm(hi, hi - lo))
+
+
+def _multiply(pair: tuple[bytes, bytes]) -> bytes:
+    """Pool task: product of two little-endian byte strings."""
+    a, b = pair
+    return _to_bytes(int.from_bytes(a, "little") * int.from_bytes(b, "little"))
+
+
+# Worker count -> (owning pid, pool); reused across calls.
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int):
+    """Return the shared pool of *workers* processes, starting it if needed
+    (or if it was inherited from a parent process)."""
+    import atexit
+    import multiprocessing
+    import os
+
+    with _pools_lock:
+        pid, pool = _pools.get(workers, (None, None))
+        if pid != os.getpid():
+            if all(owner != os.getpid() for owner, _ in _pools.values()):
+                atexit.register(_shutdown_pools)
+            pool = multiprocessing.Pool(workers)
+            _pools[workers] = (os.getpid(), pool)
+        return pool
+
+
+def _shutdown_pools() -> None:
+    """Stop the worker pools started by this process."""
+    import os
+
+    with _pools_lock:
+        for pid, pool in _pools.values():
+            if pid == os.getpid():
+                pool.terminate()
+                pool.join()
+        _pools.clear()
+
+
+def _parallel_factorial(n: int, workers: int) -> int:
+    points = _split_points(n, workers)
+    pure_python = backend.current().name == "python"
+    tasks = [(lo, hi, pure_python) for lo, hi in zip(points, points[1:]) if hi > lo]
+    if not tasks:
         return 1
-    return n * factorial_recursive(n - 1)
+    pool = _get_pool(workers)
+    parts = pool.map(_range_product, tasks)
+    while len(parts) > 2:
+        pairs = list(zip(parts[::2], parts[1::2]))
+        carried = parts[-1:] if len(parts) % 2 else []
+        parts = pool.map(_multiply, pairs) + carried
+    result = 1
+    for part in parts:
+        result *= int.from_bytes(part, "little")
+    return result
 
 
-__all__ = ["factorial_iterative", "factorial_recursive"]
\ No newline at end of file
+__all__ = ["factorial_iterative", "factorial_recursive", "factorial_native"]
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Unchecked fast-path API.
+
+The public functions validate their arguments on every call, and before this
+namespace existed the recursive variants did so at every recursion level.
+For hot loops whose inputs are already known to be valid, the functions here
+skip validation entirely and go straight to the kernels::
+
+    >>> from advmath import fast
+    >>> fast.gcd(48, 64)
+    16
+    >>> fast.batch("gcd", [48, 17], [64, 23])
+    [16, 1]
+
+Passing invalid arguments to the scalar functions is undefined behaviour:
+they may return nonsense, raise an arbitrary exception or loop for a long
+time.  :func:`batch` is the safe way to use the kernels: it validates each
+whole column once (one or two C-level passes, none at all for an unsigned
+:class:`array.array`) and only falls back to the checked functions, which
+raise the usual errors, if a column fails.
+
+``factorial``, ``power``, ``gcd`` and ``lcm`` dispatch to the active
+arithmetic backend (see :mod:`advmath.backend`).  No function here takes part
+in budgets (:mod:`advmath.cost`).
+
+``batch(..., workers=N)`` splits the columns into chunks mapped by a pool of
+*N* threads.  The kernels share no mutable state, so on a free-threaded
+interpreter the chunks run in parallel; with the GIL they take turns and the
+pool only adds overhead.
+"""
+
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Optional, Sequence
+
+from advmath import backend
+from advmath._validate import all_at_least
+from advmath.fibonacci import _fibonacci_kernel
+from advmath.prime import _miller_rabin_kernel, _trial_division_kernel
+from advmath.registry import DEFAULT_THRESHOLDS
+
+# n from which is_prime() switches to Miller–Rabin.
+_MILLER_RABIN_MIN = DEFAULT_THRESHOLDS["prime_miller_rabin_min"]
+
+
+def factorial(n: int) -> int:
+    """Unchecked ``n!`` for ``n >= 0``."""
+    return backend.current().factorial(n)
+
+
+def fibonacci(n: int) -> int:
+    """Unchecked *n*-th Fibonacci number for ``n >= 0``."""
+    return _fibonacci_kernel(n)
+
+
+def power(base: int, exponent: int) -> int:
+    """Unchecked ``base ** exponent`` for ``exponent >= 0``."""
+    return backend.current().power(base, exponent)
+
+
+def gcd(a: int, b: int) -> int:
+    """Unchecked GCD of ``a, b >= 0``."""
+    return backend.current().gcd(a, b)
+
+
+def lcm(a: int, b: int) -> int:
+    """Unchecked LCM of ``a, b >= 0``."""
+    return backend.current().lcm(a, b)
+
+
+def is_prime(n: int) -> bool:
+    """Unchecked primality test for ``n >= 0`` (trial division for small
+    *n*, Miller–Rabin above)."""
+    if n < _MILLER_RABIN_MIN:
+        return _trial_division_kernel(n)
+    return _miller_rabin_kernel(n)
+
+
+# Registry operation -> (unchecked kernel, or the name of a backend kernel,
+# checked public function, indices of the columns that must be non-negative
+# integers)
+_BATCH: dict[str, tuple[Any, str, tuple[int, ...]]] = {
+    "factorial": ("factorial", "factorial_iterative", (0,)),
+    "fibonacci": (fibonacci, "fibonacci_iterative", (0,)),
+    "power": ("power", "power_iterative", (1,)),
+    "gcd": ("gcd", "gcd_iterative", (0, 1)),
+    "lcm": ("lcm", "lcm_iterative", (0, 1)),
+    "prime": (is_prime, "is_prime_iterative", (0,)),
+}
+
+
+# Chunks per worker thread, to even out uneven element costs.
+_CHUNKS_PER_WORKER = 4
+
+
+def _threaded_map(kernel: Any, columns: tuple, workers: int) -> list[Any]:
+    length = len(columns[0])
+    size = -(-length // (workers * _CHUNKS_PER_WORKER)) or 1
+    chunks = [
+        tuple(column[start:start + size] for column in columns)
+        for start in range(0, length, size)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(lambda chunk: list(map(kernel, *chunk)), chunks)
+        return list(chain.from_iterable(parts))
+
+
+def batch(op: str, *columns: Sequence[int], workers: Optional[int] = None) -> list[Any]:
+    """Apply *op* element-wise over *columns*, validating each column once.
+
+    Parameters
+    ----------
+    op : str
+        ``"factorial"``, ``"fibonacci"``, ``"power"``, ``"gcd"``, ``"lcm"``
+        or ``"prime"``.
+    *columns : sequence of int
+        One sequence per argument (lists, tuples or :class:`array.array`;
+        other iterables are materialised first), all of the same length.
+    workers : int, optional
+        Map the kernel over chunks in this many threads.
+
+    Returns
+    -------
+    list
+        ``[op(*row) for row in zip(*columns)]``.
+
+    Raises
+    ------
+    ValueError
+        If *op* is unknown, the number or lengths of the columns are wrong,
+        *workers* is not a positive integer, or an element is invalid (same
+        message as the checked function).
+    TypeError
+        As raised by the checked function for an invalid element.
+    """
+    try:
+        kernel, checked, validated = _BATCH[op]
+    except (KeyError, TypeError):
+        raise ValueError(
+            f"Unknown operation {op!r}; expected one of: {', '.join(_BATCH)}"
+        ) from None
+    arity = 2 if op in ("power", "gcd", "lcm") else 1
+    if len(columns) != arity:
+        raise ValueError(f"{op} takes {arity} column{'s' if arity > 1 else ''}")
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError("workers must be a positive integer")
+    columns = tuple(c if isinstance(c, (list, tuple, array)) else list(c) for c in columns)
+    if len({len(c) for c in columns}) > 1:
+        raise ValueError("Columns must have the same length")
+
+    if not all(all_at_least(columns[i], 0) for i in validated):
+        # Let the checked function report the first bad element (or accept
+        # values the quick check is strict about, such as bools).
+        import advmath
+
+        return list(map(getattr(advmath, checked), *columns))
+    if isinstance(kernel, str):
+        kernel = getattr(backend.current(), kernel)
+    if workers is not None and workers > 1 and len(columns[0]) > 1:
+        return _threaded_map(kernel, columns, workers)
+    return list(map(kernel, *columns))
+
+
+__all__ = ["batch", "factorial", "fibonacci", "gcd", "is_prime", "lcm", "power"]
@@ -1,8 +1,13 @@
 """Fibonacci Sequence Module - Iterative and Recursive Implementations"""
 
-from functools import lru_cache
 from typing import Union
 
+from advmath._memo import memoize, share_cache
+from advmath.cost import checkpoint
+
+# Loop iterations between budget checkpoints.
+_CHECK_INTERVAL = 1024
+
 
 def fibonacci_iterative(n: int) -> int:
     """
@@ -31,13 +36,30 @@ def fibonacci_iterative(n: int) -> int:
     if n < 0:
         raise ValueError("Fibonacci is not defined for negative numbers")
 
+    a, b = 0, 1
+    for start in range(0, n, _CHECK_INTERVAL):
+        for _ in range(min(_CHECK_INTERVAL, n - start)):
+            a, b = b, a + b
+        checkpoint(a)
+    return a
+
+
+def _fibonacci_kernel(n: int) -> int:
+    """Unchecked iteration for ``n >= 0`` (no budget checkpoints)."""
     a, b = 0, 1
     for _ in range(n):
         a, b = b, a + b
     return a
 
 
-@lru_cache(maxsize=None)
+@memoize
+def _fibonacci_recursive_kernel(n: int) -> int:
+    """Unchecked memoised recursion behind :func:`fibonacci_recursive`."""
+    if n < 2:
+        return n
+    return _fibonacci_recursive_kernel(n - 1) + _fibonacci_recursive_kernel(n - 2)
+
+
 def fibonacci_recursive(n: int) -> int:
     """
     Calculate nth Fibonacci number recursively with memoization.
@@ -65,9 +87,10 @@ def fibonacci_recursive(n: int) -> int:
     if n < 0:
         raise ValueError("Fibonacci is not defined for negative numbers")
 
-    if n < 2:
-        return n
-    return fibonacci_recursive(n - 1) + fibonacci_recursive(n - 2)
+    return _fibonacci_recursive_kernel(n)
+
+
+share_cache(fibonacci_recursive, _fibonacci_recursive_kernel)
 
 
 __all__ = ["fibonacci_iterative", "fibonacci_recursive"]
\ No newline at end of file
@@ -1,7 +1,14 @@
 """Greatest Common Divisor (GCD) Module - Iterative and Recursive Implementations"""
 
-from functools import lru_cache
-from typing import Union
+import functools
+import os
+from typing import Iterable, Union
+
+from advmath import backend
+from advmath._memo import memoize, share_cache
+from advmath._product_tree import _next_level, product_tree
+from advmath._validate import all_at_least, all_ints
+from advmath.registry import get_thresholds
 
 
 def gcd_iterative(a: int, b: int) -> int:
@@ -41,7 +48,14 @@ def gcd_iterative(a: int, b: int) -> int:
     return a
 
 
-@lru_cache(maxsize=None)
+@memoize
+def _gcd_recursive_kernel(a: int, b: int) -> int:
+    """Unchecked memoised recursion behind :func:`gcd_recursive`."""
+    if b == 0:
+        return a
+    return _gcd_recursive_kernel(b, a % b)
+
+
 def gcd_recursive(a: int, b: int) -> int:
     """
     Calculate Greatest Common Divisor (GCD) recursively with memoization.
@@ -73,10 +87,657 @@ def gcd_recursive(a: int, b: int) -> int:
     if a == 0 and b == 0:
         return 0
 
-    a, b = abs(a), abs(b)
+    return _gcd_recursive_kernel(a, b)
+
+
+share_cache(gcd_recursive, _gcd_recursive_kernel)
+
+
+# ---------------------------------------------------------------------------
+# Fast kernels for large operands
+# ---------------------------------------------------------------------------
+
+# Width of the leading "machine word" extracted by Lehmer's algorithm.
+_LEHMER_WORD = 62
+
+
+def _validate_gcd_args(a: int, b: int) -> None:
+    """Validate that *a* and *b* are non-negative integers.
+
+    Raises:
+        ValueError: If either a or b is not an integer or is negative
+    """
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise ValueError("GCD is only defined for integers")
+
+    if a < 0 or b < 0:
+        raise ValueError("GCD is only defined for non-negative integers")
+
+
+def _euclid_kernel(a: int, b: int) -> int:
+    """Unchecked Euclidean algorithm."""
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _binary_kernel(a: int, b: int) -> int:
+    """Unchecked binary (Stein) GCD using shifts and subtraction only."""
+    if a == 0:
+        return b
     if b == 0:
         return a
-    return gcd_recursive(b, a % b)
+
+    # Common power of two, then strip the remaining factors of two from a.
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def _lehmer_kernel(a: int, b: int) -> int:
+    """Unchecked Lehmer GCD (Knuth, TAOCP vol. 2, Algorithm L).
+
+    The quotient sequence is simulated on the leading ``_LEHMER_WORD`` bits of
+    both operands and the accumulated 2x2 cofactor matrix is applied to the
+    full-width values in one step, so each bigint update replaces many
+    Euclidean divisions.
+    """
+    if a < b:
+        a, b = b, a
+
+    while b.bit_length() > _LEHMER_WORD:
+        shift = a.bit_length() - _LEHMER_WORD
+        x = a >> shift
+        y = b >> shift
+
+        A, B, C, D = 1, 0, 0, 1
+        while y + C != 0 and y + D != 0:
+            q = (x + A) // (y + C)
+            if q != (x + B) // (y + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            x, y = y, x - q * y
+
+        if B == 0:
+            # No progress on the leading word; fall back to one full step.
+            a, b = b, a % b
+        else:
+            a, b = A * a + B * b, C * a + D * b
+
+    return _euclid_kernel(a, b)
+
+
+_GCD_KERNELS = {
+    "euclid": _euclid_kernel,
+    "binary": _binary_kernel,
+    "lehmer": _lehmer_kernel,
+}
+
+
+# ``method="auto"`` switches from Euclid to Lehmer at the registry threshold
+# ``gcd_lehmer_bits`` (see :func:`advmath.registry.get_thresholds`).  Measured
+# on CPython 3.11: Lehmer's interpreted inner loop only pays for itself once
+# the saved full-width divisions dominate, around 8k bits.  The binary
+# algorithm never beat Euclid under CPython (shifts and subtractions cost as
+# much as ``%`` on bigints), so ``"auto"`` does not pick it; it is kept as an
+# explicit method.
+def _select_gcd_kernel(a: int, b: int):
+    """Pick a GCD kernel for ``method="auto"`` from the operand bit length."""
+    if max(a.bit_length(), b.bit_length()) < get_thresholds()["gcd_lehmer_bits"]:
+        return _euclid_kernel
+    return _lehmer_kernel
+
+
+def gcd_binary(a: int, b: int) -> int:
+    """
+    Calculate Greatest Common Divisor (GCD) with the binary (Stein) algorithm.
+
+    Args:
+        a: First integer (non-negative)
+        b: Second integer (non-negative)
+
+    Returns:
+        The GCD of a and b
+
+    Raises:
+        ValueError: If either a or b is negative or not an integer
+
+    Examples:
+        >>> gcd_binary(48, 64)
+        16
+        >>> gcd_binary(17, 23)
+        1
+    """
+    _validate_gcd_args(a, b)
+    return _binary_kernel(a, b)
+
+
+def gcd_lehmer(a: int, b: int) -> int:
+    """
+    Calculate Greatest Common Divisor (GCD) with Lehmer's algorithm.
+
+    Intended for multi-thousand-digit operands, where it performs far fewer
+    full-width bigint divisions than the textbook Euclidean algorithm.
+
+    Args:
+        a: First integer (non-negative)
+        b: Second integer (non-negative)
+
+    Returns:
+        The GCD of a and b
+
+    Raises:
+        ValueError: If either a or b is negative or not an integer
+
+    Examples:
+        >>> gcd_lehmer(48, 64)
+        16
+        >>> gcd_lehmer(2**200 * 3, 2**100 * 9)
+        3802951800684688204490109616128
+    """
+    _validate_gcd_args(a, b)
+    return _lehmer_kernel(a, b)
+
+
+def gcd_native(a: int, b: int) -> int:
+    """
+    Calculate Greatest Common Divisor (GCD) with the active arithmetic backend.
+
+    Uses ``gmpy2.gcd``, :func:`math.gcd` or the pure Python Euclid/Lehmer
+    kernels depending on :func:`advmath.backend.get_backend`.
+
+    Args:
+        a: First integer (non-negative)
+        b: Second integer (non-negative)
+
+    Returns:
+        The GCD of a and b
+
+    Raises:
+        ValueError: If either a or b is negative or not an integer
+
+    Examples:
+        >>> gcd_native(48, 64)
+        16
+    """
+    _validate_gcd_args(a, b)
+    return backend.current().gcd(a, b)
+
+
+def gcd_fast(a: int, b: int, method: str = "auto") -> int:
+    """
+    Calculate Greatest Common Divisor (GCD) with a selectable algorithm.
+
+    Args:
+        a: First integer (non-negative)
+        b: Second integer (non-negative)
+        method: One of ``"euclid"``, ``"binary"``, ``"lehmer"`` or ``"auto"``.
+            ``"auto"`` picks an algorithm from the operand bit length.
+
+    Returns:
+        The GCD of a and b
+
+    Raises:
+        ValueError: If either a or b is negative or not an integer
+        ValueError: If method is not a known GCD method
+
+    Examples:
+        >>> gcd_fast(48, 64)
+        16
+        >>> gcd_fast(48, 64, method="binary")
+        16
+    """
+    _validate_gcd_args(a, b)
+
+    if method == "auto":
+        kernel = _select_gcd_kernel(a, b)
+    else:
+        try:
+            kernel = _GCD_KERNELS[method]
+        except KeyError:
+            raise ValueError(
+                "GCD method must be 'auto', 'euclid', 'binary' or 'lehmer'"
+            ) from None
+    return kernel(a, b)
+
+
+# ---------------------------------------------------------------------------
+# Extended GCD and modular inverses
+# ---------------------------------------------------------------------------
+
+def _validate_modulus(a: int, m: int) -> None:
+    """Validate the operands of a modular inverse.
+
+    Raises:
+        ValueError: If a or m is not an integer, or m is not positive
+    """
+    if not isinstance(a, int) or not isinstance(m, int):
+        raise ValueError("Modular inverse is only defined for integers")
+
+    if m <= 0:
+        raise ValueError("Modulus must be a positive integer")
+
+
+def _extended_kernel(a: int, b: int) -> tuple[int, int, int]:
+    """Unchecked iterative extended Euclidean algorithm."""
+    old_r, r = a, b
+    old_s, s = 1, 0
+    old_t, t = 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_s, s = s, old_s - q * s
+        old_t, t = t, old_t - q * t
+    return old_r, old_s, old_t
+
+
+def _inverse_kernel(a: int, m: int) -> int:
+    """Unchecked modular inverse of *a* modulo *m*."""
+    g, x, _ = _extended_kernel(a % m, m)
+    if g != 1:
+        raise ValueError(f"{a} is not invertible modulo {m}")
+    return x % m
+
+
+def extended_gcd(a: int, b: int) -> tuple[int, int, int]:
+    """
+    Calculate the GCD together with Bezout coefficients.
+
+    Args:
+        a: First integer (non-negative)
+        b: Second integer (non-negative)
+
+    Returns:
+        A tuple ``(g, x, y)`` with ``g == gcd(a, b) == a * x + b * y``
+
+    Raises:
+        ValueError: If either a or b is negative or not an integer
+
+    Examples:
+        >>> extended_gcd(240, 46)
+        (2, -9, 47)
+        >>> extended_gcd(17, 0)
+        (17, 1, 0)
+    """
+    _validate_gcd_args(a, b)
+    return _extended_kernel(a, b)
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """
+    Calculate the inverse of *a* modulo *m*.
+
+    Args:
+        a: Integer to invert (reduced modulo m first)
+        m: Modulus (positive)
+
+    Returns:
+        The unique ``x`` in ``[0, m)`` with ``a * x % m == 1 % m``
+
+    Raises:
+        ValueError: If a or m is not an integer, or m is not positive
+        ValueError: If a is not invertible modulo m
+
+    Examples:
+        >>> mod_inverse(3, 11)
+        4
+        >>> mod_inverse(10, 17)
+        12
+    """
+    _validate_modulus(a, m)
+    return _inverse_kernel(a, m)
+
+
+def batch_mod_inverse(values: Iterable[int], m: int) -> list[int]:
+    """
+    Invert many values modulo the same *m* with Montgomery's trick.
+
+    Only one modular inverse is computed; the remaining work is
+    ``3 * (n - 1)`` modular multiplications.
+
+    Args:
+        values: Integers to invert (each reduced modulo m first)
+        m: Modulus (positive)
+
+    Returns:
+        The inverses, in the same order as *values*
+
+    Raises:
+        ValueError: If any value or m is not an integer, or m is not positive
+        ValueError: If any value is not invertible modulo m
+
+    Examples:
+        >>> batch_mod_inverse([3, 10, 5], 17)
+        [6, 12, 7]
+    """
+    values = list(values)
+    _validate_modulus(0, m)
+    if not all_ints(values):
+        for value in values:
+            _validate_modulus(value, m)
+
+    if not values:
+        return []
+
+    # prefix[i] is the product of values[0..i] modulo m.
+    prefix = [0] * len(values)
+    acc = 1
+    for i, value in enumerate(values):
+        acc = acc * value % m
+        prefix[i] = acc
+
+    try:
+        inv = _inverse_kernel(acc, m)
+    except ValueError:
+        # Report the first offending input rather than the product.
+        for value in values:
+            if _extended_kernel(value % m, m)[0] != 1:
+                raise ValueError(f"{value} is not invertible modulo {m}") from None
+        raise
+
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % m
+        inv = inv * values[i] % m
+    result[0] = inv
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Batch GCD
+# ---------------------------------------------------------------------------
+
+def _remainders_in_memory(values: list[int]) -> list[int]:
+    """Remainder tree over an in-memory product tree.
+
+    Returns ``P mod x**2`` for every leaf ``x``, where ``P`` is the product
+    of all values.
+    """
+    levels = product_tree(values)
+    remainders = levels[-1]
+    for level in reversed(levels[:-1]):
+        remainders = [remainders[i // 2] % (x * x) for i, x in enumerate(level)]
+    return remainders
+
+
+def _remainders_spilled(values: list[int], spill_dir: Union[str, os.PathLike]) -> list[int]:
+    """Remainder tree that keeps only one product-tree level in memory.
+
+    Each level is pickled to a scratch directory under *spill_dir* on the way
+    up and read back on the way down.
+    """
+    import pickle
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="advmath-batch-gcd-", dir=spill_dir) as tmp:
+        paths = []
+        level = values
+        while True:
+            path = os.path.join(tmp, f"level-{len(paths)}.pickle")
+            with open(path, "wb") as fh:
+                pickle.dump(level, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            paths.append(path)
+            if len(level) == 1:
+                break
+            level = _next_level(level)
+
+        remainders = level
+        del level
+        for path in reversed(paths[:-1]):
+            with open(path, "rb") as fh:
+                level = pickle.load(fh)
+            remainders = [remainders[i // 2] % (x * x) for i, x in enumerate(level)]
+            del level
+    return remainders
+
+
+def batch_gcd(
+    values: Iterable[int],
+    spill_dir: Union[str, os.PathLike, None] = None,
+) -> list[int]:
+    """
+    Calculate, for every input, its GCD with the product of all the others.
+
+    Uses Bernstein's product tree / remainder tree algorithm, which runs in
+    quasi-linear time instead of the quadratic cost of pairwise GCDs.  A
+    result greater than 1 means that input shares a factor with another one.
+
+    Args:
+        values: Positive integers (for example RSA moduli)
+        spill_dir: If given, tree levels are written to a temporary directory
+            inside it so that only one level is held in memory at a time
+
+    Returns:
+        The GCDs, in the same order as *values*
+
+    Raises:
+        ValueError: If any value is not an integer or is not positive
+
+    Examples:
+        >>> batch_gcd([15, 21, 22, 35])
+        [15, 21, 1, 35]
+        >>> batch_gcd([7, 11, 13])
+        [1, 1, 1]
+    """
+    values = list(values)
+    if not all_at_least(values, 1):
+        for value in values:
+            if not isinstance(value, int):
+                raise ValueError("GCD is only defined for integers")
+            if value <= 0:
+                raise ValueError("Batch GCD is only defined for positive integers")
+
+    if not values:
+        return []
+
+    if spill_dir is None:
+        remainders = _remainders_in_memory(values)
+    else:
+        remainders = _remainders_spilled(values, spill_dir)
+
+    result = []
+    for r, x in zip(remainders, values):
+        q = r // x
+        result.append(_select_gcd_kernel(q, x)(q, x))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Chinese remainder theorem
+# ---------------------------------------------------------------------------
+
+def _validate_moduli(moduli: list[int]) -> None:
+    if not all_at_least(moduli, 1):
+        for m in moduli:
+            if not isinstance(m, int):
+                raise ValueError("CRT is only defined for integers")
+            if m <= 0:
+                raise ValueError("Moduli must be positive integers")
+
+
+def _coprime_tree(moduli: list[int]) -> tuple[list[list[int]], list[int]]:
+    """Product tree of *moduli* and ``(M / m_i) mod m_i`` for every leaf,
+    read off the remainder tree ``M mod m_i**2``."""
+    levels = product_tree(moduli)
+    remainders = levels[-1]
+    for level in reversed(levels[:-1]):
+        remainders = [remainders[i // 2] % (x * x) for i, x in enumerate(level)]
+    return levels, [r // m for r, m in zip(remainders, levels[0])]
+
+
+class CrtBasis:
+    """
+    Precomputed subproduct tree for solving many CRT systems over the same moduli.
+
+    Building the basis does the expensive work once: the product tree of the
+    moduli and the remainder tree of their product ``M``, from which every
+    ``(M / m_i)**-1 mod m_i`` follows with one small inversion.  :meth:`solve`
+    then needs one multiplication pass up the tree per system.
+
+    The same remainder tree shows which moduli share a factor with another
+    one (``gcd(M / m_i, m_i) > 1``).  Those are merged pairwise up a tree of
+    their own, with a ``gcd_iterative`` consistency check at every node, and
+    their combined congruence joins the coprime ones as one more leaf.
+
+    Args:
+        moduli: Positive integers (need not be pairwise coprime)
+
+    Raises:
+        ValueError: If any modulus is not an integer or is not positive
+
+    Examples:
+        >>> basis = CrtBasis([3, 5, 7])
+        >>> basis.modulus
+        105
+        >>> basis.solve([2, 3, 2]), basis.solve([1, 1, 1])
+        (23, 1)
+    """
+
+    def __init__(self, moduli: Iterable[int]) -> None:
+        moduli = list(moduli)
+        _validate_moduli(moduli)
+        self.moduli = tuple(moduli)
+
+        levels, cofactors = _coprime_tree(moduli)
+        shared = [i for i, (c, m) in enumerate(zip(cofactors, moduli)) if _euclid_kernel(c, m) != 1]
+        # Indices of the moduli solved by the coprime tree; the congruences
+        # of the shared ones are merged into a single extra leaf.
+        self._shared = shared
+        self._merges: list[list[tuple[int, int, int, int]]] = []
+        if shared:
+            taken = set(shared)
+            self._coprime = [i for i in range(len(moduli)) if i not in taken]
+            leaf = self._merge_tree([moduli[i] for i in shared])
+            levels, cofactors = _coprime_tree([moduli[i] for i in self._coprime] + [leaf])
+        else:
+            self._coprime = list(range(len(moduli)))
+        self._levels = levels
+        self._coefficients = [_inverse_kernel(c, m) for c, m in zip(cofactors, levels[0])]
+        self.modulus = levels[-1][0]
+
+    def _merge_tree(self, moduli: list[int]) -> int:
+        """Record, per level, ``(m1, g, m2 // g, (m1 // g)**-1 mod m2 // g)``
+        for every pair of neighbouring congruences; return the LCM of
+        *moduli*."""
+        level = moduli
+        while len(level) > 1:
+            nodes = []
+            for i in range(0, len(level) - 1, 2):
+                m1, m2 = level[i], level[i + 1]
+                g = gcd_iterative(m1, m2)
+                step = m2 // g
+                nodes.append((m1, g, step, _inverse_kernel(m1 // g, step)))
+            self._merges.append(nodes)
+            level = [m1 * step for m1, _, step, _ in nodes] + level[len(nodes) * 2:]
+        return level[0]
+
+    def _merge(self, residues: list[int]) -> int:
+        values = residues
+        for nodes in self._merges:
+            merged = []
+            for k, (m1, g, step, inv) in enumerate(nodes):
+                r1, r2 = values[2 * k], values[2 * k + 1]
+                diff = r2 - r1
+                if diff % g:
+                    raise ValueError(f"Inconsistent congruences: residues differ modulo {g}")
+                merged.append(r1 + m1 * (diff // g * inv % step))
+            values = merged + values[len(nodes) * 2:]
+        return values[0]
+
+    def solve(self, residues: Iterable[int]) -> int:
+        """
+        Return the smallest non-negative x with ``x % m == r % m`` for every pair.
+
+        Args:
+            residues: One integer per modulus (reduced modulo it first)
+
+        Returns:
+            The solution in ``[0, modulus)``; all solutions are congruent
+            modulo ``self.modulus``, the LCM of the moduli
+
+        Raises:
+            ValueError: If a residue is not an integer, the number of
+                residues differs from the number of moduli, or the
+                congruences are inconsistent
+        """
+        residues = list(residues)
+        if len(residues) != len(self.moduli):
+            raise ValueError("CRT needs exactly one residue per modulus")
+        if not all_ints(residues):
+            raise ValueError("CRT is only defined for integers")
+
+        moduli = self.moduli
+        leaves = [residues[i] for i in self._coprime]
+        if self._shared:
+            leaves.append(self._merge([residues[i] % moduli[i] for i in self._shared]))
+        values = [r * c % m for r, c, m in zip(leaves, self._coefficients, self._levels[0])]
+        for level in self._levels[:-1]:
+            values = [
+                values[i] * level[i + 1] + values[i + 1] * level[i]
+                if i + 1 < len(values) else values[i]
+                for i in range(0, len(values), 2)
+            ]
+        return values[0] % self.modulus if values else 0
+
+
+@functools.lru_cache(maxsize=8)
+def _crt_basis(moduli: tuple[int, ...]) -> CrtBasis:
+    """Recently used bases, so repeated :func:`crt` calls over the same
+    moduli skip the precomputation."""
+    return CrtBasis(moduli)
+
+
+def crt(residues: Iterable[int], moduli: Iterable[int]) -> int:
+    """
+    Solve a system of congruences with the Chinese remainder theorem.
+
+    Uses a subproduct tree (see :class:`CrtBasis`) instead of folding the
+    congruences one at a time, so thousands of moduli cost a few balanced
+    tree passes.  The bases of the last few distinct moduli sets are kept,
+    so repeated calls with the same moduli only redo the final pass; build
+    a :class:`CrtBasis` directly to control that reuse.
+
+    Args:
+        residues: Integers r_i (reduced modulo m_i first)
+        moduli: Positive integers m_i (need not be pairwise coprime)
+
+    Returns:
+        The smallest non-negative x with ``x % m_i == r_i % m_i`` for all i;
+        every solution is congruent to it modulo ``lcm(m_i)``
+
+    Raises:
+        ValueError: If any value is not an integer, a modulus is not
+            positive, the sequences differ in length, or the congruences
+            are inconsistent
+
+    Examples:
+        >>> crt([2, 3, 2], [3, 5, 7])
+        23
+        >>> crt([3, 5], [4, 6])
+        11
+    """
+    moduli = tuple(moduli)
+    _validate_moduli(list(moduli))
+    return _crt_basis(moduli).solve(residues)
 
 
-__all__ = ["gcd_iterative", "gcd_recursive"]
\ No newline at end of file
+__all__ = [
+    "gcd_iterative",
+    "gcd_recursive",
+    "gcd_binary",
+    "gcd_lehmer",
+    "gcd_native",
+    "gcd_fast",
+    "extended_gcd",
+    "mod_inverse",
+    "batch_mod_inverse",
+    "batch_gcd",
+    "CrtBasis",
+    "crt",
+]
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Console entry point with a dependency-free fast path.
+
+Importing :mod:`typer` (and through it :mod:`click` and :mod:`rich`) costs far
+more than the calculation for typical one-off invocations such as
+``advmath gcd 48 64``.  :func:`main` recognises the simple forms of the
+``fact``, ``gcd``, ``lcm`` and ``prime`` commands and answers them directly,
+producing exactly the output and exit status of :mod:`advmath.cli`.  Anything
+else (``--help``, other commands, unusual option spellings, negative numbers)
+is handed to the full Typer application unchanged.  ``$ADVMATH_DISK_CACHE``
+enables the persistent result cache (:mod:`advmath.diskcache`) on both
+paths.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Optional, Sequence
+
+# Command -> (number of integer arguments, accepts --verbose)
+_SIMPLE_COMMANDS = {
+    "fact": (1, True),
+    "gcd": (2, False),
+    "lcm": (2, False),
+    "prime": (1, False),
+}
+
+
+def _parse(args: Sequence[str]) -> Optional[tuple[str, list[int], str, bool]]:
+    """Parse a simple invocation, or return ``None`` to defer to Typer."""
+    if not args or args[0] not in _SIMPLE_COMMANDS:
+        return None
+    command = args[0]
+    arity, accepts_verbose = _SIMPLE_COMMANDS[command]
+
+    numbers: list[int] = []
+    method = "iterative"
+    verbose = False
+    i = 1
+    while i < len(args):
+        token = args[i]
+        if token in ("--method", "-m") and i + 1 < len(args):
+            method = args[i + 1]
+            i += 2
+            continue
+        if token.startswith("--method="):
+            method = token.partition("=")[2]
+        elif accepts_verbose and token in ("--verbose", "-v"):
+            verbose = True
+        elif token.isascii() and token.isdigit():
+            numbers.append(int(token))
+        else:
+            return None
+        i += 1
+
+    if len(numbers) != arity:
+        return None
+    return command, numbers, method, verbose
+
+
+def _compute(command: str, numbers: list[int], method: str, verbose: bool) -> str:
+    """Run *command* and format its output line like :mod:`advmath.cli`."""
+    from advmath.registry import compute
+
+    disk_cache = os.environ.get("ADVMATH_DISK_CACHE")
+    if disk_cache:
+        from advmath import diskcache
+
+        diskcache.enable(disk_cache)
+
+    if command == "fact":
+        (n,) = numbers
+        from advmath.output import to_decimal_string
+
+        result = to_decimal_string(compute("factorial", n, method=method))
+        return f"Factorial of {n} is {result}" if verbose else result
+    if command == "prime":
+        (n,) = numbers
+        result = compute("prime", n, method=method)
+        return f"{n} is {'prime' if result else 'not prime'}"
+
+    a, b = numbers
+    return f"{command.upper()} of {a} and {b} is {compute(command, a, b, method=method)}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the ``advmath`` command line."""
+    args = list(sys.argv[1:] if argv is None else argv)
+
+    parsed = _parse(args)
+    if parsed is None:
+        from advmath.cli import app
+
+        app(args=args)
+        return
+
+    try:
+        line = _compute(*parsed)
+    except Exception as exc:  # noqa: BLE001 – mirrors cli.handle_errors
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.stdout.write(line + "\n")
+    sys.exit(0)
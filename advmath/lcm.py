@@ -7,10 +7,14 @@ the supplied GCD routine.  This removes duplication, makes the module easier
 to test, and keeps the public API unchanged.
 """
 
-from functools import lru_cache
-from typing import Callable
+import math
+from typing import Callable, Iterable, Optional
 
-from advmath.gcd import gcd_iterative, gcd_recursive
+from advmath import backend
+from advmath._memo import memoize
+from advmath._product_tree import tree_product
+from advmath.gcd import _euclid_kernel, _gcd_recursive_kernel, _select_gcd_kernel
+from advmath.prime import primes_up_to
 
 
 # ---------------------------------------------------------------------------
@@ -42,7 +46,7 @@ def _lcm_common(a: int, b: int, gcd_func: Callable[[int, int], int]) -> int:
     a, b : int
         Non‑negative integers.
     gcd_func : Callable[[int, int], int]
-        Function to compute the GCD of *a* and *b*.
+        Unchecked GCD kernel; it is only called with validated arguments.
     """
     _validate_ints(a, b)
     if a == 0 or b == 0:
@@ -68,10 +72,10 @@ def lcm_iterative(a: int, b: int) -> int:
     int
         The least common multiple of *a* and *b*.
     """
-    return _lcm_common(a, b, gcd_iterative)
+    return _lcm_common(a, b, _euclid_kernel)
 
 
-@lru_cache(maxsize=None)
+@memoize
 def lcm_recursive(a: int, b: int) -> int:
     """Recursively compute the LCM using the Euclidean algorithm.
 
@@ -85,7 +89,250 @@ def lcm_recursive(a: int, b: int) -> int:
     int
         The least common multiple of *a* and *b*.
     """
-    return _lcm_common(a, b, gcd_recursive)
+    return _lcm_common(a, b, _gcd_recursive_kernel)
 
 
-__all__ = ["lcm_iterative", "lcm_recursive"]
+def lcm_native(a: int, b: int) -> int:
+    """Compute the LCM with the active arithmetic backend.
+
+    Uses ``gmpy2.lcm``, :func:`math.lcm` or the pure Python GCD kernels
+    depending on :func:`advmath.backend.get_backend`.
+
+    Parameters
+    ----------
+    a, b : int
+        Non‑negative integers.
+
+    Returns
+    -------
+    int
+        The least common multiple of *a* and *b*.
+    """
+    _validate_ints(a, b)
+    return backend.current().lcm(a, b)
+
+
+# ---------------------------------------------------------------------------
+# LCM of a range
+# ---------------------------------------------------------------------------
+
+def _validate_range_bound(n: int) -> None:
+    """Validate the upper bound *n* of :func:`lcm_range`.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an :class:`int`.
+    ValueError
+        If *n* is negative.
+    """
+    if not isinstance(n, int):
+        raise TypeError("LCM requires integer inputs")
+    if n < 0:
+        raise ValueError("LCM is only defined for non-negative integers")
+
+
+def _max_prime_powers(n: int) -> list[tuple[int, int]]:
+    """Return ``(p, k)`` with ``p**k <= n < p**(k + 1)`` for every prime
+    ``p <= n``."""
+    result = []
+    for p in primes_up_to(n):
+        k, pk = 1, p
+        while pk * p <= n:
+            pk *= p
+            k += 1
+        result.append((p, k))
+    return result
+
+
+def lcm_range(n: int, modulus: Optional[int] = None) -> int:
+    """Compute ``lcm(1, 2, ..., n)`` from prime powers.
+
+    The result is the product of ``p**floor(log_p(n))`` over the primes
+    ``p <= n``, multiplied as a balanced product tree instead of folding
+    ``n`` GCDs into an ever-growing accumulator.
+
+    Parameters
+    ----------
+    n : int
+        Non‑negative upper bound of the range.
+    modulus : int, optional
+        If given, return the result reduced modulo this positive integer
+        without ever building the full LCM.
+
+    Returns
+    -------
+    int
+        ``lcm(1, ..., n)`` (``1`` for ``n < 2``), optionally modulo
+        *modulus*.
+    """
+    _validate_range_bound(n)
+    if modulus is not None:
+        if not isinstance(modulus, int):
+            raise TypeError("LCM requires integer inputs")
+        if modulus <= 0:
+            raise ValueError("Modulus must be a positive integer")
+        result = 1 % modulus
+        for p, k in _max_prime_powers(n):
+            result = result * pow(p, k, modulus) % modulus
+        return result
+
+    return tree_product(p**k for p, k in _max_prime_powers(n))
+
+
+def lcm_range_log(n: int) -> float:
+    """Return ``log(lcm(1, ..., n))``, i.e. Chebyshev's function ψ(n).
+
+    Useful when only the size of :func:`lcm_range` is needed; nothing
+    larger than ``n`` is ever built.
+
+    Parameters
+    ----------
+    n : int
+        Non‑negative upper bound of the range.
+
+    Returns
+    -------
+    float
+        The natural logarithm of ``lcm(1, ..., n)``.
+    """
+    _validate_range_bound(n)
+    return math.fsum(k * math.log(p) for p, k in _max_prime_powers(n))
+
+
+# ---------------------------------------------------------------------------
+# Streaming accumulator
+# ---------------------------------------------------------------------------
+
+@memoize
+def _smooth_primes(bound: int) -> tuple[int, ...]:
+    """Cached primes ``<= bound`` used for trial division."""
+    return tuple(primes_up_to(bound))
+
+
+class LcmAccumulator:
+    """Running LCM of a stream of non‑negative integers.
+
+    The part of the LCM made of primes ``<= smooth_bound`` is kept as a
+    ``prime -> max exponent`` dictionary, so inputs that factor over those
+    primes only cost a few small‑int divisions.  Whatever is left after
+    trial division (all of whose prime factors exceed ``smooth_bound``) is
+    folded into a bigint cofactor with a regular GCD step.  The full value is
+    materialised lazily with a balanced product tree and cached until the
+    next update.
+
+    Parameters
+    ----------
+    values : Iterable[int], optional
+        Initial values to fold in.
+    smooth_bound : int, optional
+        Largest prime tracked in the exponent dictionary.
+
+    Examples
+    --------
+    >>> acc = LcmAccumulator([4, 6])
+    >>> acc.add(10)
+    >>> acc.value
+    60
+    >>> acc.divides(20), acc.divides(8)
+    (True, False)
+    """
+
+    def __init__(self, values: Iterable[int] = (), smooth_bound: int = 1000) -> None:
+        _validate_range_bound(smooth_bound)
+        self._primes = _smooth_primes(smooth_bound)
+        self._bound = smooth_bound
+        self._exponents: dict[int, int] = {}
+        self._cofactor = 1
+        self._zero = False
+        self._value: Optional[int] = 1
+        self.update(values)
+
+    def _factor_smooth(self, x: int) -> tuple[dict[int, int], int]:
+        """Split *x* (> 0) into its ``<= smooth_bound`` prime powers and the
+        remaining cofactor."""
+        exponents = {}
+        for p in self._primes:
+            if p * p > x:
+                break
+            if x % p == 0:
+                k = 0
+                while x % p == 0:
+                    x //= p
+                    k += 1
+                exponents[p] = k
+        # Trial division stopped early: what is left is 1 or a prime.
+        if 1 < x <= self._bound:
+            exponents[x] = exponents.get(x, 0) + 1
+            x = 1
+        return exponents, x
+
+    def add(self, x: int) -> None:
+        """Fold *x* into the running LCM."""
+        _validate_ints(x, 0)
+        if self._zero:
+            return
+        if x == 0:
+            self._zero = True
+            self._value = 0
+            return
+
+        exponents, rest = self._factor_smooth(x)
+        changed = False
+        for p, k in exponents.items():
+            if k > self._exponents.get(p, 0):
+                self._exponents[p] = k
+                changed = True
+        if rest > 1:
+            g = _select_gcd_kernel(self._cofactor, rest)(self._cofactor, rest)
+            if g != rest:
+                self._cofactor *= rest // g
+                changed = True
+        if changed:
+            self._value = None
+
+    def update(self, values: Iterable[int]) -> None:
+        """Fold every value of *values* into the running LCM."""
+        for x in values:
+            self.add(x)
+
+    @property
+    def value(self) -> int:
+        """The LCM of all values added so far (``1`` if none)."""
+        if self._value is None:
+            powers = [p**k for p, k in self._exponents.items()]
+            powers.append(self._cofactor)
+            self._value = tree_product(powers)
+        return self._value
+
+    def bit_length(self) -> int:
+        """Number of bits of :attr:`value`."""
+        return self.value.bit_length()
+
+    def divides(self, x: int) -> bool:
+        """Return ``True`` if *x* divides the current LCM.
+
+        Only the cofactor is touched as a bigint; the smooth part is checked
+        against the exponent dictionary.
+        """
+        _validate_ints(x, 0)
+        if self._zero:
+            return True
+        if x == 0:
+            return False
+
+        exponents, rest = self._factor_smooth(x)
+        for p, k in exponents.items():
+            if k > self._exponents.get(p, 0):
+                return False
+        return self._cofactor % rest == 0
+
+
+__all__ = [
+    "lcm_iterative",
+    "lcm_recursive",
+    "lcm_native",
+    "lcm_range",
+    "lcm_range_log",
+    "LcmAccumulator",
+]
@@ -0,0 +1,336 @@
+"""Opt-in runtime metrics for long-running services.
+
+Nothing is measured until :func:`enable` is called.  It replaces every public
+calculation in ``advmath.__all__`` *on the package namespace* with a thin
+wrapper recording call counts, errors, a latency histogram and an input-size
+histogram (bit length of the largest integer argument).  :func:`disable`
+puts the original functions back, so a disabled process pays nothing::
+
+    >>> import advmath
+    >>> from advmath import metrics
+    >>> metrics.enable()
+    >>> advmath.gcd_iterative(48, 64)
+    16
+    >>> metrics.snapshot()["functions"]["gcd_iterative"]["calls"]
+    1
+    >>> metrics.disable()
+
+Only calls made through the package (``advmath.gcd_iterative(...)``,
+:func:`advmath.registry.compute`, the batch and server front ends) are
+counted: names imported with ``from advmath import ...`` before
+:func:`enable` keep pointing at the unwrapped functions, and internal calls
+between modules (e.g. recursion) are not counted.
+
+Counters are kept per thread, so recording a call takes no lock; they are
+summed when a :func:`snapshot` is taken, and folded into a shared total when
+their thread exits.  ``lru_cache`` hit ratios are read
+from the caches themselves at snapshot time (see
+:func:`advmath.profiling.cache_info`).  :func:`prometheus_text` renders a
+snapshot in the Prometheus text exposition format; ``advmath serve
+--metrics-port`` serves it over HTTP at ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional
+
+import advmath
+
+# Upper bounds of the histogram buckets (the last one is +Inf).
+LATENCY_BUCKETS: tuple[float, ...] = (
+    1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, math.inf,
+)
+INPUT_BITS_BUCKETS: tuple[float, ...] = (
+    8, 64, 512, 4096, 32768, 262144, math.inf,
+)
+
+# Public names that are not calculations (backend selection), or whose call
+# only creates a generator, so timing it would measure nothing.
+_EXCLUDED = {"set_backend", "get_backend", "divisors"}
+
+# Public name -> (original function, installed wrapper) while enabled.
+_originals: dict[str, tuple[Callable[..., Any], Callable[..., Any]]] = {}
+
+# The series tables of the live threads, plus one holding the totals of the
+# threads that have exited (merged in when their thread-local data is freed).
+_retired: dict[str, "_Series"] = {}
+_tables: list[dict[str, "_Series"]] = [_retired]
+_tables_lock = threading.Lock()
+_local = threading.local()
+
+
+class _Series:
+    """Counters of one function in one thread (single writer, no lock)."""
+
+    __slots__ = ("calls", "errors", "seconds", "bits", "latency", "input_bits")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bits = 0
+        self.latency = [0] * len(LATENCY_BUCKETS)
+        self.input_bits = [0] * len(INPUT_BITS_BUCKETS)
+
+
+def _bucket(bounds: tuple[float, ...], value: float) -> int:
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+    return len(bounds) - 1
+
+
+def _merge(total: dict[str, _Series], table: dict[str, _Series]) -> None:
+    for name, series in list(table.items()):
+        merged = total.get(name)
+        if merged is None:
+            merged = total[name] = _Series()
+        merged.calls += series.calls
+        merged.errors += series.errors
+        merged.seconds += series.seconds
+        merged.bits += series.bits
+        merged.latency = [a + b for a, b in zip(merged.latency, series.latency)]
+        merged.input_bits = [a + b for a, b in zip(merged.input_bits, series.input_bits)]
+
+
+def _retire(table: dict[str, _Series]) -> None:
+    """Fold the table of an exited thread into ``_retired``."""
+    with _tables_lock:
+        try:
+            _tables.remove(table)
+        except ValueError:
+            return
+        _merge(_retired, table)
+
+
+class _Owner:
+    """Thread-local marker: freed, and so finalised, when its thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _thread_table() -> dict[str, _Series]:
+    try:
+        return _local.table
+    except AttributeError:
+        table: dict[str, _Series] = {}
+        with _tables_lock:
+            _tables.append(table)
+        owner = _local.owner = _Owner()
+        weakref.finalize(owner, _retire, table)
+        _local.table = table
+        return table
+
+
+def _input_bits(args: tuple) -> int:
+    bits = 0
+    for arg in args:
+        if isinstance(arg, int):
+            bits = max(bits, arg.bit_length())
+    return bits
+
+
+def observe(name: str, seconds: float, input_bits: int = 0, error: bool = False) -> None:
+    """Record one call of *name* that took *seconds*.
+
+    Used by the wrappers installed by :func:`enable`, and by the server for
+    whole requests (named ``request:<op>``).
+    """
+    table = _thread_table()
+    series = table.get(name)
+    if series is None:
+        series = table[name] = _Series()
+    series.calls += 1
+    series.errors += error
+    series.seconds += seconds
+    series.bits += input_bits
+    series.latency[_bucket(LATENCY_BUCKETS, seconds)] += 1
+    series.input_bits[_bucket(INPUT_BITS_BUCKETS, input_bits)] += 1
+
+
+def _instrument(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        error = True
+        try:
+            result = func(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            observe(name, perf_counter() - start, _input_bits(args), error)
+
+    if hasattr(func, "cache_info"):
+        wrapper.cache_info = func.cache_info
+        wrapper.cache_clear = func.cache_clear
+    return wrapper
+
+
+def enable() -> None:
+    """Start recording calls to the public functions.  Idempotent."""
+    if _originals:
+        return
+    for name in advmath.__all__:
+        if name in _EXCLUDED:
+            continue
+        # Wrap whatever is installed now (e.g. a diskcache wrapper), so the
+        # layers stack in either order.
+        func = getattr(advmath, name)
+        if isinstance(func, type) or not callable(func):
+            continue
+        wrapper = _instrument(name, func)
+        _originals[name] = (func, wrapper)
+        setattr(advmath, name, wrapper)
+
+
+def disable() -> None:
+    """Stop recording and restore the original functions.
+
+    Names wrapped again since :func:`enable` (e.g. by
+    :func:`advmath.diskcache.enable`) are left alone.  Counters are kept;
+    see :func:`reset`.
+    """
+    for name, (func, wrapper) in _originals.items():
+        if getattr(advmath, name, None) is wrapper:
+            setattr(advmath, name, func)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    """Return ``True`` while :func:`enable` is in effect."""
+    return bool(_originals)
+
+
+def reset() -> None:
+    """Zero all counters."""
+    with _tables_lock:
+        for table in _tables:
+            table.clear()
+
+
+def _cumulative(counts: list[int], bounds: tuple[float, ...]) -> list[tuple[float, int]]:
+    total = 0
+    buckets = []
+    for bound, count in zip(bounds, counts):
+        total += count
+        buckets.append((bound, total))
+    return buckets
+
+
+def snapshot() -> dict[str, Any]:
+    """Return the current metrics.
+
+    Returns
+    -------
+    dict
+        ``{"functions": {name: {...}}, "caches": {name: {...}}}``.  Every
+        function entry has ``calls``, ``errors``, ``seconds_sum``,
+        ``input_bits_sum`` and the cumulative histograms
+        ``latency_buckets`` and ``input_bits_buckets`` as lists of
+        ``(upper_bound, count)`` pairs.  Every cache entry has
+        ``hits``, ``misses`` and ``hit_ratio`` (``None`` before first use).
+    """
+    merged: dict[str, _Series] = {}
+    with _tables_lock:
+        for table in _tables:
+            _merge(merged, table)
+
+    from advmath.profiling import cache_info
+
+    caches = {}
+    for name, (hits, misses) in cache_info().items():
+        lookups = hits + misses
+        caches[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else None,
+        }
+
+    return {
+        "functions": {
+            name: {
+                "calls": series.calls,
+                "errors": series.errors,
+                "seconds_sum": series.seconds,
+                "input_bits_sum": series.bits,
+                "latency_buckets": _cumulative(series.latency, LATENCY_BUCKETS),
+                "input_bits_buckets": _cumulative(series.input_bits, INPUT_BITS_BUCKETS),
+            }
+            for name, series in sorted(merged.items())
+        },
+        "caches": caches,
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(value)
+
+
+def prometheus_text(data: Optional[dict[str, Any]] = None) -> str:
+    """Render *data* (default: a fresh :func:`snapshot`) in the Prometheus
+    text exposition format (version 0.0.4)."""
+    data = snapshot() if data is None else data
+    functions = data["functions"]
+    lines = [
+        "# HELP advmath_calls_total Calls of advmath public functions.",
+        "# TYPE advmath_calls_total counter",
+    ]
+    for name, entry in functions.items():
+        lines.append(f'advmath_calls_total{{function="{_label(name)}"}} {entry["calls"]}')
+    lines += [
+        "# HELP advmath_errors_total Calls that raised an exception.",
+        "# TYPE advmath_errors_total counter",
+    ]
+    for name, entry in functions.items():
+        lines.append(f'advmath_errors_total{{function="{_label(name)}"}} {entry["errors"]}')
+
+    for metric, key, total, help_text in (
+        ("advmath_call_seconds", "latency_buckets", "seconds_sum", "Call latency in seconds."),
+        ("advmath_input_bits", "input_bits_buckets", "input_bits_sum", "Bit length of the largest integer argument."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for name, entry in functions.items():
+            label = _label(name)
+            for bound, count in entry[key]:
+                lines.append(f'{metric}_bucket{{function="{label}",le="{_bound(bound)}"}} {count}')
+            lines.append(f'{metric}_sum{{function="{label}"}} {entry[total]!r}')
+            lines.append(f'{metric}_count{{function="{label}"}} {entry["calls"]}')
+
+    caches = data["caches"]
+    lines += [
+        "# HELP advmath_cache_hits_total lru_cache hits.",
+        "# TYPE advmath_cache_hits_total counter",
+    ]
+    for name, entry in caches.items():
+        lines.append(f'advmath_cache_hits_total{{cache="{_label(name)}"}} {entry["hits"]}')
+    lines += [
+        "# HELP advmath_cache_misses_total lru_cache misses.",
+        "# TYPE advmath_cache_misses_total counter",
+    ]
+    for name, entry in caches.items():
+        lines.append(f'advmath_cache_misses_total{{cache="{_label(name)}"}} {entry["misses"]}')
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "INPUT_BITS_BUCKETS",
+    "LATENCY_BUCKETS",
+    "disable",
+    "enable",
+    "is_enabled",
+    "observe",
+    "prometheus_text",
+    "reset",
+    "snapshot",
+]
@@ -0,0 +1,215 @@
+"""Output of very large integers.
+
+``str(n)`` is quadratic in the number of digits and, since Python 3.11.7 /
+3.12, refuses to convert integers above 4300 digits at all.  This module
+converts in sub-quadratic time and streams the result instead of building
+one huge string:
+
+1. The integer is converted to a :class:`decimal.Decimal` by splitting it on
+   a tree of powers of two; libmpdec's fast multiplication makes this
+   sub-quadratic.
+2. The decimal is cut on a tree of powers of ten, which in base ten is only
+   an exponent shift, and the leaves are written out in order.
+
+Hexadecimal, binary and raw (big-endian bytes) output go through
+:meth:`int.to_bytes`, which is linear; :func:`save_int` writes raw output
+through :mod:`mmap`.
+"""
+
+from __future__ import annotations
+
+import decimal
+import os
+from typing import BinaryIO, Iterator, TextIO, Union
+
+FORMATS = ("dec", "hex", "bin", "raw")
+
+# Integers with at most this many bits are converted with plain ``str``.
+_SMALL_BITS = 8000
+
+# Leaf size (digits) of the powers-of-ten tree, and byte chunk for hex/bin.
+_CHUNK_DIGITS = 2000
+_CHUNK_BYTES = 1 << 16
+
+_CONTEXT = decimal.Context(
+    prec=decimal.MAX_PREC,
+    Emax=decimal.MAX_EMAX,
+    Emin=decimal.MIN_EMIN,
+    rounding=decimal.ROUND_DOWN,
+    traps=[decimal.Inexact],
+)
+
+
+def _validate_int(n: int) -> None:
+    if not isinstance(n, int):
+        raise TypeError("Output requires an integer")
+
+
+def _to_decimal(n: int) -> decimal.Decimal:
+    """Convert non-negative *n* to an exact Decimal (powers-of-two tree)."""
+    powers: dict[int, decimal.Decimal] = {}
+
+    def power_of_two(bits: int) -> decimal.Decimal:
+        result = powers.get(bits)
+        if result is None:
+            result = powers[bits] = _CONTEXT.power(decimal.Decimal(2), bits)
+        return result
+
+    def convert(n: int, bits: int) -> decimal.Decimal:
+        if bits <= _SMALL_BITS:
+            return decimal.Decimal(n)
+        low_bits = bits >> 1
+        hi = n >> low_bits
+        lo = n - (hi << low_bits)
+        return _CONTEXT.add(
+            _CONTEXT.multiply(convert(hi, bits - low_bits), power_of_two(low_bits)),
+            convert(lo, low_bits),
+        )
+
+    return convert(n, n.bit_length())
+
+
+def _decimal_leaves(d: decimal.Decimal, width: int) -> Iterator[str]:
+    """Yield the digits of integral *d*, left-padded to *width*, in chunks."""
+    if width <= _CHUNK_DIGITS:
+        yield str(d).zfill(width)
+        return
+    low = width // 2
+    hi = _CONTEXT.to_integral_value(_CONTEXT.scaleb(d, -low))
+    lo = _CONTEXT.subtract(d, _CONTEXT.scaleb(hi, low))
+    yield from _decimal_leaves(hi, width - low)
+    yield from _decimal_leaves(lo, low)
+
+
+def iter_decimal(n: int) -> Iterator[str]:
+    """Yield the decimal representation of *n* in chunks.
+
+    Concatenating the chunks gives the same string as ``str(n)`` would
+    without the digit limit.
+
+    Examples
+    --------
+    >>> "".join(iter_decimal(-120))
+    '-120'
+    """
+    _validate_int(n)
+    if n < 0:
+        yield "-"
+        n = -n
+    if n.bit_length() <= _SMALL_BITS:
+        yield str(n)
+        return
+    d = _to_decimal(n)
+    yield from _decimal_leaves(d, d.adjusted() + 1)
+
+
+def to_decimal_string(n: int) -> str:
+    """Return ``str(n)`` computed in sub-quadratic time, without the digit
+    limit."""
+    return "".join(iter_decimal(n))
+
+
+def _iter_hex(n: int) -> Iterator[str]:
+    data = n.to_bytes((n.bit_length() + 7) // 8 or 1, "big")
+    for start in range(0, len(data), _CHUNK_BYTES):
+        chunk = data[start:start + _CHUNK_BYTES].hex()
+        yield (chunk.lstrip("0") or "0") if start == 0 else chunk
+
+
+def _iter_bin(n: int) -> Iterator[str]:
+    data = n.to_bytes((n.bit_length() + 7) // 8 or 1, "big")
+    for start in range(0, len(data), _CHUNK_BYTES):
+        chunk = data[start:start + _CHUNK_BYTES]
+        if start == 0:
+            yield format(int.from_bytes(chunk, "big"), "b")
+        else:
+            yield format(int.from_bytes(chunk, "big"), f"0{8 * len(chunk)}b")
+
+
+def iter_format(n: int, fmt: str = "dec") -> Iterator[str]:
+    """Yield *n* as text in chunks.
+
+    Parameters
+    ----------
+    n : int
+        Value to format.
+    fmt : str
+        ``"dec"``, ``"hex"`` or ``"bin"`` (no prefix; negative values get a
+        leading ``-``).
+
+    Examples
+    --------
+    >>> "".join(iter_format(255, "hex")), "".join(iter_format(-5, "bin"))
+    ('ff', '-101')
+    """
+    _validate_int(n)
+    if fmt == "dec":
+        yield from iter_decimal(n)
+        return
+    if fmt not in ("hex", "bin"):
+        raise ValueError("Text format must be 'dec', 'hex' or 'bin'")
+    if n < 0:
+        yield "-"
+        n = -n
+    yield from (_iter_hex(n) if fmt == "hex" else _iter_bin(n))
+
+
+def to_raw_bytes(n: int) -> bytes:
+    """Return non-negative *n* as minimal big-endian bytes (``b"\\x00"`` for
+    zero)."""
+    _validate_int(n)
+    if n < 0:
+        raise ValueError("Raw output requires a non-negative integer")
+    return n.to_bytes((n.bit_length() + 7) // 8 or 1, "big")
+
+
+def write_int(n: int, stream: Union[TextIO, BinaryIO], fmt: str = "dec") -> None:
+    """Write *n* to *stream* in format *fmt* (one of :data:`FORMATS`).
+
+    Text formats are streamed chunk by chunk.  ``"raw"`` needs a binary
+    stream; for text streams that wrap one (like ``sys.stdout``) the
+    underlying ``buffer`` is used.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Format must be 'dec', 'hex', 'bin' or 'raw'")
+    if fmt == "raw":
+        data = to_raw_bytes(n)
+        stream.flush()
+        getattr(stream, "buffer", stream).write(data)
+        return
+    for chunk in iter_format(n, fmt):
+        stream.write(chunk)
+
+
+def save_int(n: int, path: Union[str, os.PathLike], fmt: str = "dec") -> int:
+    """Write *n* to the file at *path* and return the number of bytes written.
+
+    Raw output is copied into a memory-mapped file of the exact size; text
+    formats are streamed.  No trailing newline is added.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Format must be 'dec', 'hex', 'bin' or 'raw'")
+    if fmt != "raw":
+        with open(path, "w", encoding="ascii") as fh:
+            write_int(n, fh, fmt)
+            return fh.tell()
+
+    import mmap
+
+    data = to_raw_bytes(n)
+    with open(path, "w+b") as fh:
+        fh.truncate(len(data))
+        with mmap.mmap(fh.fileno(), len(data)) as mm:
+            mm[:] = data
+    return len(data)
+
+
+__all__ = [
+    "FORMATS",
+    "iter_decimal",
+    "iter_format",
+    "save_int",
+    "to_decimal_string",
+    "to_raw_bytes",
+    "write_int",
+]
@@ -2,6 +2,9 @@
 
 from typing import Union
 
+from advmath import backend
+from advmath.cost import checkpoint
+
 
 def power_iterative(base: int, exponent: int) -> int:
     """
@@ -38,12 +41,25 @@ def power_iterative(base: int, exponent: int) -> int:
     while current_exp > 0:
         if current_exp % 2 == 1:
             result *= current_base
+            # Float bases have no bit length; only the deadline applies.
+            checkpoint(result if isinstance(result, int) else None)
         current_base *= current_base
         current_exp //= 2
 
     return result
 
 
+def _power_recursive_kernel(base: int, exponent: int) -> int:
+    """Unchecked recursion behind :func:`power_recursive`."""
+    if exponent == 0:
+        return 1
+
+    if exponent % 2 == 1:
+        return base * _power_recursive_kernel(base * base, (exponent - 1) // 2)
+    else:
+        return _power_recursive_kernel(base * base, exponent // 2)
+
+
 def power_recursive(base: int, exponent: int) -> int:
     """
     Calculate base^exponent recursively using the exponentiation by squaring method.
@@ -72,13 +88,37 @@ def power_recursive(base: int, exponent: int) -> int:
     if exponent < 0:
         raise ValueError("Exponent must be non-negative")
 
-    if exponent == 0:
-        return 1
+    return _power_recursive_kernel(base, exponent)
 
-    if exponent % 2 == 1:
-        return base * power_recursive(base * base, (exponent - 1) // 2)
-    else:
-        return power_recursive(base * base, exponent // 2)
+
+def power_native(base: int, exponent: int) -> int:
+    """
+    Calculate base^exponent with the active arithmetic backend.
+
+    Uses gmpy2, the built-in :func:`pow` or a pure Python square-and-multiply
+    loop depending on :func:`advmath.backend.get_backend`.
+
+    Args:
+        base: Base integer (can be any integer)
+        exponent: Exponent integer (non-negative)
+
+    Returns:
+        The result of base^exponent
+
+    Raises:
+        ValueError: If exponent is negative
+
+    Examples:
+        >>> power_native(-2, 3)
+        -8
+    """
+    if not isinstance(exponent, int):
+        raise ValueError("Exponent must be an integer")
+
+    if exponent < 0:
+        raise ValueError("Exponent must be non-negative")
+
+    return backend.current().power(base, exponent)
 
 
-__all__ = ["power_iterative", "power_recursive"]
\ No newline at end of file
+__all__ = ["power_iterative", "power_recursive", "power_native"]
\ No newline at end of file
@@ -4,16 +4,45 @@ This module provides two public functions:
 
 - :func:`is_prime_iterative` – a straightforward loop based check.
 - :func:`is_prime_recursive` – a tail‑recursive version that is
-  memoised with :func:`functools.lru_cache`.
+  memoised (see :mod:`advmath._memo`).
 
 The helper functions are intentionally **not** exported; the public API is
 kept small and consistent with the rest of the package.
+
+Primality certificates
+----------------------
+:func:`prime_certificate` proves that *n* is prime rather than testing it.
+Each step of the proof is an N−1 test: with ``n − 1 = F·R`` and the prime
+factors *q* of *F* known, a witness *a* per *q* with ``a**(n−1) ≡ 1`` and
+``gcd(a**((n−1)/q) − 1, n) = 1`` proves *n* prime when ``F > sqrt(n)``
+(Pocklington; a Pratt certificate when ``n − 1`` is factored completely), or
+when ``F >= n**(1/3)`` and ``c1**2 − 4*c2`` is not a square for
+``n = c2*F**2 + c1*F + 1`` (Brillhart–Lehmer–Selfridge).  Every *q* above
+``2**64`` gets a step of its own; smaller ones are settled by the
+deterministic Miller–Rabin bases.  Verifying needs no factoring, only a few
+modular exponentiations per step::
+
+    >>> from advmath.prime import prime_certificate, verify_certificate
+    >>> cert = prime_certificate(2**89 - 1)
+    >>> verify_certificate(PrimalityCertificate.from_bytes(cert.to_bytes()))
+    True
+
+Primes proven by either function are remembered, so the ``is_prime_*``
+functions answer them without testing (see :func:`clear_certificates`).
 """
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Union
+import threading
+from math import gcd, isqrt
+from typing import NamedTuple, Optional, Union
+
+from advmath import backend
+from advmath._memo import memoize
+from advmath.cost import checkpoint
+
+# Trial divisions between budget checkpoints.
+_CHECK_INTERVAL = 4096
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +84,8 @@ def is_prime_iterative(n: int) -> bool:
     """
     _validate_int_and_nonnegative(n)
 
+    if n in _proven:
+        return True
     if n < 2:
         return False
     if n == 2:
@@ -62,14 +93,28 @@ def is_prime_iterative(n: int) -> bool:
     if n % 2 == 0:
         return False
 
-    limit = int(n ** 0.5) + 1
-    for divisor in range(3, limit, 2):
+    limit = backend.current().isqrt(n) + 1
+    for start in range(3, limit, 2 * _CHECK_INTERVAL):
+        for divisor in range(start, min(start + 2 * _CHECK_INTERVAL, limit), 2):
+            if n % divisor == 0:
+                return False
+        checkpoint()
+    return True
+
+
+def _trial_division_kernel(n: int) -> bool:
+    """Unchecked trial division for ``n >= 0`` (no budget checkpoints)."""
+    if n < 4:
+        return n >= 2
+    if n % 2 == 0:
+        return False
+    for divisor in range(3, isqrt(n) + 1, 2):
         if n % divisor == 0:
             return False
     return True
 
 
-@lru_cache(maxsize=None)
+@memoize
 def _prime_recursive_helper(n: int, divisor: int = 3) -> bool:
     """Recursive helper for :func:`is_prime_recursive`.
 
@@ -89,6 +134,91 @@ def _prime_recursive_helper(n: int, divisor: int = 3) -> bool:
     return _prime_recursive_helper(n, divisor + 2)
 
 
+# Witnesses that make Miller–Rabin deterministic for every n below
+# 3 317 044 064 679 887 385 961 981 (> 2**81).
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
+
+
+def _miller_rabin_kernel(n: int, extra_rounds: int = 16) -> bool:
+    """Unchecked Miller–Rabin test for ``n >= 0``."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    bases: tuple[int, ...] = _MR_BASES
+    if n >= _MR_DETERMINISTIC_LIMIT:
+        import random
+
+        rng = random.Random(n)
+        bases = bases + tuple(rng.randrange(2, n - 1) for _ in range(extra_rounds))
+
+    powmod = backend.current().powmod
+    for a in bases:
+        x = powmod(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime_miller_rabin(n: int) -> bool:
+    """Determine whether *n* is prime with the Miller–Rabin test.
+
+    The answer is exact for ``n < 3.3e24``.  Above that, 16 additional
+    pseudo-random bases (seeded by *n*, so results are reproducible) are
+    tried; a composite passes with probability below ``4**-29``.
+
+    Parameters
+    ----------
+    n : int
+        Number to test.
+
+    Returns
+    -------
+    bool
+        ``True`` if *n* is (probably, for very large *n*) prime.
+    """
+    _validate_int_and_nonnegative(n)
+    return n in _proven or _miller_rabin_kernel(n)
+
+
+def primes_up_to(n: int) -> list[int]:
+    """Return all primes ``<= n`` using the sieve of Eratosthenes.
+
+    Parameters
+    ----------
+    n : int
+        Upper bound (inclusive).
+
+    Returns
+    -------
+    list[int]
+        The primes in increasing order.
+    """
+    _validate_int_and_nonnegative(n)
+
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [p for p, flag in enumerate(sieve) if flag]
+
+
 def is_prime_recursive(n: int) -> bool:
     """Recursively determine whether *n* is prime.
 
@@ -103,7 +233,298 @@ def is_prime_recursive(n: int) -> bool:
         ``True`` if *n* is prime, ``False`` otherwise.
     """
     _validate_int_and_nonnegative(n)
-    return _prime_recursive_helper(n)
+    return n in _proven or _prime_recursive_helper(n)
+
+
+# ---------------------------------------------------------------------------
+# Primality certificates
+# ---------------------------------------------------------------------------
+
+# Primes below this are proven by deterministic Miller–Rabin (the first
+# twelve bases suffice up to 3.18e23) instead of a certificate step.
+_CERTIFICATE_SMALL = 1 << 64
+
+_CERTIFICATE_MAGIC = b"APC1"
+
+# Largest number of proven primes remembered for the is_prime_* functions.
+_PROVEN_MAX = 1 << 16
+
+# Primes proven by a certificate, oldest first.  Lookups take no lock;
+# updates do, so that concurrent evictions cannot collide.
+_proven: dict[int, None] = {}
+_proven_lock = threading.Lock()
+
+
+class PrimalityCertificate(NamedTuple):
+    """Proof that *n* is prime.
+
+    ``steps`` holds one ``(p, ((q, a), ...))`` entry per prime ``p >= 2**64``
+    in the proof, every ``p`` after the steps of its own large factors and
+    *n* last: the *q* are the prime factors of the factored part of
+    ``p − 1`` and *a* their witnesses.  A prime below ``2**64`` needs no
+    steps.
+    """
+
+    n: int
+    steps: tuple[tuple[int, tuple[tuple[int, int], ...]], ...]
+
+    def to_bytes(self) -> bytes:
+        """Serialise to a compact binary form (see :meth:`from_bytes`)."""
+        out = bytearray(_CERTIFICATE_MAGIC)
+        _put_uint(out, self.n)
+        _put_uint(out, len(self.steps))
+        for p, witnesses in self.steps:
+            _put_uint(out, p)
+            _put_uint(out, len(witnesses))
+            for q, a in witnesses:
+                _put_uint(out, q)
+                _put_uint(out, a)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PrimalityCertificate":
+        """Parse the output of :meth:`to_bytes`.
+
+        Raises
+        ------
+        ValueError
+            If *data* is not a serialised certificate.
+        """
+        view = memoryview(bytes(data))
+        if view[:4] != _CERTIFICATE_MAGIC:
+            raise ValueError("Not a primality certificate")
+        try:
+            pos = 4
+            n, pos = _get_uint(view, pos)
+            count, pos = _get_uint(view, pos)
+            steps = []
+            for _ in range(count):
+                p, pos = _get_uint(view, pos)
+                k, pos = _get_uint(view, pos)
+                witnesses = []
+                for _ in range(k):
+                    q, pos = _get_uint(view, pos)
+                    a, pos = _get_uint(view, pos)
+                    witnesses.append((q, a))
+                steps.append((p, tuple(witnesses)))
+        except IndexError:
+            raise ValueError("Truncated primality certificate") from None
+        if pos != len(view):
+            raise ValueError("Trailing data after primality certificate")
+        return cls(n, tuple(steps))
+
+
+def _put_uint(out: bytearray, value: int) -> None:
+    """Append a byte count (LEB128) and the little-endian bytes of
+    *value*."""
+    data = value.to_bytes((value.bit_length() + 7) // 8, "little")
+    size = len(data)
+    while size >= 0x80:
+        out.append(size & 0x7F | 0x80)
+        size >>= 7
+    out.append(size)
+    out += data
+
+
+def _get_uint(view: memoryview, pos: int) -> tuple[int, int]:
+    size = shift = 0
+    while True:
+        byte = view[pos]
+        pos += 1
+        size |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    if pos + size > len(view):
+        raise IndexError(pos)
+    return int.from_bytes(view[pos:pos + size], "little"), pos + size
+
+
+def _remember(p: int) -> None:
+    with _proven_lock:
+        if len(_proven) >= _PROVEN_MAX:
+            del _proven[next(iter(_proven))]
+        _proven[p] = None
+
+
+def _remember_certificate(certificate: PrimalityCertificate) -> None:
+    """Remember every prime proven by a valid *certificate* (also used by
+    :mod:`advmath.aio` for certificates produced in a worker process)."""
+    for p, _ in certificate.steps:
+        _remember(p)
+    _remember(certificate.n)
+
+
+def _certificate_step(n: int, factors: list[int]) -> Optional[tuple[tuple[int, int], ...]]:
+    """Return witnesses for the prime factors of the factored part of
+    ``n − 1``, or ``None`` if some factor has none (n is composite)."""
+    powmod = backend.current().powmod
+    witnesses = []
+    for q in factors:
+        for a in range(2, 1000):
+            if powmod(a, n - 1, n) != 1:
+                return None
+            if gcd(powmod(a, (n - 1) // q, n) - 1, n) == 1:
+                witnesses.append((q, a))
+                break
+        else:
+            return None
+    return tuple(witnesses)
+
+
+def _full_power(n: int, q: int) -> int:
+    """Return the largest power of *q* dividing *n*."""
+    power = 1
+    while n % q == 0:
+        n //= q
+        power *= q
+    return power
+
+
+def _certify(n: int, steps: list, done: set, max_iterations: Optional[int]) -> None:
+    from advmath._factor import factorize
+
+    if n < _CERTIFICATE_SMALL or n in done:
+        return
+    # Factoring stops once n**(1/3) is reached; large prime factors cost a
+    # certificate step each, so only the smallest ones needed are used.
+    target = 1 << ((n.bit_length() + 2) // 3)
+    found, _ = factorize(n - 1, max_iterations, target=target)
+    factors = []
+    factored = 1
+    for q in sorted(found):
+        if q >= _CERTIFICATE_SMALL and factored ** 3 >= n:
+            break
+        factors.append(q)
+        factored *= _full_power(n - 1, q)
+    if factored ** 3 < n:
+        raise ValueError(
+            f"Could not factor enough of n - 1 to certify {n} "
+            f"(factored part has {factored.bit_length()} of {n.bit_length()} bits)"
+        )
+    for q in factors:
+        _certify(q, steps, done, max_iterations)
+    witnesses = _certificate_step(n, factors)
+    if witnesses is None or not _step_holds(n, witnesses):
+        raise ValueError(f"{n} is not prime")
+    steps.append((n, witnesses))
+    done.add(n)
+
+
+def prime_certificate(n: int, max_iterations: Optional[int] = 1 << 20) -> PrimalityCertificate:
+    """Prove that *n* is prime.
+
+    Parameters
+    ----------
+    n : int
+        Number to certify.
+    max_iterations : int, optional
+        Pollard rho steps allowed per composite part of each ``p − 1``
+        (``None`` for no limit).
+
+    Returns
+    -------
+    PrimalityCertificate
+        A proof that :func:`verify_certificate` accepts.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an :class:`int`.
+    ValueError
+        If *n* is negative or not prime, or if too little of some ``p − 1``
+        could be factored within *max_iterations*.
+    """
+    _validate_int_and_nonnegative(n)
+    if not _miller_rabin_kernel(n):
+        raise ValueError(f"{n} is not prime")
+    steps: list = []
+    _certify(n, steps, set(), max_iterations)
+    certificate = PrimalityCertificate(n, tuple(steps))
+    _remember_certificate(certificate)
+    return certificate
+
+
+def _step_holds(p: int, witnesses: tuple[tuple[int, int], ...]) -> bool:
+    """Check one N−1 step, assuming its factors *q* are prime."""
+    if p < 3 or p % 2 == 0:
+        return False
+    powmod = backend.current().powmod
+    factored = 1
+    cofactor = p - 1
+    fermat: set[int] = set()
+    for q, a in witnesses:
+        if q < 2 or cofactor % q:
+            return False
+        while cofactor % q == 0:
+            cofactor //= q
+            factored *= q
+        if a not in fermat:
+            if not 1 < a < p or powmod(a, p - 1, p) != 1:
+                return False
+            fermat.add(a)
+        if gcd(powmod(a, (p - 1) // q, p) - 1, p) != 1:
+            return False
+    if factored * factored > p:
+        return True
+    if factored ** 3 < p:
+        return False
+    # Brillhart–Lehmer–Selfridge: p = c2*F**2 + c1*F + 1.
+    c2, c1 = divmod((p - 1) // factored, factored)
+    discriminant = c1 * c1 - 4 * c2
+    return discriminant < 0 or isqrt(discriminant) ** 2 != discriminant
+
+
+def verify_certificate(certificate: PrimalityCertificate) -> bool:
+    """Check a certificate from :func:`prime_certificate` (or
+    :meth:`PrimalityCertificate.from_bytes`).
+
+    Costs a few modular exponentiations per step and no factoring.  On
+    success, the primes it proves are remembered by the ``is_prime_*``
+    functions.
+
+    Returns
+    -------
+    bool
+        ``True`` if the certificate proves that ``certificate.n`` is prime.
+    """
+    try:
+        n, steps = certificate
+    except (TypeError, ValueError):
+        return False
+    if not isinstance(n, int) or n < 2:
+        return False
+    proven: set[int] = set()
+
+    def is_proven(q: int) -> bool:
+        return q in proven if q >= _CERTIFICATE_SMALL else _miller_rabin_kernel(q)
+
+    try:
+        for p, witnesses in steps:
+            if not all(is_proven(q) for q, _ in witnesses) or not _step_holds(p, witnesses):
+                return False
+            proven.add(p)
+    except (TypeError, ValueError):
+        return False
+    if not is_proven(n):
+        return False
+    _remember_certificate(certificate)
+    return True
+
+
+def clear_certificates() -> None:
+    """Forget the primes proven so far."""
+    with _proven_lock:
+        _proven.clear()
 
 
-__all__ = ["is_prime_iterative", "is_prime_recursive"]
+__all__ = [
+    "PrimalityCertificate",
+    "clear_certificates",
+    "is_prime_iterative",
+    "is_prime_miller_rabin",
+    "is_prime_recursive",
+    "prime_certificate",
+    "primes_up_to",
+    "verify_certificate",
+]
@@ -0,0 +1,119 @@
+"""Instrumentation helpers for timing and profiling calculations.
+
+Used by the CLI's global ``--timing`` and ``--profile`` options, but usable
+from the library as well::
+
+    >>> from advmath.profiling import measure
+    >>> with measure() as stats:
+    ...     _ = sum(range(10))
+    >>> sorted(stats)
+    ['cache_hits', 'cache_misses', 'cpu_seconds', 'wall_seconds']
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, TextIO
+
+# (module, attribute) of every lru_cache in the package.
+_CACHED_FUNCTIONS = (
+    ("advmath.factorial", "factorial_recursive"),
+    ("advmath.fibonacci", "fibonacci_recursive"),
+    ("advmath.gcd", "gcd_recursive"),
+    ("advmath.gcd", "_crt_basis"),
+    ("advmath.lcm", "lcm_recursive"),
+    ("advmath.lcm", "_smooth_primes"),
+    ("advmath.prime", "_prime_recursive_helper"),
+    ("advmath.arithmetic", "_factorization"),
+)
+
+
+def cache_info() -> dict[str, tuple[int, int]]:
+    """Return ``{"module.function": (hits, misses)}`` for the package's
+    ``lru_cache``s.
+
+    Only modules that are already imported are inspected, so calling this
+    never triggers an import.
+    """
+    info = {}
+    for module_name, attr in _CACHED_FUNCTIONS:
+        module = sys.modules.get(module_name)
+        func = getattr(module, attr, None)
+        if func is not None and hasattr(func, "cache_info"):
+            stats = func.cache_info()
+            info[f"{module_name}.{attr}"] = (stats.hits, stats.misses)
+    return info
+
+
+def clear_caches() -> None:
+    """Empty every loaded ``lru_cache`` in the package, e.g. so that
+    repeated benchmark runs of a recursive implementation do real work."""
+    for module_name, attr in _CACHED_FUNCTIONS:
+        func = getattr(sys.modules.get(module_name), attr, None)
+        if func is not None and hasattr(func, "cache_clear"):
+            func.cache_clear()
+
+
+def _cache_totals() -> tuple[int, int]:
+    info = cache_info().values()
+    return sum(h for h, _ in info), sum(m for _, m in info)
+
+
+@contextmanager
+def measure() -> Iterator[dict[str, Any]]:
+    """Measure wall time, CPU time and cache activity of the block.
+
+    Yields a dict that is filled in when the block exits (also when it
+    raises) with ``wall_seconds``, ``cpu_seconds``, ``cache_hits`` and
+    ``cache_misses``.
+    """
+    stats: dict[str, Any] = {}
+    hits, misses = _cache_totals()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield stats
+    finally:
+        stats["wall_seconds"] = time.perf_counter() - wall
+        stats["cpu_seconds"] = time.process_time() - cpu
+        end_hits, end_misses = _cache_totals()
+        stats["cache_hits"] = end_hits - hits
+        stats["cache_misses"] = end_misses - misses
+
+
+@contextmanager
+def profiled(target: Optional[str], stream: Optional[TextIO] = None) -> Iterator[None]:
+    """Run the block under :mod:`cProfile`.
+
+    Parameters
+    ----------
+    target : str or None
+        ``None`` disables profiling.  ``"cprofile"`` prints the 30 most
+        expensive functions by cumulative time to *stream*; anything else is
+        a file path that receives the raw :mod:`pstats` data.
+    stream : TextIO, optional
+        Destination for printed statistics (default ``sys.stderr``).
+    """
+    if target is None:
+        yield
+        return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if target == "cprofile":
+            stats = pstats.Stats(profiler, stream=stream or sys.stderr)
+            stats.sort_stats("cumulative").print_stats(30)
+        else:
+            profiler.dump_stats(target)
+
+
+__all__ = ["cache_info", "clear_caches", "measure", "profiled"]
@@ -0,0 +1,351 @@
+"""Algorithm registry with automatic method selection.
+
+Every operation maps method names to the public function implementing it::
+
+    >>> from advmath.registry import compute, select_method
+    >>> compute("gcd", 48, 64, method="lehmer")
+    16
+    >>> select_method("prime", 10**12 + 39)
+    'miller_rabin'
+
+``method="auto"`` (the default of :func:`compute`) asks a per-operation cost
+model for the fastest implementation at the given input size.  The model is a
+set of crossover thresholds; defaults were measured on CPython 3.11 and can be
+re-measured on the host with :func:`calibrate` (``advmath calibrate``), which
+writes them to a JSON config file that is picked up automatically.  Where an
+operation has a ``"native"`` method (factorial, power, gcd, lcm) and a C
+backend is active (see :mod:`advmath.backend`), ``auto`` always picks it; the
+thresholds then only matter under the pure Python backend.
+
+Recursive implementations are never chosen automatically: they exist for
+comparison and hit the interpreter recursion limit on large inputs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+import advmath
+from advmath.backend import get_backend
+from advmath.cost import _budget, budget, check_budget, checkpoint
+
+# Operation -> {method -> public function name in :mod:`advmath`}
+_ALGORITHMS: dict[str, dict[str, str]] = {
+    "factorial": {
+        "iterative": "factorial_iterative",
+        "recursive": "factorial_recursive",
+        "native": "factorial_native",
+    },
+    "fibonacci": {
+        "iterative": "fibonacci_iterative",
+        "recursive": "fibonacci_recursive",
+    },
+    "power": {
+        "iterative": "power_iterative",
+        "recursive": "power_recursive",
+        "native": "power_native",
+    },
+    "gcd": {
+        "iterative": "gcd_iterative",
+        "recursive": "gcd_recursive",
+        "binary": "gcd_binary",
+        "lehmer": "gcd_lehmer",
+        "native": "gcd_native",
+    },
+    "lcm": {
+        "iterative": "lcm_iterative",
+        "recursive": "lcm_recursive",
+        "native": "lcm_native",
+    },
+    "prime": {
+        "iterative": "is_prime_iterative",
+        "recursive": "is_prime_recursive",
+        "miller_rabin": "is_prime_miller_rabin",
+    },
+}
+
+# Crossover points used by the cost model.
+DEFAULT_THRESHOLDS: dict[str, int] = {
+    # Operand bit length from which Lehmer beats Euclid.
+    "gcd_lehmer_bits": 8192,
+    # n from which Miller–Rabin beats trial division.
+    "prime_miller_rabin_min": 1 << 20,
+}
+
+CONFIG_ENV = "ADVMATH_CONFIG"
+
+_thresholds: Optional[dict[str, int]] = None
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+def config_path() -> str:
+    """Return the thresholds file: ``$ADVMATH_CONFIG`` or
+    ``~/.config/advmath/thresholds.json``."""
+    return os.environ.get(CONFIG_ENV) or os.path.join(
+        os.path.expanduser("~"), ".config", "advmath", "thresholds.json"
+    )
+
+
+def load_thresholds(path: Optional[str] = None) -> dict[str, int]:
+    """Read thresholds from *path* (default :func:`config_path`).
+
+    Missing files and unknown keys are ignored; missing keys keep their
+    defaults.
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    try:
+        with open(path or config_path(), encoding="utf-8") as fh:
+            stored = json.load(fh).get("thresholds", {})
+    except (OSError, ValueError, AttributeError):
+        return thresholds
+    for key, value in stored.items():
+        if key in thresholds and isinstance(value, int) and value >= 0:
+            thresholds[key] = value
+    return thresholds
+
+
+def save_thresholds(thresholds: dict[str, int], path: Optional[str] = None) -> str:
+    """Write *thresholds* to *path* (default :func:`config_path`) and make
+    them active.  Returns the path written."""
+    path = path or config_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"version": 1, "thresholds": thresholds}, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    set_thresholds(thresholds)
+    return path
+
+
+def get_thresholds() -> dict[str, int]:
+    """Return the active thresholds, loading the config file on first use."""
+    global _thresholds
+    if _thresholds is None:
+        _thresholds = load_thresholds()
+    return _thresholds
+
+
+def set_thresholds(thresholds: Optional[dict[str, int]]) -> None:
+    """Replace the active thresholds (``None`` reloads from the config file
+    on next use)."""
+    global _thresholds
+    _thresholds = None if thresholds is None else {**DEFAULT_THRESHOLDS, **thresholds}
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+
+def available_methods(op: str) -> list[str]:
+    """Return the methods accepted for *op*, including ``"auto"``."""
+    return ["auto", *sorted(_methods(op))]
+
+
+def _methods(op: str) -> dict[str, str]:
+    try:
+        return _ALGORITHMS[op]
+    except (KeyError, TypeError):
+        raise ValueError(
+            f"Unknown operation {op!r}; expected one of: {', '.join(_ALGORITHMS)}"
+        ) from None
+
+
+def _method_error(op: str) -> ValueError:
+    names = [f"'{m}'" for m in available_methods(op)]
+    return ValueError(f"Method must be {', '.join(names[:-1])} or {names[-1]}")
+
+
+def validate_method(op: str, method: Any) -> str:
+    """Return *method* lower-cased if it is a valid method for *op*.
+
+    Raises
+    ------
+    ValueError
+        If the operation or the method is unknown.
+    """
+    methods = _methods(op)
+    if not isinstance(method, str) or (
+        method.lower() != "auto" and method.lower() not in methods
+    ):
+        raise _method_error(op)
+    return method.lower()
+
+
+def select_method(op: str, *args: Any) -> str:
+    """Pick the cheapest method for *op* at the size of *args*.
+
+    Inputs that are not integers select ``"iterative"`` so that the
+    implementation's own validation reports the error.
+    """
+    methods = _methods(op)
+    if not all(isinstance(a, int) for a in args):
+        return "iterative"
+    if "native" in methods and get_backend() != "python":
+        return "native"
+    thresholds = get_thresholds()
+
+    if op == "prime" and args:
+        if args[0] >= thresholds["prime_miller_rabin_min"]:
+            return "miller_rabin"
+    elif op == "gcd":
+        bits = max((a.bit_length() for a in args), default=0)
+        if bits >= thresholds["gcd_lehmer_bits"]:
+            return "lehmer"
+    return "iterative"
+
+
+def resolve(op: str, method: str = "auto", *args: Any) -> Callable[..., Any]:
+    """Return the implementation of *op* for *method* (case-insensitive).
+
+    ``"auto"`` is resolved against *args*.
+
+    Raises
+    ------
+    ValueError
+        If the operation or the method is unknown.
+    """
+    method = validate_method(op, method)
+    if method == "auto":
+        method = select_method(op, *args)
+    return getattr(advmath, _ALGORITHMS[op][method])
+
+
+def compute(
+    op: str,
+    *args: Any,
+    method: str = "auto",
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> Any:
+    """Evaluate *op* on *args* with *method* (default ``"auto"``).
+
+    If *max_seconds* or *max_result_bits* is given, or a
+    :func:`~advmath.cost.budget` is active, the call is rejected up front
+    when its cost estimate exceeds the budget and aborted if it overruns
+    while running (see :mod:`advmath.cost`).
+
+    Raises
+    ------
+    advmath.cost.BudgetExceededError
+        If the call is, or is predicted to be, over budget.
+    """
+    method = validate_method(op, method)
+    if method == "auto":
+        method = select_method(op, *args)
+    func = getattr(advmath, _ALGORITHMS[op][method])
+    if max_seconds is None and max_result_bits is None and _budget.get() is None:
+        return func(*args)
+
+    with budget(max_seconds, max_result_bits):
+        check_budget(op, *args, method=method)
+        result = func(*args)
+        if isinstance(result, int):
+            checkpoint(result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Calibration
+# ---------------------------------------------------------------------------
+
+def _best_time(func: Callable[..., Any], args: tuple, repeat: int) -> float:
+    import time
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _crossover(sizes, make_args, baseline, candidate, repeat) -> Optional[int]:
+    """Return the first size from which *candidate* is faster than
+    *baseline* at that size and every larger one measured, else ``None``."""
+    crossover = None
+    for size in sizes:
+        args = make_args(size)
+        if _best_time(candidate, args, repeat) < _best_time(baseline, args, repeat):
+            if crossover is None:
+                crossover = size
+        else:
+            crossover = None
+    return crossover
+
+
+def calibrate(repeat: int = 5, quick: bool = False) -> dict[str, int]:
+    """Measure crossover points on this host and return new thresholds.
+
+    Parameters
+    ----------
+    repeat : int
+        Timing repetitions per measurement (the best is kept).
+    quick : bool
+        Measure fewer, smaller sizes.
+
+    Returns
+    -------
+    dict[str, int]
+        Thresholds suitable for :func:`save_thresholds`.  A crossover that
+        is not reached within the measured range keeps its default.
+    """
+    import random
+
+    from advmath.gcd import _euclid_kernel, _lehmer_kernel
+    from advmath.prime import _miller_rabin_kernel, is_prime_iterative
+
+    rng = random.Random(35)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+
+    # Primality: trial division is slowest on primes, so time those.
+    def next_prime(n: int) -> int:
+        while not _miller_rabin_kernel(n):
+            n += 1
+        return n
+
+    prime_sizes = [1 << k for k in range(8, 26 if quick else 34, 2)]
+    found = _crossover(
+        prime_sizes,
+        lambda n: (next_prime(n),),
+        is_prime_iterative,
+        _miller_rabin_kernel,
+        repeat,
+    )
+    if found is not None:
+        thresholds["prime_miller_rabin_min"] = found
+
+    gcd_sizes = [1 << k for k in range(9, 14 if quick else 17)]
+    found = _crossover(
+        gcd_sizes,
+        lambda bits: (rng.getrandbits(bits) | (1 << (bits - 1)), rng.getrandbits(bits)),
+        _euclid_kernel,
+        _lehmer_kernel,
+        repeat,
+    )
+    if found is not None:
+        thresholds["gcd_lehmer_bits"] = found
+
+    return thresholds
+
+
+__all__ = [
+    "CONFIG_ENV",
+    "DEFAULT_THRESHOLDS",
+    "available_methods",
+    "calibrate",
+    "compute",
+    "config_path",
+    "get_thresholds",
+    "load_thresholds",
+    "resolve",
+    "save_thresholds",
+    "select_method",
+    "set_thresholds",
+    "validate_method",
+]
@@ -0,0 +1,293 @@
+"""Long-lived calculation server (``advmath serve``).
+
+The server speaks the same NDJSON protocol as ``advmath batch``: every request
+line is a JSON object such as ``{"op": "gcd", "args": [48, 64], "id": 1}`` and
+every response line echoes ``op``, ``args`` and ``id`` plus ``result`` or
+``error``.  A client may pipeline any number of requests on one connection;
+responses come back in request order.
+
+Because the process stays up, the ``lru_cache``s of the recursive
+implementations stay warm across requests.  Cheap requests are evaluated
+inline on the event loop; expensive ones (as judged by :func:`_runs_inline`)
+are offloaded to a process pool whose workers are equally long-lived.
+
+``max_seconds`` / ``max_result_bits`` (the global ``--max-time`` /
+``--max-bits`` options) are the default budget of every request, as for
+``advmath batch``; a request may override them with its own keys.
+
+With ``metrics_port`` (``advmath serve --metrics-port``) the server enables
+:mod:`advmath.metrics`, records every request as ``request:<op>`` (offloaded
+requests included; the function-level counters only see work done in the
+server process) and answers ``GET /metrics`` on that port in the Prometheus
+text format.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Optional
+
+from advmath import metrics
+from advmath.batch import encode_response, process_record
+from advmath.client import DEFAULT_HOST, DEFAULT_PORT
+
+# Largest request line accepted (big integer arguments can be long).
+_LINE_LIMIT = 16 * 1024 * 1024
+
+# Maximum number of requests per connection that may be in flight before the
+# server stops reading from that client.
+_MAX_IN_FLIGHT = 1024
+
+# Inline thresholds: anything larger goes to the process pool.
+_INLINE_FACTORIAL_MAX = 2000
+_INLINE_PRIME_MAX = 10**10
+_INLINE_GCD_BITS = 1 << 14
+
+
+def _runs_inline(record: Any) -> bool:
+    """Return ``True`` if *record* is cheap enough to evaluate on the loop.
+
+    Malformed requests are always handled inline; they fail fast.
+    """
+    if not isinstance(record, dict):
+        return True
+    args = record.get("args")
+    if not isinstance(args, list) or not all(isinstance(a, int) for a in args):
+        return True
+
+    op = record.get("op")
+    if op == "fact":
+        return all(a <= _INLINE_FACTORIAL_MAX for a in args)
+    if op == "prime":
+        return all(a <= _INLINE_PRIME_MAX for a in args)
+    return all(a.bit_length() <= _INLINE_GCD_BITS for a in args)
+
+
+def _evaluate(
+    record: Any,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> str:
+    """Evaluate and encode one request.  Runs inline or in a pool worker."""
+    return encode_response(process_record(record, max_seconds, max_result_bits))
+
+
+def _observe_request(record: Any, start: float, response: str) -> None:
+    """Record one finished request in :mod:`advmath.metrics`."""
+    op = record.get("op") if isinstance(record, dict) else None
+    args = record.get("args") if isinstance(record, dict) else None
+    bits = 0
+    if isinstance(args, list):
+        bits = max((a.bit_length() for a in args if isinstance(a, int)), default=0)
+    metrics.observe(
+        f"request:{op if isinstance(op, str) else 'invalid'}",
+        time.perf_counter() - start,
+        bits,
+        '"error":' in response,
+    )
+
+
+def _dispatch(
+    line: bytes,
+    executor: Executor,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> "asyncio.Future[str]":
+    """Start handling one request line and return a future for its response."""
+    loop = asyncio.get_running_loop()
+    observing = metrics.is_enabled()
+    start = time.perf_counter()
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        record = None
+        response = encode_response({"error": f"Invalid JSON: {exc}"})
+    else:
+        if not _runs_inline(record):
+            future = loop.run_in_executor(
+                executor, _evaluate, record, max_seconds, max_result_bits
+            )
+            if observing:
+
+                def observe(done: "asyncio.Future[str]") -> None:
+                    if not done.cancelled() and done.exception() is None:
+                        _observe_request(record, start, done.result())
+
+                future.add_done_callback(observe)
+            return future
+        response = _evaluate(record, max_seconds, max_result_bits)
+
+    if observing:
+        _observe_request(record, start, response)
+    future = loop.create_future()
+    future.set_result(response)
+    return future
+
+
+async def _handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    executor: Executor,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> None:
+    """Serve one client: read requests, write responses in order."""
+    pending: asyncio.Queue = asyncio.Queue(maxsize=_MAX_IN_FLIGHT)
+
+    async def respond() -> None:
+        while True:
+            future = await pending.get()
+            if future is None:
+                return
+            writer.write((await future).encode() + b"\n")
+            if pending.empty():
+                await writer.drain()
+
+    responder = asyncio.create_task(respond())
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                await pending.put(_dispatch(line, executor, max_seconds, max_result_bits))
+    except (ConnectionError, ValueError):
+        # Client went away or sent an over-long line.
+        pass
+    finally:
+        await pending.put(None)
+        try:
+            await responder
+        except ConnectionError:
+            pass
+        writer.close()
+
+
+async def _handle_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer one HTTP request: ``GET /metrics`` or 404."""
+    try:
+        request = await reader.readline()
+        while (await reader.readline()).strip():
+            pass  # skip headers
+        parts = request.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+            status = b"200 OK"
+            body = metrics.prometheus_text().encode()
+            content_type = b"text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = b"404 Not Found", b"Not found\n", b"text/plain"
+        writer.write(
+            b"HTTP/1.0 " + status + b"\r\nContent-Type: " + content_type
+            + b"\r\nContent-Length: " + str(len(body)).encode()
+            + b"\r\nConnection: close\r\n\r\n" + body
+        )
+        await writer.drain()
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(
+    host: Optional[str] = DEFAULT_HOST,
+    port: int = 9100,
+) -> asyncio.AbstractServer:
+    """Enable :mod:`advmath.metrics` and serve ``GET /metrics`` over HTTP on
+    *host*:*port*.  Returns the :class:`asyncio.Server`."""
+    metrics.enable()
+    return await asyncio.start_server(_handle_metrics, host, port)
+
+
+async def start_server(
+    host: Optional[str] = DEFAULT_HOST,
+    port: Optional[int] = DEFAULT_PORT,
+    path: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> asyncio.AbstractServer:
+    """Start listening and return the :class:`asyncio.Server`.
+
+    Listens on the Unix socket *path* if given, otherwise on TCP
+    *host*:*port*.  If *executor* is ``None`` a :class:`ProcessPoolExecutor`
+    with one worker per CPU is created; the caller owns its shutdown.
+    *max_seconds* / *max_result_bits* are the default budget of every
+    request (see :mod:`advmath.cost`).
+    """
+    if executor is None:
+        executor = ProcessPoolExecutor()
+
+    async def handler(reader, writer):
+        await _handle_connection(reader, writer, executor, max_seconds, max_result_bits)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path, limit=_LINE_LIMIT)
+    return await asyncio.start_server(handler, host, port, limit=_LINE_LIMIT)
+
+
+def serve(
+    host: Optional[str] = DEFAULT_HOST,
+    port: Optional[int] = DEFAULT_PORT,
+    path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    metrics_port: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    max_result_bits: Optional[int] = None,
+) -> None:
+    """Run the server until interrupted.
+
+    Parameters
+    ----------
+    host, port : optional
+        TCP address to listen on (ignored when *path* is given).
+    path : str, optional
+        Unix socket path.  A stale socket file is removed first.
+    jobs : int, optional
+        Number of worker processes for expensive requests (default: one per
+        CPU).
+    metrics_port : int, optional
+        Enable :mod:`advmath.metrics` and serve it at
+        ``http://<host>:<metrics_port>/metrics``.
+    max_seconds, max_result_bits : optional
+        Default per-request budget (see :mod:`advmath.cost`); over-budget
+        requests get an error response.
+    """
+    if jobs is not None and (not isinstance(jobs, int) or jobs < 1):
+        raise ValueError("Jobs must be a positive integer")
+    if path is not None and os.path.exists(path):
+        os.unlink(path)
+
+    async def main() -> None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            server = await start_server(
+                host, port, path, executor, max_seconds, max_result_bits
+            )
+            if metrics_port is not None:
+                metrics_server = await start_metrics_server(host or DEFAULT_HOST, metrics_port)
+            async with server:
+                serving = asyncio.ensure_future(server.serve_forever())
+                # Shut down cleanly (removing the socket file) on SIGTERM too.
+                asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+                try:
+                    await serving
+                except asyncio.CancelledError:
+                    pass
+                finally:
+                    if metrics_port is not None:
+                        metrics_server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+
+
+__all__ = ["DEFAULT_HOST", "DEFAULT_PORT", "serve", "start_metrics_server", "start_server"]
@@ -0,0 +1,342 @@
+"""Tables of multiplicative functions.
+
+For every ``k <= n`` this module computes
+
+``phi``
+    Euler's totient φ(k).
+``mu``
+    The Möbius function μ(k).
+``d``
+    The number of divisors d(k).
+``sigma``
+    The sum of divisors σ(k).
+
+into compact :class:`array.array` buffers indexed by *k* (entry 0 is 0)::
+
+    >>> from advmath.sieve import linear_sieve
+    >>> tables = linear_sieve(10)
+    >>> list(tables["phi"])
+    [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4]
+    >>> list(tables["mu"])
+    [0, 1, -1, -1, 0, -1, 1, -1, 0, 0, 1]
+
+:func:`linear_sieve` builds a smallest-prime-factor table and then derives
+every function in one linear pass, from ``f(k) = f(k / p)`` adjusted for the
+smallest prime *p* of *k*.  It needs about 4 bytes per *k* for the factor
+table plus the requested tables.  For ranges beyond RAM,
+:func:`sieve_segments` yields the tables one segment at a time (only the
+primes up to ``sqrt(n)`` are kept), and :func:`write_tables` streams them
+into memory-mapped files that :func:`open_table` maps back.
+
+The arrays (and the views returned by :func:`open_table`) support the buffer
+protocol, so ``numpy.asarray(table)`` wraps them without copying.  Tables are
+limited to ``n < 2**32``, which keeps every value within its type code.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from math import isqrt
+from typing import Iterable, Iterator, Optional
+
+from advmath.prime import primes_up_to
+
+SIEVE_FUNCTIONS = ("phi", "mu", "d", "sigma")
+
+# Element type of each table: uint32, int8, uint16 and uint64 suffice for
+# every k < 2**32 (d(k) <= 1536 there, sigma(k) < 2**36).
+TYPECODES = {"phi": "I", "mu": "b", "d": "H", "sigma": "Q"}
+
+SIEVE_LIMIT = 1 << 32
+
+DEFAULT_SEGMENT_SIZE = 1 << 20
+
+
+def _validate(n: int, functions: Optional[Iterable[str]]) -> tuple[str, ...]:
+    if not isinstance(n, int):
+        raise TypeError("Sieve bound must be an integer")
+    if n < 0:
+        raise ValueError("Sieve bound must be non-negative")
+    if n >= SIEVE_LIMIT:
+        raise ValueError("Sieve bound must be below 2**32")
+    names = SIEVE_FUNCTIONS if functions is None else tuple(functions)
+    for name in names:
+        if name not in TYPECODES:
+            raise ValueError(
+                f"Unknown function {name!r}; expected one of: {', '.join(SIEVE_FUNCTIONS)}"
+            )
+    return names
+
+
+def _zeros(typecode: str, length: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * length))
+
+
+# ---------------------------------------------------------------------------
+# Whole range
+# ---------------------------------------------------------------------------
+
+def _smallest_prime_factors(n: int) -> array:
+    """``lp[k]`` = smallest prime factor of *k* (``lp[0] = 0, lp[1] = 1``)."""
+    lp = array("I", range(n + 1))
+    # Largest primes first, so that smaller ones overwrite shared multiples.
+    for p in reversed(primes_up_to(isqrt(n))):
+        lp[p * p::p] = array("I", [p]) * len(range(p * p, n + 1, p))
+    return lp
+
+
+def linear_sieve(n: int, functions: Optional[Iterable[str]] = None) -> dict[str, array]:
+    """Return the tables of *functions* for ``0 <= k <= n``.
+
+    Parameters
+    ----------
+    n : int
+        Largest *k*.
+    functions : iterable of str, optional
+        Any of ``"phi"``, ``"mu"``, ``"d"`` and ``"sigma"`` (default: all).
+
+    Returns
+    -------
+    dict[str, array.array]
+        One array of length ``n + 1`` per function, typed as in
+        :data:`TYPECODES`.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an integer.
+    ValueError
+        If *n* is negative or ``>= 2**32``, or a function is unknown.
+    """
+    names = _validate(n, functions)
+    lp = _smallest_prime_factors(n)
+    tables = {}
+    top = range(2, n + 1)
+
+    if "phi" in names:
+        phi = _zeros("I", n + 1)
+        if n >= 1:
+            phi[1] = 1
+        for k in top:
+            p = lp[k]
+            q = k // p
+            phi[k] = phi[q] * p if lp[q] == p else phi[q] * (p - 1)
+        tables["phi"] = phi
+
+    if "mu" in names:
+        mu = _zeros("b", n + 1)
+        if n >= 1:
+            mu[1] = 1
+        for k in top:
+            p = lp[k]
+            q = k // p
+            if lp[q] != p:
+                mu[k] = -mu[q]
+        tables["mu"] = mu
+
+    if "d" in names:
+        # exponent[k] = multiplicity of the smallest prime of k.
+        d = _zeros("H", n + 1)
+        exponent = _zeros("B", n + 1)
+        if n >= 1:
+            d[1] = 1
+        for k in top:
+            p = lp[k]
+            q = k // p
+            if lp[q] == p:
+                e = exponent[q]
+                exponent[k] = e + 1
+                d[k] = d[q] // (e + 1) * (e + 2)
+            else:
+                exponent[k] = 1
+                d[k] = 2 * d[q]
+        tables["d"] = d
+
+    if "sigma" in names:
+        # power_sum[k] = 1 + p + ... + p**e for the smallest prime power p**e
+        # of k.
+        sigma = _zeros("Q", n + 1)
+        power_sum = _zeros("Q", n + 1)
+        if n >= 1:
+            sigma[1] = 1
+        for k in top:
+            p = lp[k]
+            q = k // p
+            if lp[q] == p:
+                s = power_sum[k] = power_sum[q] * p + 1
+                sigma[k] = sigma[q] // power_sum[q] * s
+            else:
+                power_sum[k] = p + 1
+                sigma[k] = sigma[q] * (p + 1)
+        tables["sigma"] = sigma
+
+    return {name: tables[name] for name in names}
+
+
+# ---------------------------------------------------------------------------
+# Segments
+# ---------------------------------------------------------------------------
+
+def _segment(lo: int, hi: int, primes: list[int], names: tuple[str, ...]) -> dict[str, array]:
+    """Tables for ``lo <= k < hi`` (``lo >= 1``) by dividing every prime up
+    to ``sqrt(hi)`` out of the segment."""
+    size = hi - lo
+    rest = array("Q", range(lo, hi))
+    phi = array("Q", [1]) * size
+    mu = array("b", [1]) * size
+    d = array("Q", [1]) * size
+    sigma = array("Q", [1]) * size
+    for p in primes:
+        if p * p >= hi:
+            break
+        for i in range(-lo % p, size, p):
+            m = rest[i] // p
+            e = 1
+            power = p
+            while m % p == 0:
+                m //= p
+                e += 1
+                power *= p
+            rest[i] = m
+            phi[i] *= power // p * (p - 1)
+            mu[i] = 0 if e > 1 else -mu[i]
+            d[i] *= e + 1
+            sigma[i] *= (power * p - 1) // (p - 1)
+    # What is left of each k is 1 or a single prime above sqrt(hi).
+    for i in range(size):
+        r = rest[i]
+        if r > 1:
+            phi[i] *= r - 1
+            mu[i] = -mu[i]
+            d[i] *= 2
+            sigma[i] *= r + 1
+    values = {"phi": phi, "mu": mu, "d": d, "sigma": sigma}
+    return {
+        name: values[name] if values[name].typecode == TYPECODES[name]
+        else array(TYPECODES[name], values[name])
+        for name in names
+    }
+
+
+def sieve_segments(
+    n: int,
+    functions: Optional[Iterable[str]] = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    start: int = 0,
+) -> Iterator[tuple[int, dict[str, array]]]:
+    """Yield ``(lo, tables)`` for consecutive segments of ``start <= k <= n``.
+
+    Every table holds the values for ``lo <= k < lo + segment_size`` (the
+    last segment may be shorter).  Memory use is bounded by the segment
+    size and the primes up to ``sqrt(n)``.
+
+    Raises
+    ------
+    TypeError
+        If *n* is not an integer.
+    ValueError
+        As for :func:`linear_sieve`, or if *segment_size* is not positive or
+        *start* is negative.
+    """
+    names = _validate(n, functions)
+    if not isinstance(segment_size, int) or segment_size < 1:
+        raise ValueError("Segment size must be a positive integer")
+    if not isinstance(start, int) or start < 0:
+        raise ValueError("Start must be a non-negative integer")
+    primes = primes_up_to(isqrt(n))
+    for lo in range(start, n + 1, segment_size):
+        hi = min(lo + segment_size, n + 1)
+        if lo == 0:
+            # k = 0 is not a natural number; its entries are 0.
+            rest = _segment(1, hi, primes, names) if hi > 1 else {
+                name: array(TYPECODES[name]) for name in names
+            }
+            yield 0, {name: _zeros(TYPECODES[name], 1) + rest[name] for name in names}
+        else:
+            yield lo, _segment(lo, hi, primes, names)
+
+
+# ---------------------------------------------------------------------------
+# Memory-mapped files
+# ---------------------------------------------------------------------------
+
+def _table_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.bin")
+
+
+def write_tables(
+    n: int,
+    directory: str,
+    functions: Optional[Iterable[str]] = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+) -> dict[str, str]:
+    """Sieve ``0 <= k <= n`` segment by segment into memory-mapped files.
+
+    Every function is written to ``<directory>/<name>.bin`` as ``n + 1``
+    native-endian values of its :data:`TYPECODES` type, so memory use stays
+    bounded by *segment_size* however large the tables are.
+
+    Returns
+    -------
+    dict[str, str]
+        The path written for each function.
+
+    Raises
+    ------
+    TypeError, ValueError
+        As for :func:`sieve_segments`.
+    """
+    names = _validate(n, functions)
+    os.makedirs(directory, exist_ok=True)
+    paths: dict[str, str] = {}
+    maps: dict[str, tuple[mmap.mmap, memoryview]] = {}
+    try:
+        for name in names:
+            paths[name] = path = _table_path(directory, name)
+            with open(path, "w+b") as fh:
+                fh.truncate((n + 1) * array(TYPECODES[name]).itemsize)
+                mapped = mmap.mmap(fh.fileno(), 0)
+            maps[name] = mapped, memoryview(mapped).cast(TYPECODES[name])
+        for lo, tables in sieve_segments(n, names, segment_size):
+            for name, values in tables.items():
+                maps[name][1][lo:lo + len(values)] = values
+    finally:
+        for mapped, view in maps.values():
+            view.release()
+            mapped.flush()
+            mapped.close()
+    return paths
+
+
+def open_table(directory: str, name: str) -> memoryview:
+    """Map a table written by :func:`write_tables` read-only and return it
+    as a typed :class:`memoryview` indexed by *k*.
+
+    Raises
+    ------
+    ValueError
+        If *name* is not a sieve function.
+    OSError
+        If the file cannot be opened.
+    """
+    if name not in TYPECODES:
+        raise ValueError(
+            f"Unknown function {name!r}; expected one of: {', '.join(SIEVE_FUNCTIONS)}"
+        )
+    with open(_table_path(directory, name), "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(TYPECODES[name])
+
+
+__all__ = [
+    "DEFAULT_SEGMENT_SIZE",
+    "SIEVE_FUNCTIONS",
+    "SIEVE_LIMIT",
+    "TYPECODES",
+    "linear_sieve",
+    "open_table",
+    "sieve_segments",
+    "write_tables",
+]
@@ -14,7 +14,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "advmath=advmath.cli:app",
+            "advmath=advmath.launcher:main",
         ],
     },
     python_requires=">=3.12",
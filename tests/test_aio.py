@@ -0,0 +1,132 @@
+"""
+Tests for the asyncio API
+"""
+
+import asyncio
+
+import pytest
+from advmath import aio
+
+SLOW_PRIME = 10**11 + 3  # ~8 ms of trial division: offloaded
+
+
+@pytest.fixture(autouse=True, scope="module")
+def stop_workers():
+    """Stop the worker processes after the module."""
+    yield
+    aio.shutdown()
+
+
+def test_inline_and_offloaded_results():
+    """Test that both paths return the synchronous results"""
+
+    async def main():
+        return (
+            await aio.gcd_iterative(48, 64),
+            await aio.is_prime_iterative(SLOW_PRIME),
+            await aio.batch_gcd([15, 21, 1, 35]),
+            aio.in_flight(),
+        )
+
+    assert asyncio.run(main()) == (16, True, [15, 21, 1, 35], 0)
+    assert aio.estimate_seconds("gcd_iterative", 48, 64) < aio.DEFAULT_INLINE_SECONDS
+    assert aio.estimate_seconds("is_prime_iterative", SLOW_PRIME) > aio.DEFAULT_INLINE_SECONDS
+    assert aio.estimate_seconds("batch_gcd", [1, 2]) is None
+
+
+def test_errors_are_raised():
+    """Test that validation errors surface from both paths"""
+
+    async def main():
+        with pytest.raises(ValueError, match="negative"):
+            await aio.factorial_iterative(-1)
+        with pytest.raises(TypeError, match="Primality test requires an integer"):
+            await aio.is_prime_iterative("7")
+        with pytest.raises(AttributeError):
+            await aio.call("set_backend", "python")
+
+    asyncio.run(main())
+    with pytest.raises(AttributeError):
+        aio.LcmAccumulator
+
+
+def test_parallel_factorial_in_worker():
+    """Test that a pool-based call inside a daemon worker runs serially"""
+    import math
+
+    assert aio.estimate_seconds("factorial_native", 100_000) > aio.DEFAULT_INLINE_SECONDS
+    result = asyncio.run(aio.factorial_native(100_000, workers=2))
+    assert result == math.factorial(100_000)
+
+
+def test_proven_primes_reach_the_parent():
+    """Test that certificates made or checked in a worker are remembered here"""
+    from advmath import prime
+
+    n = 2**89 - 1
+    prime.clear_certificates()
+    assert aio.estimate_seconds("prime_certificate", n) is None  # offloaded
+    certificate = asyncio.run(aio.prime_certificate(n))
+    assert n in prime._proven
+
+    prime.clear_certificates()
+    assert asyncio.run(aio.verify_certificate(certificate)) is True
+    assert n in prime._proven
+    assert all(p in prime._proven for p, _ in certificate.steps)
+    prime.clear_certificates()
+
+
+def test_cancellation_stops_worker():
+    """Test that cancelling an offloaded call terminates its process"""
+
+    async def main():
+        task = asyncio.ensure_future(aio.factorial_iterative(10**8))
+        while aio.in_flight("factorial_iterative") == 0:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        workers = [p for p in aio._pool._context.active_children()]
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert aio.in_flight() == 0
+        # A new worker serves the next request.
+        return workers, await aio.is_prime_iterative(SLOW_PRIME)
+
+    workers, result = asyncio.run(main())
+    assert result is True
+    assert any(p.exitcode is not None and p.exitcode < 0 for p in workers)
+
+
+def test_wait_for_timeout():
+    """Test that asyncio.wait_for timeouts cancel the call"""
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(aio.factorial_iterative(10**8), 0.2)
+        return aio.in_flight()
+
+    assert asyncio.run(main()) == 0
+
+
+def test_concurrency_limit():
+    """Test the per-function limit on concurrent offloaded calls"""
+    aio.configure(max_workers=3)
+    aio.set_limit("is_prime_iterative", 1)
+    try:
+
+        async def main():
+            tasks = [asyncio.ensure_future(aio.is_prime_iterative(10**13 + 37)) for _ in range(3)]
+            peak = 0
+            while not all(t.done() for t in tasks):
+                peak = max(peak, aio.in_flight("is_prime_iterative"))
+                await asyncio.sleep(0.005)
+            return peak, [t.result() for t in tasks]
+
+        assert asyncio.run(main()) == (1, [True] * 3)
+        with pytest.raises(ValueError):
+            aio.set_limit("is_prime_iterative", 0)
+        with pytest.raises(ValueError):
+            aio.configure(max_workers=0)
+    finally:
+        aio.set_limit("is_prime_iterative", None)
+        aio.configure(max_workers=aio.os.cpu_count() or 1)
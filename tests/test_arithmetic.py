@@ -0,0 +1,76 @@
+"""
+Tests for the single-value arithmetic functions
+"""
+
+from math import gcd
+
+import pytest
+from advmath.arithmetic import FACTORIZATION_CACHE_SIZE, _factorization, carmichael, divisors, euler_phi, multiplicative_order
+
+
+def brute_order(a, n):
+    k, x = 1, a % n
+    while x != 1 % n:
+        x = x * a % n
+        k += 1
+    return k
+
+
+class TestArithmeticFunctions:
+    """Test cases for phi, lambda, divisors and order"""
+
+    def test_agree_with_definitions(self):
+        """Test every function against brute force for small n"""
+        for n in range(1, 200):
+            units = [a for a in range(1, n + 1) if gcd(a, n) == 1]
+            assert euler_phi(n) == len(units)
+            assert list(divisors(n)) == [d for d in range(1, n + 1) if n % d == 0]
+            orders = [multiplicative_order(a, n) for a in units]
+            assert orders == [brute_order(a, n) for a in units]
+            assert carmichael(n) == max(orders)
+
+    def test_large_values(self):
+        """Test values that need Pollard factoring"""
+        n = 2**64 + 1  # 274177 * 67280421310721
+        assert euler_phi(n) == 274176 * 67280421310720
+        assert list(divisors(n)) == [1, 274177, 67280421310721, n]
+        p = 2**61 - 1
+        assert euler_phi(p) == carmichael(p) == p - 1
+        assert multiplicative_order(2, p) == 61
+        assert multiplicative_order(3 + p, p) == multiplicative_order(3, p)
+
+    def test_factorization_is_shared(self):
+        """Test that asking several functions about one n factors it once"""
+        _factorization.cache_clear()
+        n = 1_000_003 * 1_000_033
+        euler_phi(n)
+        carmichael(n)
+        list(divisors(n))
+        assert _factorization.cache_info().misses == 1
+
+    def test_factorization_cache_is_bounded(self):
+        """Test that distinct big n do not accumulate without limit"""
+        _factorization.cache_clear()
+        for n in range(10**12, 10**12 + FACTORIZATION_CACHE_SIZE + 100):
+            euler_phi(n)
+        assert _factorization.cache_info().currsize == FACTORIZATION_CACHE_SIZE
+
+    def test_divisors_is_lazy(self):
+        """Test that the first divisors come without building all of them"""
+        n = 2**200 * 3**200
+        gen = divisors(n)
+        assert [next(gen) for _ in range(6)] == [1, 2, 3, 4, 6, 8]
+
+    def test_invalid_inputs(self):
+        """Test error handling"""
+        for func in (euler_phi, carmichael, divisors):
+            with pytest.raises(ValueError):
+                func(0)
+            with pytest.raises(TypeError):
+                func(5.0)
+        with pytest.raises(ValueError, match="not coprime"):
+            multiplicative_order(6, 9)
+        with pytest.raises(ValueError):
+            multiplicative_order(2, -7)
+        with pytest.raises(TypeError):
+            multiplicative_order("2", 7)
@@ -0,0 +1,107 @@
+"""
+Differential tests for the arithmetic backends
+"""
+
+import random
+
+import pytest
+from advmath import backend
+from advmath.backend import BACKENDS, available_backends, get_backend, set_backend
+from advmath.factorial import factorial_iterative, factorial_native
+from advmath.gcd import gcd_iterative, gcd_native
+from advmath.lcm import lcm_iterative, lcm_native
+from advmath.power import power_iterative, power_native
+from advmath.prime import is_prime_iterative, is_prime_miller_rabin
+
+rng = random.Random(41)
+BIG = [rng.getrandbits(bits) for bits in (63, 64, 65, 500, 9000) for _ in range(3)]
+
+# Public native function -> (reference implementation, argument tuples)
+CASES = {
+    factorial_native: (factorial_iterative, [(0,), (1,), (2,), (20,), (21,), (1000,)]),
+    power_native: (power_iterative, [(0, 0), (2, 0), (-2, 3), (3, 1000), (BIG[-1], 3), (2.5, 2)]),
+    gcd_native: (
+        gcd_iterative,
+        [(0, 0), (0, 5), (48, 64), (2**200 * 3, 2**100 * 9)] + list(zip(BIG, reversed(BIG))),
+    ),
+    lcm_native: (lcm_iterative, [(0, 0), (0, 5), (4, 6), (7, 7)] + list(zip(BIG, BIG[1:]))),
+}
+
+BAD_ARGS = {
+    factorial_native: [(-1,), (5.5,), ("5",)],
+    power_native: [(2, -1), (2, 1.5)],
+    gcd_native: [(-1, 2), (1, 2.0), ("a", 1)],
+    lcm_native: [(-1, 2), (1, 2.0), (None, 1)],
+}
+
+
+@pytest.fixture(params=BACKENDS)
+def each_backend(request):
+    """Run the test once per installed backend."""
+    if request.param not in available_backends():
+        pytest.skip(f"{request.param} is not installed")
+    previous = get_backend()
+    set_backend(request.param)
+    yield request.param
+    set_backend(previous)
+
+
+def test_results_match_reference(each_backend):
+    """Test that every backend returns the reference results"""
+    for func, (reference, arg_list) in CASES.items():
+        for args in arg_list:
+            assert func(*args) == reference(*args), (each_backend, func.__name__, args)
+            assert type(func(*args)) is type(reference(*args))
+
+
+def test_errors_match_reference(each_backend):
+    """Test that every backend raises the reference errors"""
+    for func, arg_list in BAD_ARGS.items():
+        reference = CASES[func][0]
+        for args in arg_list:
+            with pytest.raises(Exception) as expected:
+                reference(*args)
+            with pytest.raises(expected.type, match=str(expected.value)):
+                func(*args)
+
+
+def test_kernels_agree(each_backend):
+    """Test isqrt and powmod against the pure Python kernels"""
+    kernels = backend.current()
+    set_backend("python")
+    python = backend.current()
+    set_backend(each_backend)
+    for n in [0, 1, 2, 3, 4, 15, 16, 17, 2**64 - 1, 2**64] + BIG:
+        root = kernels.isqrt(n)
+        assert root == python.isqrt(n)
+        assert root * root <= n < (root + 1) * (root + 1)
+    for base, exponent, modulus in [(2, 0, 1), (3, 10**6, 10**9 + 7)] + list(zip(BIG[:10], BIG[1:11], BIG[2:12])):
+        if modulus > 0:
+            assert kernels.powmod(base, exponent, modulus) == python.powmod(base, exponent, modulus)
+
+
+def test_primality_uses_backend(each_backend):
+    """Test the primality functions under every backend"""
+    assert [n for n in range(60) if is_prime_iterative(n)] == [
+        n for n in range(60) if is_prime_miller_rabin(n)
+    ]
+    assert is_prime_miller_rabin(2**127 - 1)
+    assert not is_prime_miller_rabin(2**128 + 1)
+
+
+def test_set_backend_validation(monkeypatch):
+    """Test backend selection errors, auto and the environment variable"""
+    previous = get_backend()
+    try:
+        with pytest.raises(ValueError, match="Backend must be 'auto', 'gmpy2', 'stdlib' or 'python'"):
+            set_backend("fortran")
+        if "gmpy2" not in available_backends():
+            with pytest.raises(ValueError, match="not available"):
+                set_backend("gmpy2")
+        assert set_backend("AUTO") == available_backends()[0]
+
+        monkeypatch.setattr(backend, "_active", None)
+        monkeypatch.setenv("ADVMATH_BACKEND", "python")
+        assert get_backend() == "python"
+    finally:
+        set_backend(previous)
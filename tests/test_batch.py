@@ -0,0 +1,135 @@
+"""
+Tests for the NDJSON batch processing module
+"""
+
+import io
+import json
+
+import pytest
+from advmath.batch import process_record, run_batch
+
+
+def _run(text, chunk_size=1000):
+    out = io.StringIO()
+    errors = run_batch(io.StringIO(text), out, chunk_size)
+    return errors, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestProcessRecord:
+    """Test cases for single record evaluation"""
+
+    def test_operations(self):
+        """Test every operation with both methods"""
+        for method in ("iterative", "recursive", "ITERATIVE", "auto"):
+            assert process_record({"op": "fact", "args": [5], "method": method})["result"] == 120
+            assert process_record({"op": "gcd", "args": [48, 64], "method": method})["result"] == 16
+            assert process_record({"op": "lcm", "args": [4, 6], "method": method})["result"] == 12
+            assert process_record({"op": "prime", "args": [97], "method": method})["result"] is True
+
+    def test_echoes_request(self):
+        """Test that id, op and args are echoed back"""
+        response = process_record({"op": "gcd", "args": [4, 6], "id": "abc"})
+        assert response == {"id": "abc", "op": "gcd", "args": [4, 6], "result": 2}
+
+    def test_huge_results(self):
+        """Test that results beyond the int-to-str digit limit are JSON numbers"""
+        import math
+
+        from advmath.batch import encode_response
+        from advmath.output import to_decimal_string
+
+        out = io.StringIO()
+        run_batch(['{"op": "fact", "args": [3000], "id": 1}'], out)
+        response = json.loads(out.getvalue(), parse_int=str)
+        assert list(response) == ["line", "id", "op", "args", "result"]
+        assert response["result"] == to_decimal_string(math.factorial(3000))
+        assert json.loads(encode_response({"result": 2**8100}))["result"] == 2**8100
+
+    def test_errors_are_inline(self):
+        """Test that invalid requests produce an error field instead of raising"""
+        assert process_record({"op": "fact", "args": [-1]})["error"] == (
+            "Factorial is not defined for negative numbers"
+        )
+        assert "Unknown operation" in process_record({"op": "sqrt", "args": [4]})["error"]
+        assert process_record({"op": "fact", "args": [3], "method": "magic"})["error"] == (
+            "Method must be 'auto', 'iterative', 'native' or 'recursive'"
+        )
+        assert "error" in process_record({"op": "gcd", "args": [1]})
+        assert "error" in process_record({"op": "gcd", "args": 5})
+        assert "error" in process_record([1, 2])
+
+
+class TestRunBatch:
+    """Test cases for streaming NDJSON processing"""
+
+    def test_stream(self):
+        """Test a mixed stream with blank and malformed lines"""
+        text = (
+            '{"op": "fact", "args": [5]}\n'
+            "\n"
+            "not json\n"
+            '{"op": "prime", "args": [-3]}\n'
+            '{"op": "lcm", "args": [21, 6]}\n'
+        )
+        errors, responses = _run(text)
+        assert errors == 2
+        assert [r["line"] for r in responses] == [1, 3, 4, 5]
+        assert responses[0]["result"] == 120
+        assert responses[1]["error"].startswith("Invalid JSON")
+        assert "error" in responses[2]
+        assert responses[3]["result"] == 42
+
+    def test_chunked_flushing(self):
+        """Test that output is flushed every chunk_size records"""
+
+        class CountingIO(io.StringIO):
+            flushes = 0
+
+            def flush(self):
+                self.flushes += 1
+                super().flush()
+
+        out = CountingIO()
+        lines = ('{"op": "gcd", "args": [%d, 6]}\n' % i for i in range(10))
+        assert run_batch(lines, out, chunk_size=3) == 0
+        assert len(out.getvalue().splitlines()) == 10
+        assert out.flushes == 4
+
+    def test_parallel_matches_serial(self):
+        """Test that worker processes give the same responses as in-process"""
+        text = "".join(
+            '{"op": "%s", "args": [%d]}\n' % (op, n)
+            for n in range(-2, 40)
+            for op in ("fact", "prime")
+        )
+        serial = _run(text)
+        out = io.StringIO()
+        errors = run_batch(io.StringIO(text), out, chunk_size=7, jobs=2)
+        assert (errors, [json.loads(line) for line in out.getvalue().splitlines()]) == serial
+
+        out = io.StringIO()
+        run_batch(io.StringIO(text), out, chunk_size=7, jobs=2, ordered=False)
+        unordered = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert sorted(unordered, key=lambda r: r["line"]) == serial[1]
+
+    def test_budgets(self):
+        """Test default and per-record budgets"""
+        text = (
+            '{"op": "fact", "args": [100]}\n'
+            '{"op": "fact", "args": [100], "max_result_bits": 1000}\n'
+        )
+        out = io.StringIO()
+        assert run_batch(io.StringIO(text), out, max_result_bits=100) == 1
+        responses = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert "Predicted result" in responses[0]["error"]
+        assert "result" in responses[1]
+
+    def test_invalid_jobs(self):
+        """Test that a non-positive job count is rejected"""
+        with pytest.raises(ValueError, match="Jobs must be a positive integer"):
+            run_batch([], io.StringIO(), jobs=0)
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected"""
+        with pytest.raises(ValueError, match="Chunk size must be a positive integer"):
+            run_batch([], io.StringIO(), chunk_size=0)
@@ -0,0 +1,80 @@
+"""
+Tests for the benchmark suite
+"""
+
+import json
+
+import pytest
+from advmath.bench import bench_case, compare, load_report, run_benchmarks, save_report
+
+
+def test_bench_case_statistics():
+    """Test the latency, throughput and memory fields"""
+    result = bench_case(sum, (range(1000),), repeat=7)
+    assert result["samples"] == 7
+    assert result["min_seconds"] <= result["p50_seconds"] <= result["p90_seconds"]
+    assert result["p90_seconds"] <= result["p99_seconds"] <= result["max_seconds"]
+    assert result["ops_per_second"] > 0
+    assert result["peak_bytes"] >= 0
+    assert "peak_bytes" not in bench_case(sum, ((),), repeat=1, memory=False)
+
+
+def test_run_benchmarks_sweep():
+    """Test that every method and the stdlib reference are measured"""
+    report = run_benchmarks(["factorial", "gcd"], sizes=[64, 2000], repeat=2, memory=False)
+    cases = {(e["op"], e["method"], e["size"]): e for e in report["results"]}
+    assert {m for op, m, _ in cases if op == "gcd"} == {
+        "iterative", "recursive", "binary", "lehmer", "native", "math", "fast",
+    }
+    assert "p50_seconds" in cases["factorial", "math", 2000]
+    # The recursive factorial exceeds the recursion limit; it is reported,
+    # not raised.
+    assert cases["factorial", "recursive", 2000]["error"] == "RecursionError"
+    json.dumps(report)
+
+
+def test_run_benchmarks_filters():
+    """Test method filtering and unknown operations"""
+    report = run_benchmarks(["prime"], methods=["miller_rabin", "math"], sizes=[16], repeat=1)
+    assert [e["method"] for e in report["results"]] == ["miller_rabin"]
+    with pytest.raises(ValueError):
+        run_benchmarks(["sqrt"])
+
+
+def test_parallel_speedup(monkeypatch):
+    """Test that parallel factorial results report a speedup over native"""
+    from advmath import factorial
+
+    monkeypatch.setattr(factorial, "_PARALLEL_MIN", 1000)
+    report = run_benchmarks(["factorial"], methods=["native", "parallel"], sizes=[100, 2000], repeat=2, memory=False)
+    assert [(e["method"], e["size"]) for e in report["results"]] == [
+        ("native", 100), ("native", 2000), ("parallel", 2000),
+    ]
+    native, parallel = report["results"][1:]
+    assert parallel["method"] == "parallel"
+    assert parallel["speedup"] == native["p50_seconds"] / parallel["p50_seconds"]
+    assert "speedup" not in native
+
+
+def test_compare_flags_regressions(tmp_path):
+    """Test regression detection against a saved baseline"""
+    baseline = {"results": [
+        {"op": "gcd", "method": "iterative", "size": 64, "p50_seconds": 1.0, "peak_bytes": 100},
+        {"op": "gcd", "method": "lehmer", "size": 64, "p50_seconds": 1.0, "peak_bytes": 100},
+        {"op": "gcd", "method": "recursive", "size": 64, "error": "RecursionError"},
+    ]}
+    current = {"results": [
+        {"op": "gcd", "method": "iterative", "size": 64, "p50_seconds": 1.1, "peak_bytes": 300},
+        {"op": "gcd", "method": "lehmer", "size": 64, "p50_seconds": 2.0, "peak_bytes": 100},
+        {"op": "gcd", "method": "recursive", "size": 64, "p50_seconds": 9.0},
+    ]}
+    found = {(r["method"], r["metric"]) for r in compare(current, baseline)}
+    assert found == {("iterative", "peak_bytes"), ("lehmer", "p50_seconds")}
+    assert compare(current, baseline, threshold=5) == []
+
+    path = tmp_path / "baseline.json"
+    save_report(baseline, str(path))
+    assert load_report(str(path)) == baseline
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        load_report(str(path))
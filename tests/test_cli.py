@@ -0,0 +1,141 @@
+"""
+Tests for the command line interface
+"""
+
+import json
+
+import pytest
+
+typer_testing = pytest.importorskip("typer.testing")
+
+from advmath.cli import app  # noqa: E402
+
+runner = typer_testing.CliRunner()
+
+
+class TestCommands:
+    """Test cases for the single-value commands"""
+
+    def test_fact(self):
+        """Test factorial output"""
+        result = runner.invoke(app, ["fact", "5"])
+        assert result.exit_code == 0
+        assert result.stdout.strip() == "120"
+
+    def test_gcd_recursive(self):
+        """Test GCD with an explicit method"""
+        result = runner.invoke(app, ["gcd", "48", "64", "--method", "recursive"])
+        assert result.exit_code == 0
+        assert "GCD of 48 and 64 is 16" in result.stdout
+
+    def test_fact_formats(self, tmp_path):
+        """Test output formats and writing results to a file"""
+        result = runner.invoke(app, ["fact", "10", "--format", "hex"])
+        assert result.stdout.strip() == "375f00"
+        result = runner.invoke(app, ["fact", "3000"])
+        assert result.exit_code == 0
+        assert len(result.stdout.strip()) == 9131
+        path = tmp_path / "fact.raw"
+        result = runner.invoke(app, ["fact", "20", "-f", "raw", "-o", str(path)])
+        assert result.exit_code == 0
+        assert int.from_bytes(path.read_bytes(), "big") == 2432902008176640000
+        result = runner.invoke(app, ["fact", "5", "--format", "oct"])
+        assert result.exit_code == 1
+
+    def test_budget_options(self):
+        """Test the global --max-time and --max-bits options"""
+        result = runner.invoke(app, ["--max-time", "1", "fact", "100000000"])
+        assert result.exit_code == 1
+        result = runner.invoke(app, ["--max-bits", "100", "fact", "100"])
+        assert result.exit_code == 1
+        result = runner.invoke(app, ["--max-bits", "1000", "fact", "10"])
+        assert result.stdout.strip() == "3628800"
+
+    def test_timing(self):
+        """Test that --timing writes one JSON report to stderr"""
+        result = runner.invoke(app, ["--timing", "gcd", "48", "64"])
+        assert result.exit_code == 0
+        report = json.loads(result.stderr.strip().splitlines()[-1])["timing"]
+        assert report["command"] == "gcd"
+        assert report["status"] == "ok"
+        assert report["result_bits"] == 5
+        assert {"wall_seconds", "cpu_seconds", "cache_hits", "cache_misses"} <= set(report)
+
+        result = runner.invoke(app, ["--timing", "fact", "--", "-1"])
+        assert result.exit_code == 1
+
+    def test_profile_file(self, tmp_path):
+        """Test that --profile FILE writes pstats data"""
+        import pstats
+
+        path = tmp_path / "fact.stats"
+        result = runner.invoke(app, ["--profile", str(path), "fact", "50"])
+        assert result.exit_code == 0
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def test_invalid_method(self):
+        """Test that an invalid method exits with status 1"""
+        result = runner.invoke(app, ["prime", "7", "--method", "magic"])
+        assert result.exit_code == 1
+
+
+class TestBatchCommand:
+    """Test cases for the NDJSON batch command"""
+
+    def test_stdin(self):
+        """Test reading requests from stdin"""
+        stdin = '{"op": "fact", "args": [4]}\n{"op": "fact", "args": [-4]}\n'
+        result = runner.invoke(app, ["batch"], input=stdin)
+        assert result.exit_code == 0
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        assert responses[0]["result"] == 24
+        assert "error" in responses[1]
+
+    def test_file(self, tmp_path):
+        """Test reading requests from a file"""
+        path = tmp_path / "requests.ndjson"
+        path.write_text('{"op": "lcm", "args": [4, 6]}\n')
+        result = runner.invoke(app, ["batch", str(path)])
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["result"] == 12
+
+
+class TestBench:
+    """Test cases for the bench command"""
+
+    def test_report_and_baseline(self, tmp_path):
+        """Test JSON output and regression exit status"""
+        path = tmp_path / "bench.json"
+        args = ["bench", "--op", "gcd", "--method", "math", "--quick", "--repeat", "2"]
+        result = runner.invoke(app, [*args, "--output", str(path)])
+        assert result.exit_code == 0
+        report = json.loads(path.read_text())
+        assert {e["size"] for e in report["results"]} == {64, 1024, 8192}
+
+        for entry in report["results"]:
+            entry["p50_seconds"] /= 1000
+        path.write_text(json.dumps(report))
+        result = runner.invoke(app, [*args, "--baseline", str(path)])
+        assert result.exit_code == 1
+        assert "Regression: gcd math" in result.stderr
+        assert json.loads(result.stdout)["regressions"]
+
+
+class TestDiskCache:
+    """Test the --disk-cache option and the cache command"""
+
+    def test_disk_cache(self, tmp_path):
+        """Test that results are stored and reported"""
+        path = str(tmp_path / "cache.sqlite3")
+        result = runner.invoke(app, ["--disk-cache", path, "fact", "20000"])
+        assert result.exit_code == 0
+        result = runner.invoke(app, ["cache", path])
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["entries"] == 1
+        result = runner.invoke(app, ["cache", path, "--clear"])
+        assert json.loads(result.stdout)["entries"] == 0
+        # Without the option the cache is off again.
+        runner.invoke(app, ["gcd", "48", "64"])
+        from advmath import diskcache
+
+        assert not diskcache.is_enabled()
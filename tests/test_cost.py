@@ -0,0 +1,121 @@
+"""
+Tests for cost estimation and resource budgets
+"""
+
+import math
+import time
+
+import pytest
+from advmath.cost import BudgetExceededError, budget, check_budget, checkpoint, estimate
+from advmath.factorial import factorial_iterative
+from advmath.fibonacci import fibonacci_iterative
+from advmath.prime import is_prime_iterative
+from advmath.registry import compute
+
+
+class TestEstimate:
+    """Test cases for the cost estimator"""
+
+    def test_result_bits(self):
+        """Test predicted result sizes against actual results"""
+        for n in (0, 1, 10, 1000, 5000):
+            assert abs(estimate("factorial", n).result_bits - factorial_iterative(n).bit_length()) <= 1
+        for n in (10, 1000, 5000):
+            assert abs(estimate("fibonacci", n).result_bits - fibonacci_iterative(n).bit_length()) <= 2
+        assert estimate("power", 3, 1000).result_bits == (3**1000).bit_length()
+        assert estimate("prime", 97).result_bits == 1
+
+    def test_operation_counts(self):
+        """Test that costs grow with the input"""
+        assert estimate("factorial", 100).operations == 100
+        assert estimate("prime", 10**12).operations > estimate("prime", 10**6).operations
+        assert estimate("prime", 10**40, method="miller_rabin").seconds < 1
+        assert estimate("prime", 10**40).seconds > 10**6
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments give an empty estimate"""
+        assert estimate("factorial", -5) == (0, 0, 0.0)
+        assert estimate("factorial", 5.5) == (0, 0, 0.0)
+        assert estimate("unknown", 5) == (0, 0, 0.0)
+
+
+class TestBudget:
+    """Test cases for up-front rejection and cooperative aborts"""
+
+    def test_rejected_up_front(self):
+        """Test that over-budget calls are rejected before running"""
+        start = time.perf_counter()
+        with pytest.raises(BudgetExceededError, match="Predicted run time"):
+            compute("factorial", 10**8, max_seconds=1)
+        with pytest.raises(BudgetExceededError, match="Predicted run time"):
+            compute("prime", 10**40 + 1, method="iterative", max_seconds=1)
+        with pytest.raises(BudgetExceededError, match="Predicted result of 525 bits"):
+            compute("factorial", 100, max_result_bits=100)
+        assert time.perf_counter() - start < 0.5
+
+    @pytest.mark.parametrize("method", ["iterative", "native"])
+    def test_huge_inputs_rejected(self, method):
+        """Test that inputs too large for a float estimate are still rejected"""
+        with pytest.raises(BudgetExceededError, match="Predicted run time"):
+            compute("factorial", 10**400, method=method, max_seconds=1)
+        with budget(max_seconds=1):
+            with pytest.raises(BudgetExceededError, match="Predicted run time"):
+                compute("power", 2, 10**400, method=method)
+        with pytest.raises(BudgetExceededError, match="Predicted result"):
+            compute("fibonacci", 10**400, max_result_bits=10**6)
+
+    def test_within_budget(self):
+        """Test that calls within budget return normally"""
+        assert compute("gcd", 2**100, 3, max_result_bits=8) == 1
+        assert compute("lcm", 2**100, 2**100, max_result_bits=150) == 2**100
+        with pytest.raises(BudgetExceededError, match="budget of 150 bits"):
+            compute("lcm", 2**100, 3**70, max_result_bits=150)
+        assert compute("factorial", 100, max_result_bits=600) == math.factorial(100)
+        assert compute("prime", 10**12 + 39, max_seconds=5) is True
+
+    def test_native_within_budget(self):
+        """Test that native calls are priced as C routines, not as loops"""
+        from advmath.backend import get_backend
+
+        if get_backend() == "python":
+            pytest.skip("native methods run interpreted loops")
+        assert compute("factorial", 300_000, method="native", max_seconds=2) == math.factorial(300_000)
+        with pytest.raises(BudgetExceededError):
+            compute("factorial", 300_000, method="iterative", max_seconds=2)
+        a, b = 3**200_000, 7**150_000
+        for op, args in (("factorial", (10**5,)), ("power", (3, 10**6)), ("gcd", (a, b)), ("lcm", (a, b))):
+            assert estimate(op, *args, method="native").seconds < estimate(op, *args).seconds
+
+    def test_cooperative_abort(self):
+        """Test that a running loop aborts when the deadline passes"""
+        start = time.perf_counter()
+        with budget(max_seconds=0.05):
+            with pytest.raises(BudgetExceededError, match="Time budget of 0.05 seconds exceeded"):
+                factorial_iterative(10**7)
+        assert time.perf_counter() - start < 1
+
+        with budget(max_seconds=0.05):
+            with pytest.raises(BudgetExceededError):
+                is_prime_iterative((2**61 - 1) ** 2)
+
+    def test_result_bits_abort(self):
+        """Test that growing intermediate results are checked"""
+        with budget(max_result_bits=1000):
+            with pytest.raises(BudgetExceededError, match="budget of 1000 bits"):
+                fibonacci_iterative(10**6)
+
+    def test_nested_budgets(self):
+        """Test that the tighter limit applies and budgets are restored"""
+        with budget(max_result_bits=100):
+            with budget(max_result_bits=10**6):
+                with pytest.raises(BudgetExceededError):
+                    check_budget("factorial", 100)
+        checkpoint(factorial_iterative(1000))
+
+    def test_invalid_limits(self):
+        """Test that invalid limits are rejected"""
+        with pytest.raises(ValueError, match="max_seconds must be a positive number"):
+            with budget(max_seconds=0):
+                pass
+        with pytest.raises(ValueError, match="max_result_bits must be a positive integer"):
+            compute("factorial", 5, max_result_bits=1.5)
@@ -0,0 +1,142 @@
+"""
+Tests for the persistent result cache
+"""
+
+import multiprocessing
+import sqlite3
+
+import advmath
+import pytest
+from advmath import diskcache
+from advmath.factorial import factorial_iterative
+from advmath.fibonacci import fibonacci_iterative
+from advmath.registry import compute
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    """Start and end every test with the cache off."""
+    diskcache.disable()
+    yield
+    diskcache.disable()
+
+
+def _fill(path, start):
+    """Write 20 entries from another process."""
+    store = diskcache.DiskCache(path)
+    for n in range(start, start + 20):
+        store.put("fibonacci", (n,), n * n)
+
+
+def test_encoding_round_trip():
+    """Test the compact binary form of results and arguments"""
+    for value in (0, 1, -1, 255, -256, 2**64, -(3**200), True, False):
+        data = diskcache.encode_value(value)
+        decoded = diskcache.decode_value(data)
+        assert decoded == value and type(decoded) is type(value)
+    assert len(diskcache.encode_value(2**8000)) == 1 + 8001 // 8 + 1
+    assert diskcache.encode_value(2.5) is None
+    assert diskcache.encode_args((1, 256)) != diskcache.encode_args((256, 1))
+    with pytest.raises(ValueError):
+        diskcache.decode_value(b"x")
+
+
+def test_shared_across_stores(tmp_path):
+    """Test that a result stored by one store is found by another"""
+    path = str(tmp_path / "cache.sqlite3")
+    first = diskcache.DiskCache(path)
+    assert first.get("factorial", (5000,)) == (False, None)
+    assert first.put("factorial", (5000,), factorial_iterative(5000))
+    second = diskcache.DiskCache(path)
+    assert second.get("factorial", (5000,)) == (True, factorial_iterative(5000))
+    assert second.stats()["entries"] == 1
+
+
+def test_enable_caches_registry_functions(tmp_path, monkeypatch):
+    """Test lookups through the package namespace and compute()"""
+    store = diskcache.enable(str(tmp_path / "cache.sqlite3"))
+    assert diskcache.is_enabled() and diskcache.active() is store
+    expected = factorial_iterative(20000)
+    assert compute("factorial", 20000, method="iterative") == expected
+    assert store.stats()["entries"] == 1
+    # Every method of the operation shares the entry.
+    assert compute("factorial", 20000, method="native") == expected
+    assert store.hits == 1
+
+    # Cheap calls, non-integer arguments and errors bypass the store.
+    assert advmath.gcd_iterative(48, 64) == 16
+    assert advmath.power_iterative(2.5, 2) == 6.25
+    with pytest.raises(ValueError):
+        advmath.factorial_iterative(-1)
+    assert store.stats()["entries"] == 1
+
+    # A new algorithm version no longer sees old entries.
+    monkeypatch.setitem(diskcache.ALGORITHM_VERSIONS, "factorial", 2)
+    assert store.get("factorial", (20000,)) == (False, None)
+
+    diskcache.disable()
+    assert advmath.factorial_iterative is factorial_iterative
+
+
+def test_unusable_cache_is_skipped(tmp_path):
+    """Test that a broken database does not break calculations"""
+    path = tmp_path / "cache.sqlite3"
+    diskcache.enable(str(path))
+    path.write_bytes(b"not a database" * 100)
+    diskcache.active().close()
+    assert advmath.fibonacci_iterative(100000) == fibonacci_iterative(100000)
+
+
+def test_eviction(tmp_path):
+    """Test that least recently used entries are evicted past max_bytes"""
+    store = diskcache.DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=1000)
+    for n in range(10):
+        store.put("power", (2, 1000 + n), 2 ** (1000 + n))
+    stats = store.stats()
+    assert stats["bytes"] <= 1000
+    assert stats["entries"] < 10
+    assert store.get("power", (2, 1009)) == (True, 2**1009)
+    assert store.get("power", (2, 1000)) == (False, None)
+    assert not store.put("power", (2, 10000), 2**10000)
+    with pytest.raises(ValueError, match="max_bytes must be a positive integer"):
+        diskcache.DiskCache(str(tmp_path / "other.sqlite3"), max_bytes=0)
+
+
+def test_probabilistic_methods_are_separate(tmp_path):
+    """Test that Miller-Rabin verdicts are never served to exact methods"""
+    store = diskcache.DiskCache(str(tmp_path / "cache.sqlite3"))
+    n = 10**30 + 57
+    assert store.put("prime", (n,), True, "miller_rabin")
+    assert store.get("prime", (n,), "miller_rabin") == (True, True)
+    assert store.get("prime", (n,)) == (False, None)
+    assert store.get("prime", (n,), "iterative") == (False, None)
+    assert store.put("factorial", (3000,), 1, "iterative")
+    assert store.get("factorial", (3000,), "native") == (True, 1)
+
+    cache = diskcache.enable(str(tmp_path / "shared.sqlite3"), min_seconds=0)
+    try:
+        advmath.is_prime_miller_rabin(10**12 + 39)
+        advmath.is_prime_iterative(10**12 + 39)
+        assert (cache.hits, cache.misses) == (0, 2)
+        advmath.is_prime_recursive(10**12 + 39)
+        assert cache.hits == 1
+    finally:
+        diskcache.disable()
+
+
+def test_concurrent_processes(tmp_path):
+    """Test that several processes can write to one cache"""
+    path = str(tmp_path / "cache.sqlite3")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_fill, args=(path, 20 * i)) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+    store = diskcache.DiskCache(path)
+    assert store.stats()["entries"] == 60
+    assert store.get("fibonacci", (59,)) == (True, 59 * 59)
+    with sqlite3.connect(path) as conn:
+        total = conn.execute("SELECT sum(size) FROM results").fetchone()[0]
+    assert store.stats()["bytes"] == total
@@ -1,5 +1,8 @@
+import math
+
 import pytest
-from advmath.factorial import factorial_iterative, factorial_recursive
+from advmath import factorial as factorial_module
+from advmath.factorial import factorial_iterative, factorial_native, factorial_recursive
 
 def test_iterative_factorial():
     """Test iterative factorial implementation"""
@@ -38,4 +41,15 @@ def test_both_implementations_equal():
     test_cases = [0, 1, 3, 5, 7, 10]
     
     for n in test_cases:
-        assert factorial_iterative(n) == factorial_recursive(n)
\ No newline at end of file
+        assert factorial_iterative(n) == factorial_recursive(n)
+
+
+def test_parallel_factorial(monkeypatch):
+    """Test the process-pool factorial against math.factorial"""
+    monkeypatch.setattr(factorial_module, "_PARALLEL_MIN", 0)
+    for n in (0, 1, 7, 3000):
+        for workers in (2, 5):
+            assert factorial_native(n, workers=workers) == math.factorial(n)
+    assert factorial_native(3000, parallel=True) == math.factorial(3000)
+    with pytest.raises(ValueError, match="workers must be a positive integer"):
+        factorial_native(10, workers=0)
@@ -0,0 +1,84 @@
+"""
+Tests for the unchecked fast-path API
+"""
+
+import math
+from array import array
+
+import pytest
+from advmath import fast
+from advmath._validate import all_at_least, all_ints
+from advmath.factorial import factorial_recursive
+from advmath.fibonacci import fibonacci_recursive
+from advmath.gcd import batch_gcd, batch_mod_inverse, gcd_recursive
+
+
+def test_scalar_kernels():
+    """Test the unchecked functions against known values"""
+    assert fast.factorial(10) == 3628800
+    assert fast.fibonacci(90) == 2880067194370816120
+    assert fast.power(-3, 5) == -243
+    assert fast.gcd(48, 64) == 16
+    assert fast.lcm(4, 6) == 12
+    assert [n for n in range(30) if fast.is_prime(n)] == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert fast.is_prime(2**61 - 1)
+    assert not fast.is_prime((1 << 20) + 1)
+
+
+def test_batch_matches_checked_functions():
+    """Test element-wise batches, including arrays and iterators"""
+    a = [0, 1, 12, 2**70, 97]
+    b = [0, 5, 18, 2**35 * 3, 89]
+    assert fast.batch("gcd", a, b) == [math.gcd(x, y) for x, y in zip(a, b)]
+    assert fast.batch("lcm", array("Q", [4, 9]), (6, 12)) == [12, 36]
+    assert fast.batch("factorial", range(6)) == [1, 1, 2, 6, 24, 120]
+    assert fast.batch("fibonacci", [0, 1, 10]) == [0, 1, 55]
+    assert fast.batch("power", [2, -2, 2.5], [10, 3, 2]) == [1024, -8, 6.25]
+    assert fast.batch("prime", array("q", [1, 2, 15, 17])) == [False, True, False, True]
+    assert fast.batch("gcd", [], []) == []
+    # bools fail the quick check but are accepted by the checked fallback.
+    assert fast.batch("factorial", [True, 3]) == [1, 6]
+
+
+def test_batch_errors_match_checked_functions():
+    """Test that invalid batches raise the checked functions' errors"""
+    with pytest.raises(ValueError, match="Factorial is not defined for negative numbers"):
+        fast.batch("factorial", [3, -1])
+    with pytest.raises(ValueError, match="GCD is only defined for integers"):
+        fast.batch("gcd", [1, 2], [3, 4.0])
+    with pytest.raises(TypeError, match="Primality test requires an integer"):
+        fast.batch("prime", ["7"])
+    with pytest.raises(ValueError, match="Exponent must be non-negative"):
+        fast.batch("power", [2], array("b", [-1]))
+    with pytest.raises(ValueError, match="same length"):
+        fast.batch("gcd", [1, 2], [3])
+    with pytest.raises(ValueError, match="takes 2 columns"):
+        fast.batch("gcd", [1])
+    with pytest.raises(ValueError, match="Unknown operation"):
+        fast.batch("sqrt", [4])
+
+
+def test_batch_validation_helpers():
+    """Test the whole-batch checks"""
+    assert all_ints([1, 2**80, 0])
+    assert not all_ints([1, True])
+    assert not all_ints([1, 2.0])
+    assert all_ints(array("h", [-1]))
+    assert not all_ints(array("d", [1.0]))
+    assert all_at_least(array("Q", [0, 5]), 0)
+    assert not all_at_least(array("q", [0, -5]), 0)
+    assert all_at_least([], 1)
+    assert not all_at_least([3, 0], 1)
+    assert batch_gcd(array("Q", [15, 21, 22, 35])) == [15, 21, 1, 35]
+    assert batch_mod_inverse(array("Q", [3, 10, 5]), 17) == [6, 12, 7]
+
+
+def test_recursive_variants_validate_once():
+    """Test that the memo moved to the kernels is still reachable"""
+    for func, misses in ((factorial_recursive, 50), (fibonacci_recursive, 51)):
+        func.cache_clear()
+        func(50)
+        assert func.cache_info().misses == misses
+    gcd_recursive.cache_clear()
+    assert gcd_recursive(48, 64) == 16
+    assert gcd_recursive.cache_info().misses > 1
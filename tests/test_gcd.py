@@ -1,5 +1,18 @@
 import pytest
-from advmath.gcd import gcd_iterative, gcd_recursive
+from advmath.gcd import (
+    CrtBasis,
+    _crt_basis,
+    batch_gcd,
+    crt,
+    batch_mod_inverse,
+    extended_gcd,
+    gcd_binary,
+    gcd_fast,
+    gcd_iterative,
+    gcd_lehmer,
+    gcd_recursive,
+    mod_inverse,
+)
 
 def test_gcd_iterative_basic():
     """Test basic GCD cases from lookup table"""
@@ -138,4 +151,165 @@ def test_gcd_properties():
     
     # GCD of coprime numbers should be 1
     assert gcd_iterative(7, 11) == 1
-    assert gcd_iterative(17, 19) == 1
\ No newline at end of file
+    assert gcd_iterative(17, 19) == 1
+
+def test_gcd_fast_methods():
+    """Test that every fast GCD method agrees with the Euclidean algorithm"""
+    test_cases = [
+        (0, 0), (0, 5), (5, 0), (48, 64), (101, 103), (2**64, 2**32 * 3),
+        (3**200 * 7, 3**150 * 11), (2**300 * 5**40, 2**250 * 5**60),
+    ]
+    for a, b in test_cases:
+        expected = gcd_iterative(a, b)
+        assert gcd_binary(a, b) == expected
+        assert gcd_lehmer(a, b) == expected
+        for method in ("auto", "euclid", "binary", "lehmer"):
+            assert gcd_fast(a, b, method=method) == expected
+
+
+def test_gcd_lehmer_large_operands():
+    """Test Lehmer GCD on multi-thousand-digit operands"""
+    import math
+    import random
+
+    rng = random.Random(26)
+    for _ in range(5):
+        common = rng.getrandbits(2000) | 1
+        a = rng.getrandbits(12000) * common
+        b = rng.getrandbits(12000) * common
+        assert gcd_lehmer(a, b) == math.gcd(a, b)
+        assert gcd_fast(a, b) == math.gcd(a, b)
+
+
+def test_gcd_fast_errors():
+    """Test validation and unknown method handling"""
+    with pytest.raises(ValueError, match="GCD is only defined for non-negative integers"):
+        gcd_fast(-1, 5)
+    with pytest.raises(ValueError, match="GCD is only defined for integers"):
+        gcd_binary(5.5, 10)
+    with pytest.raises(ValueError, match="GCD is only defined for integers"):
+        gcd_lehmer(5, 10.5)
+    with pytest.raises(ValueError, match="GCD method must be"):
+        gcd_fast(4, 6, method="magic")
+
+
+def test_extended_gcd():
+    """Test Bezout coefficients returned by extended GCD"""
+    test_cases = [(240, 46), (17, 0), (0, 17), (0, 0), (101, 103), (2**100, 3**60)]
+    for a, b in test_cases:
+        g, x, y = extended_gcd(a, b)
+        assert g == gcd_iterative(a, b)
+        assert a * x + b * y == g
+
+    with pytest.raises(ValueError, match="GCD is only defined for non-negative integers"):
+        extended_gcd(-4, 6)
+
+
+def test_mod_inverse():
+    """Test modular inverse and its error handling"""
+    assert mod_inverse(3, 11) == 4
+    assert mod_inverse(10, 17) == 12
+    assert mod_inverse(-3, 11) == 7
+    assert mod_inverse(5, 1) == 0
+
+    with pytest.raises(ValueError, match="6 is not invertible modulo 9"):
+        mod_inverse(6, 9)
+    with pytest.raises(ValueError, match="Modulus must be a positive integer"):
+        mod_inverse(3, 0)
+    with pytest.raises(ValueError, match="Modular inverse is only defined for integers"):
+        mod_inverse(3.0, 7)
+
+
+def test_batch_mod_inverse():
+    """Test Montgomery batch inversion against single inversions"""
+    m = 10**9 + 7
+    values = [1, 2, 3, m - 1, 123456789, 10**18]
+    assert batch_mod_inverse(values, m) == [mod_inverse(v, m) for v in values]
+    assert batch_mod_inverse([], m) == []
+    assert batch_mod_inverse(iter([3, 10, 5]), 17) == [6, 12, 7]
+
+    with pytest.raises(ValueError, match="4 is not invertible modulo 12"):
+        batch_mod_inverse([5, 4, 7], 12)
+    with pytest.raises(ValueError, match="Modular inverse is only defined for integers"):
+        batch_mod_inverse([5, 2.5], 12)
+
+
+def test_batch_gcd():
+    """Test batch GCD against pairwise products"""
+    import math
+
+    values = [15, 21, 22, 35, 101, 2**61 - 1, (2**61 - 1) * 3]
+    expected = [
+        math.gcd(x, math.prod(values[:i] + values[i + 1:]))
+        for i, x in enumerate(values)
+    ]
+    assert batch_gcd(values) == expected
+    assert batch_gcd([7, 11, 13]) == [1, 1, 1]
+    assert batch_gcd([9]) == [1]
+    assert batch_gcd([]) == []
+
+
+def test_batch_gcd_spill_to_disk(tmp_path):
+    """Test that spilling tree levels to disk gives identical results"""
+    values = [p * q for p, q in [(101, 103), (103, 107), (109, 113), (127, 131), (137, 139)]]
+    assert batch_gcd(values, spill_dir=tmp_path) == batch_gcd(values)
+    assert batch_gcd(values, spill_dir=tmp_path) == [103, 103, 1, 1, 1]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_batch_gcd_errors():
+    """Test batch GCD input validation"""
+    with pytest.raises(ValueError, match="Batch GCD is only defined for positive integers"):
+        batch_gcd([4, 0])
+    with pytest.raises(ValueError, match="GCD is only defined for integers"):
+        batch_gcd([4, 6.0])
+
+
+def test_crt_coprime():
+    """Test CRT over pairwise coprime moduli"""
+    assert crt([2, 3, 2], [3, 5, 7]) == 23
+    assert crt([-1, 7, 0], [3, 5, 7]) == 77
+    assert crt([], []) == 0
+    assert crt([5], [1]) == 0
+    moduli = [2**61 - 1, 2**89 - 1, 2**107 - 1, 4, 3, 5, 7, 11, 13, 17, 19, 23]
+    basis = CrtBasis(moduli)
+    x = 12345678901234567890123456789
+    assert basis.solve([x % m for m in moduli]) == x % basis.modulus
+
+
+def test_crt_non_coprime():
+    """Test CRT when moduli share factors"""
+    assert crt([3, 5], [4, 6]) == 11
+    assert crt([1, 1, 1], [6, 10, 15]) == 1
+    assert crt([2, 2, 3, 3], [4, 8, 9, 5]) == 138
+    assert CrtBasis([4, 6, 9]).modulus == 36
+    for x in range(0, 360):
+        moduli = [12, 5, 8, 30, 9]
+        assert crt([x % m for m in moduli], moduli) == x
+    with pytest.raises(ValueError, match="Inconsistent"):
+        crt([0, 1], [4, 6])
+    with pytest.raises(ValueError, match="Inconsistent"):
+        crt([1, 2, 0], [3, 7, 6])
+
+
+def test_crt_reuses_basis():
+    """Test that repeated moduli reuse the precomputed tree"""
+    _crt_basis.cache_clear()
+    moduli = [7, 11, 13]
+    for x in range(20):
+        assert crt([x % m for m in moduli], moduli) == x
+    assert _crt_basis.cache_info().misses == 1
+
+
+def test_crt_invalid_inputs():
+    """Test CRT error handling"""
+    with pytest.raises(ValueError):
+        crt([1, 2], [3])
+    with pytest.raises(ValueError):
+        crt([1], [0])
+    with pytest.raises(ValueError):
+        crt([1], [-5])
+    with pytest.raises(ValueError):
+        crt([1.5], [3])
+    with pytest.raises(ValueError):
+        crt([1], [3.0])
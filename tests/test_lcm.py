@@ -3,7 +3,7 @@ Tests for the LCM (Least Common Multiple) calculator module
 """
 
 import pytest
-from advmath.lcm import lcm_iterative, lcm_recursive
+from advmath.lcm import LcmAccumulator, lcm_iterative, lcm_range, lcm_range_log, lcm_recursive
 
 
 class TestLCMIterative:
@@ -160,4 +160,93 @@ class TestLCMConsistency:
             (100, 200),
         ]
         for a, b in test_cases:
-            assert lcm_iterative(a, b) == lcm_recursive(a, b)
\ No newline at end of file
+            assert lcm_iterative(a, b) == lcm_recursive(a, b)
+
+
+class TestLCMRange:
+    """Test cases for the LCM of 1..n"""
+
+    def test_matches_fold(self):
+        """Test that lcm_range agrees with folding lcm_iterative"""
+        expected = 1
+        for n in range(1, 80):
+            expected = lcm_iterative(expected, n)
+            assert lcm_range(n) == expected
+
+    def test_small_bounds(self):
+        """Test the empty and trivial ranges"""
+        assert lcm_range(0) == 1
+        assert lcm_range(1) == 1
+        assert lcm_range(10) == 2520
+
+    def test_modular(self):
+        """Test the modular variant"""
+        for n in (0, 1, 10, 50, 500):
+            assert lcm_range(n, modulus=10**9 + 7) == lcm_range(n) % (10**9 + 7)
+        assert lcm_range(10, modulus=1) == 0
+
+    def test_log(self):
+        """Test that the log variant matches the size of the exact result"""
+        import math
+
+        assert lcm_range_log(0) == 0.0
+        for n in (10, 100, 1000):
+            assert lcm_range_log(n) == pytest.approx(math.log(lcm_range(n)))
+
+    def test_invalid_input(self):
+        """Test that invalid inputs are rejected"""
+        with pytest.raises(ValueError):
+            lcm_range(-1)
+        with pytest.raises(TypeError):
+            lcm_range(2.5)
+        with pytest.raises(ValueError):
+            lcm_range(10, modulus=0)
+        with pytest.raises(TypeError):
+            lcm_range_log(2.5)
+
+
+
+class TestLcmAccumulator:
+    """Test cases for the streaming LCM accumulator"""
+
+    def test_matches_fold(self):
+        """Test that the accumulator agrees with folding lcm_iterative"""
+        values = [4, 6, 10, 1009, 1009 * 1013, 2**70 + 1, 3**5, 9999991, 12]
+        for bound in (0, 10, 1000):
+            acc = LcmAccumulator(smooth_bound=bound)
+            expected = 1
+            for x in values:
+                acc.add(x)
+                expected = lcm_iterative(expected, x)
+                assert acc.value == expected
+                assert acc.bit_length() == expected.bit_length()
+
+    def test_empty_and_zero(self):
+        """Test the empty accumulator and absorbing zero"""
+        acc = LcmAccumulator()
+        assert acc.value == 1
+        assert acc.divides(1)
+        assert not acc.divides(2)
+        acc.update([5, 0, 7])
+        assert acc.value == 0
+        assert acc.divides(123)
+
+    def test_divides(self):
+        """Test divisibility checks against the materialised value"""
+        acc = LcmAccumulator([12, 35, 2003 * 2011], smooth_bound=100)
+        for x in range(1, 500):
+            assert acc.divides(x) == (acc.value % x == 0)
+        assert acc.divides(2003)
+        assert acc.divides(4 * 2011)
+        assert not acc.divides(2003**2)
+        assert not acc.divides(0)
+
+    def test_invalid_input(self):
+        """Test that invalid inputs are rejected"""
+        acc = LcmAccumulator()
+        with pytest.raises(ValueError):
+            acc.add(-3)
+        with pytest.raises(TypeError):
+            acc.add(2.0)
+        with pytest.raises(TypeError):
+            acc.divides("4")
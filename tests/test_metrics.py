@@ -0,0 +1,155 @@
+"""
+Tests for the opt-in metrics registry
+"""
+
+import threading
+
+import advmath
+import pytest
+from advmath import metrics
+from advmath.gcd import gcd_iterative
+from advmath.registry import compute
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test disabled and with zeroed counters."""
+    metrics.disable()
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_by_default():
+    """Test that nothing is wrapped or recorded until enabled"""
+    assert not metrics.is_enabled()
+    assert advmath.gcd_iterative is gcd_iterative
+    advmath.gcd_iterative(4, 6)
+    assert metrics.snapshot()["functions"] == {}
+
+
+def test_enable_records_calls():
+    """Test call counts, errors and histograms"""
+    metrics.enable()
+    assert advmath.gcd_iterative is not gcd_iterative
+    assert compute("gcd", 48, 64, method="iterative") == 16
+    advmath.gcd_iterative(2**100, 3)
+    with pytest.raises(ValueError):
+        advmath.factorial_iterative(-1)
+
+    functions = metrics.snapshot()["functions"]
+    gcd = functions["gcd_iterative"]
+    assert (gcd["calls"], gcd["errors"]) == (2, 0)
+    assert gcd["input_bits_sum"] == 7 + 101
+    assert gcd["latency_buckets"][-1][1] == 2
+    assert [count for _, count in gcd["input_bits_buckets"]][:3] == [1, 1, 2]
+    assert functions["factorial_iterative"]["errors"] == 1
+
+    metrics.disable()
+    assert advmath.gcd_iterative is gcd_iterative
+
+
+def test_non_calculations_are_not_wrapped():
+    """Test that backend selection and generators are left alone"""
+    from advmath.arithmetic import divisors
+    from advmath.backend import get_backend, set_backend
+
+    metrics.enable()
+    assert advmath.get_backend is get_backend
+    assert advmath.set_backend is set_backend
+    assert advmath.divisors is divisors
+    advmath.get_backend()
+    assert "get_backend" not in metrics.snapshot()["functions"]
+
+
+def test_cache_hit_ratio():
+    """Test that lru_cache statistics are reported"""
+    metrics.enable()
+    advmath.fibonacci_recursive.cache_clear()
+    advmath.fibonacci_recursive(20)
+    cache = metrics.snapshot()["caches"]["advmath.fibonacci.fibonacci_recursive"]
+    assert cache["misses"] == 21
+    assert 0 < cache["hit_ratio"] < 1
+
+
+def test_threads_are_aggregated():
+    """Test that per-thread counters are summed in snapshots"""
+    metrics.enable()
+
+    def work():
+        for n in range(100):
+            advmath.is_prime_iterative(n)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["functions"]["is_prime_iterative"]["calls"] == 400
+    # Exited threads are folded into one table instead of piling up.
+    assert not any(
+        "is_prime_iterative" in table for table in metrics._tables if table is not metrics._retired
+    )
+    assert metrics._retired["is_prime_iterative"].calls == 400
+
+
+@pytest.mark.parametrize("metrics_first", [True, False])
+def test_stacks_with_disk_cache(tmp_path, metrics_first):
+    """Test that metrics and the disk cache both work in either order"""
+    from advmath import diskcache
+
+    path = str(tmp_path / "cache.sqlite3")
+    if metrics_first:
+        metrics.enable()
+    cache = diskcache.enable(path, min_seconds=0)
+    if not metrics_first:
+        metrics.enable()
+    try:
+        assert advmath.factorial_iterative(3000) == advmath.factorial_iterative(3000)
+        assert (cache.stats()["entries"], cache.hits) == (1, 1)
+        # Inside the cache, metrics only sees the call that was computed.
+        calls = metrics.snapshot()["functions"]["factorial_iterative"]["calls"]
+        assert calls == (1 if metrics_first else 2)
+    finally:
+        if metrics_first:
+            diskcache.disable()
+            metrics.disable()
+        else:
+            metrics.disable()
+            diskcache.disable()
+    from advmath.factorial import factorial_iterative
+
+    assert advmath.factorial_iterative is factorial_iterative
+
+
+def test_disable_keeps_later_wrappers(tmp_path):
+    """Test that disabling leaves wrappers installed afterwards in place"""
+    from advmath import diskcache
+
+    metrics.enable()
+    instrumented = advmath.factorial_native
+    diskcache.enable(str(tmp_path / "cache.sqlite3"))
+    try:
+        cached = advmath.factorial_native
+        assert cached is not instrumented
+        metrics.disable()
+        assert advmath.factorial_native is cached
+        from advmath.gcd import extended_gcd
+
+        assert advmath.extended_gcd is extended_gcd
+    finally:
+        diskcache.disable()
+
+
+def test_prometheus_text():
+    """Test the text exposition format"""
+    metrics.observe("request:gcd", 0.002, 64)
+    text = metrics.prometheus_text()
+    assert "# TYPE advmath_calls_total counter" in text
+    assert 'advmath_calls_total{function="request:gcd"} 1' in text
+    assert 'advmath_call_seconds_bucket{function="request:gcd",le="0.001"} 0' in text
+    assert 'advmath_call_seconds_bucket{function="request:gcd",le="0.01"} 1' in text
+    assert 'advmath_input_bits_bucket{function="request:gcd",le="64"} 1' in text
+    assert 'advmath_call_seconds_count{function="request:gcd"} 1' in text
+    assert text.endswith("\n")
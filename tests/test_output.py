@@ -0,0 +1,98 @@
+"""
+Tests for big integer output
+"""
+
+import io
+import math
+import random
+import sys
+
+import pytest
+from advmath.output import (
+    iter_decimal,
+    iter_format,
+    save_int,
+    to_decimal_string,
+    to_raw_bytes,
+    write_int,
+)
+
+
+@pytest.fixture
+def unlimited_str():
+    """Lift the int-to-str digit limit so str() can be used as a reference."""
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(previous)
+
+
+class TestDecimal:
+    """Test cases for the divide-and-conquer decimal conversion"""
+
+    def test_small_values(self):
+        """Test values converted directly"""
+        assert to_decimal_string(0) == "0"
+        assert to_decimal_string(120) == "120"
+        assert to_decimal_string(-120) == "-120"
+
+    def test_matches_str(self, unlimited_str):
+        """Test large values against str(), including zero-padded leaves"""
+        rng = random.Random(36)
+        values = [10**5000, 10**5000 - 1, 10**12345 + 7, math.factorial(3000)]
+        values += [rng.getrandbits(bits) for bits in (8001, 20000, 70000)]
+        for n in values:
+            assert to_decimal_string(n) == str(n)
+            assert to_decimal_string(-n) == str(-n)
+
+    def test_beats_digit_limit(self):
+        """Test that results beyond the default 4300 digit limit convert"""
+        digits = "".join(iter_decimal(10**9999))
+        assert digits == "1" + "0" * 9999
+
+    def test_streams_in_chunks(self):
+        """Test that large values are produced in several chunks"""
+        assert len(list(iter_decimal(10**20000))) > 1
+
+
+class TestFormats:
+    """Test cases for hex, binary and raw output"""
+
+    def test_hex_and_bin(self):
+        """Test text formats against format()"""
+        rng = random.Random(36)
+        for n in [0, 1, 255, -255, rng.getrandbits(1 << 20)]:
+            assert "".join(iter_format(n, "hex")) == format(n, "x")
+            assert "".join(iter_format(n, "bin")) == format(n, "b")
+
+    def test_raw(self):
+        """Test big-endian raw bytes"""
+        assert to_raw_bytes(0) == b"\x00"
+        assert to_raw_bytes(0x1234) == b"\x12\x34"
+        with pytest.raises(ValueError, match="Raw output requires a non-negative integer"):
+            to_raw_bytes(-1)
+
+    def test_write_int(self):
+        """Test writing to text and binary streams"""
+        out = io.StringIO()
+        write_int(10**6000, out)
+        assert out.getvalue() == "1" + "0" * 6000
+        raw = io.BytesIO()
+        write_int(0xABCDEF, raw, "raw")
+        assert raw.getvalue() == b"\xab\xcd\xef"
+        with pytest.raises(ValueError, match="Format must be"):
+            write_int(5, out, "oct")
+        with pytest.raises(TypeError):
+            write_int(5.0, out)
+
+    def test_save_int(self, tmp_path):
+        """Test writing files, raw output through mmap"""
+        n = math.factorial(2000)
+        raw = tmp_path / "n.raw"
+        assert save_int(n, raw, "raw") == len(to_raw_bytes(n))
+        assert int.from_bytes(raw.read_bytes(), "big") == n
+        text = tmp_path / "n.hex"
+        save_int(n, text, "hex")
+        assert int(text.read_text(), 16) == n
+        dec = tmp_path / "n.dec"
+        assert save_int(n, dec) == len(to_decimal_string(n))
@@ -160,4 +160,13 @@ def test_power_properties():
     assert power_iterative(0, 5) == 0
 
     # Multiplication property
-    assert power_iterative(2, 3) * power_iterative(3, 3) == power_iterative(6, 3)
\ No newline at end of file
+    assert power_iterative(2, 3) * power_iterative(3, 3) == power_iterative(6, 3)
+
+def test_power_iterative_float_base_under_budget():
+    """Test that a float base works while a result-size budget is active"""
+    from advmath.cost import BudgetExceededError, budget
+
+    with budget(max_result_bits=10):
+        assert power_iterative(1.5, 10) == 1.5**10
+        with pytest.raises(BudgetExceededError):
+            power_iterative(3, 100)
@@ -3,7 +3,16 @@ Tests for the Prime Number Checker module
 """
 
 import pytest
-from advmath.prime import is_prime_iterative, is_prime_recursive
+from advmath.prime import (
+    PrimalityCertificate,
+    clear_certificates,
+    is_prime_iterative,
+    is_prime_miller_rabin,
+    is_prime_recursive,
+    prime_certificate,
+    primes_up_to,
+    verify_certificate,
+)
 
 
 class TestIsPrimeIterative:
@@ -227,4 +236,128 @@ class TestIsPrimeConsistency:
         assert is_prime_iterative(103) == is_prime_recursive(103)
         assert is_prime_iterative(997) == is_prime_recursive(997)
         assert is_prime_iterative(1001) == is_prime_iterative(1001)
-        assert is_prime_iterative(1009) == is_prime_iterative(1009)
\ No newline at end of file
+        assert is_prime_iterative(1009) == is_prime_iterative(1009)
+
+
+class TestPrimesUpTo:
+    """Test cases for the prime sieve"""
+
+    def test_small_bounds(self):
+        """Test bounds below and around the first primes"""
+        assert primes_up_to(0) == []
+        assert primes_up_to(1) == []
+        assert primes_up_to(2) == [2]
+        assert primes_up_to(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+
+    def test_matches_primality_test(self):
+        """Test that the sieve agrees with the iterative primality test"""
+        expected = [n for n in range(1000) if is_prime_iterative(n)]
+        assert primes_up_to(999) == expected
+
+    def test_invalid_input(self):
+        """Test that invalid bounds are rejected"""
+        with pytest.raises(ValueError):
+            primes_up_to(-1)
+        with pytest.raises(TypeError):
+            primes_up_to(10.0)
+
+
+
+class TestIsPrimeMillerRabin:
+    """Test cases for the Miller–Rabin primality test"""
+
+    def test_matches_sieve(self):
+        """Test agreement with the sieve on a full range"""
+        primes = set(primes_up_to(20000))
+        for n in range(20001):
+            assert is_prime_miller_rabin(n) == (n in primes)
+
+    def test_strong_pseudoprimes(self):
+        """Test composites that fool small sets of bases"""
+        assert is_prime_miller_rabin(3215031751) == False
+        assert is_prime_miller_rabin(3825123056546413051) == False
+        assert is_prime_miller_rabin(318665857834031151167461) == False
+
+    def test_large_numbers(self):
+        """Test large primes and composites, including the probabilistic range"""
+        assert is_prime_miller_rabin(10**12 + 39) == True
+        assert is_prime_miller_rabin(2**127 - 1) == True
+        assert is_prime_miller_rabin((2**61 - 1) * (2**89 - 1)) == False
+
+    def test_invalid_input(self):
+        """Test that invalid inputs are rejected"""
+        with pytest.raises(ValueError):
+            is_prime_miller_rabin(-7)
+        with pytest.raises(TypeError):
+            is_prime_miller_rabin(7.0)
+
+
+class TestPrimalityCertificates:
+    """Test cases for certificate generation, verification and the cache"""
+
+    @pytest.fixture(autouse=True)
+    def forget(self):
+        """Start and end every test without proven primes."""
+        clear_certificates()
+        yield
+        clear_certificates()
+
+    def test_round_trip(self):
+        """Test that certificates verify after serialisation"""
+        for n in (2, 97, 2**61 - 1, 2**127 - 1):
+            cert = prime_certificate(n)
+            data = cert.to_bytes()
+            assert PrimalityCertificate.from_bytes(data) == cert
+            assert verify_certificate(PrimalityCertificate.from_bytes(data))
+        assert prime_certificate(2**61 - 1).steps == ()
+
+    def test_bls_and_recursive_steps(self):
+        """Test a step with F < sqrt(n) and a proof with two steps"""
+        n = 1088736533075791039887641574503
+        cert = prime_certificate(n)
+        factored = 2 * 17 * 934194314861
+        assert (n - 1) % factored == 0 and factored**2 < n <= factored**3
+        assert verify_certificate(cert)
+
+        n = 1104634716630602621625635556977
+        cert = prime_certificate(n)
+        assert [p for p, _ in cert.steps] == [69039669789412663851602222311, n]
+        assert verify_certificate(cert)
+
+    def test_forged_certificates(self):
+        """Test that wrong witnesses, factors or numbers are rejected"""
+        n = 2**127 - 1
+        ((p, witnesses),) = prime_certificate(n).steps
+        clear_certificates()
+        (q, a), *rest = witnesses
+        assert not verify_certificate(PrimalityCertificate(n, ((p, ((q, 1), *rest)),)))
+        # Too little of n - 1 factored.
+        assert not verify_certificate(PrimalityCertificate(n, ((p, ((q, a),)),)))
+        assert not verify_certificate(PrimalityCertificate(n + 2, ((p, witnesses),)))
+        composite = (2**61 - 1) * (2**89 - 1)
+        assert not verify_certificate(PrimalityCertificate(composite, ((composite, ((2, 3),)),)))
+        assert not verify_certificate(PrimalityCertificate(2**64 + 1, ()))
+        assert not verify_certificate("not a certificate")
+
+    def test_invalid_input(self):
+        """Test composites, bad types and malformed data"""
+        with pytest.raises(ValueError, match="is not prime"):
+            prime_certificate(2**64 + 1)
+        with pytest.raises(ValueError):
+            prime_certificate(-7)
+        with pytest.raises(TypeError):
+            prime_certificate(7.0)
+        data = prime_certificate(2**89 - 1).to_bytes()
+        with pytest.raises(ValueError, match="Truncated"):
+            PrimalityCertificate.from_bytes(data[:-1])
+        with pytest.raises(ValueError, match="Not a primality certificate"):
+            PrimalityCertificate.from_bytes(b"XXXX")
+
+    def test_proven_primes_are_cached(self):
+        """Test that is_prime_* answer proven primes without testing"""
+        n = 2**127 - 1
+        assert verify_certificate(prime_certificate(n))
+        # Trial division would never finish on a 127-bit prime.
+        assert is_prime_iterative(n) == True
+        assert is_prime_recursive(n) == True
+        assert is_prime_miller_rabin(n) == True
@@ -0,0 +1,48 @@
+"""
+Tests for the timing and profiling helpers
+"""
+
+import io
+import pstats
+
+import pytest
+from advmath.fibonacci import fibonacci_recursive
+from advmath.profiling import cache_info, measure, profiled
+
+
+def test_measure_reports_cache_activity():
+    """Test that measure() records times and lru_cache hits/misses"""
+    fibonacci_recursive.cache_clear()
+    with measure() as stats:
+        fibonacci_recursive(30)
+        fibonacci_recursive(30)
+    assert stats["wall_seconds"] >= 0
+    assert stats["cpu_seconds"] >= 0
+    assert stats["cache_misses"] == 31
+    assert stats["cache_hits"] >= 1
+    assert "advmath.fibonacci.fibonacci_recursive" in cache_info()
+
+
+def test_measure_fills_stats_on_error():
+    """Test that stats are available even when the block raises"""
+    with pytest.raises(ValueError):
+        with measure() as stats:
+            raise ValueError("boom")
+    assert "wall_seconds" in stats
+
+
+def test_profiled_outputs(tmp_path):
+    """Test printed and file profiles"""
+    out = io.StringIO()
+    with profiled("cprofile", stream=out):
+        fibonacci_recursive.cache_clear()
+        fibonacci_recursive(50)
+    assert "fibonacci_recursive" in out.getvalue()
+
+    path = tmp_path / "run.stats"
+    with profiled(str(path)):
+        sum(range(100))
+    assert pstats.Stats(str(path)).total_calls >= 1
+
+    with profiled(None):
+        pass
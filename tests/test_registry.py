@@ -0,0 +1,126 @@
+"""
+Tests for the algorithm registry and automatic method selection
+"""
+
+import json
+
+import pytest
+from advmath import registry
+from advmath.backend import get_backend, set_backend
+from advmath.gcd import _euclid_kernel, _lehmer_kernel, _select_gcd_kernel
+from advmath.registry import (
+    DEFAULT_THRESHOLDS,
+    available_methods,
+    compute,
+    load_thresholds,
+    save_thresholds,
+    select_method,
+    set_thresholds,
+)
+
+
+@pytest.fixture(autouse=True)
+def default_thresholds():
+    """Isolate every test from the user's config file and backend choice."""
+    set_thresholds(DEFAULT_THRESHOLDS)
+    backend = get_backend()
+    yield
+    set_thresholds(None)
+    set_backend(backend)
+
+
+@pytest.fixture
+def python_backend():
+    """Select the pure Python backend, under which thresholds apply."""
+    set_backend("python")
+
+
+class TestSelection:
+    """Test cases for method resolution"""
+
+    def test_every_method_agrees(self):
+        """Test that all registered methods give the same answers"""
+        cases = {
+            "factorial": [(0,), (10,)],
+            "fibonacci": [(0,), (20,)],
+            "power": [(3, 7), (-2, 5)],
+            "gcd": [(48, 64), (0, 7)],
+            "lcm": [(4, 6), (0, 3)],
+            "prime": [(1,), (97,), (1001,)],
+        }
+        for op, arg_list in cases.items():
+            for args in arg_list:
+                results = {compute(op, *args, method=m) for m in available_methods(op)}
+                assert len(results) == 1, (op, args)
+
+    def test_auto_uses_thresholds(self, python_backend):
+        """Test that auto switches algorithm at the configured crossover"""
+        assert select_method("prime", 97) == "iterative"
+        assert select_method("prime", 1 << 20) == "miller_rabin"
+        assert select_method("gcd", 48, 64) == "iterative"
+        assert select_method("gcd", 1 << 9000, 3) == "lehmer"
+        assert select_method("factorial", 10**6) == "iterative"
+
+        set_thresholds({"prime_miller_rabin_min": 10})
+        assert select_method("prime", 11) == "miller_rabin"
+
+    def test_gcd_kernels_use_thresholds(self):
+        """Test that gcd_fast's auto kernel follows the registry threshold"""
+        assert _select_gcd_kernel(1 << 100, 3) is _euclid_kernel
+        set_thresholds({"gcd_lehmer_bits": 64})
+        assert _select_gcd_kernel(1 << 100, 3) is _lehmer_kernel
+        assert _select_gcd_kernel(48, 64) is _euclid_kernel
+
+    def test_auto_prefers_native_backend(self):
+        """Test that auto uses a C backend wherever one exists"""
+        set_backend("stdlib")
+        assert select_method("gcd", 48, 64) == "native"
+        assert select_method("factorial", 10**6) == "native"
+        assert select_method("power", 3, 100) == "native"
+        assert select_method("prime", 97) == "iterative"
+        assert select_method("fibonacci", 10) == "iterative"
+
+    def test_invalid_methods(self):
+        """Test errors for unknown methods and operations"""
+        with pytest.raises(ValueError, match="Method must be 'auto', 'iterative', 'native' or 'recursive'"):
+            compute("factorial", 5, method="magic")
+        with pytest.raises(ValueError, match="Unknown operation"):
+            compute("sqrt", 4)
+
+    def test_validation_errors_pass_through(self):
+        """Test that auto leaves input validation to the implementation"""
+        with pytest.raises(ValueError, match="Factorial is only defined for integers"):
+            compute("factorial", 5.5)
+
+
+class TestConfig:
+    """Test cases for saving and loading thresholds"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that saved thresholds are loaded and activated"""
+        path = str(tmp_path / "sub" / "thresholds.json")
+        save_thresholds({"prime_miller_rabin_min": 1234, "gcd_lehmer_bits": 99}, path)
+        assert load_thresholds(path) == {"prime_miller_rabin_min": 1234, "gcd_lehmer_bits": 99}
+        assert registry.get_thresholds()["prime_miller_rabin_min"] == 1234
+
+    def test_bad_files_fall_back_to_defaults(self, tmp_path):
+        """Test missing, malformed and partial config files"""
+        assert load_thresholds(str(tmp_path / "missing.json")) == DEFAULT_THRESHOLDS
+        bad = tmp_path / "bad.json"
+        bad.write_text("not json")
+        assert load_thresholds(str(bad)) == DEFAULT_THRESHOLDS
+        partial = tmp_path / "partial.json"
+        partial.write_text(json.dumps({"thresholds": {"gcd_lehmer_bits": 5, "other": 1}}))
+        assert load_thresholds(str(partial)) == {**DEFAULT_THRESHOLDS, "gcd_lehmer_bits": 5}
+
+    def test_env_var(self, tmp_path, monkeypatch):
+        """Test that ADVMATH_CONFIG selects the config file"""
+        path = tmp_path / "env.json"
+        monkeypatch.setenv("ADVMATH_CONFIG", str(path))
+        assert registry.config_path() == str(path)
+
+    def test_calibrate_quick(self):
+        """Test that calibration returns a complete set of thresholds"""
+        thresholds = registry.calibrate(repeat=1, quick=True)
+        assert set(thresholds) == set(DEFAULT_THRESHOLDS)
+        assert all(isinstance(v, int) and v > 0 for v in thresholds.values())
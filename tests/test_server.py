@@ -0,0 +1,129 @@
+"""
+Tests for the calculation server and its client
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from advmath.client import Client
+from advmath import metrics
+from advmath.server import _runs_inline, start_metrics_server, start_server
+
+
+@pytest.fixture
+def socket_path(request, tmp_path):
+    """Run a server on a Unix socket in a background event loop.
+
+    Indirect parametrization passes extra keyword arguments to start_server.
+    """
+    path = str(tmp_path / "advmath.sock")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    executor = ThreadPoolExecutor(max_workers=2)
+    server = asyncio.run_coroutine_threadsafe(
+        start_server(path=path, executor=executor, **getattr(request, "param", {})), loop
+    ).result(5)
+    yield path
+
+    async def shutdown():
+        server.close()
+        await server.wait_closed()
+        current = asyncio.current_task()
+        await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not current))
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    executor.shutdown()
+
+
+class TestServer:
+    """Test cases for the request/response protocol"""
+
+    def test_call(self, socket_path):
+        """Test single calls, inline and offloaded"""
+        with Client(path=socket_path, timeout=10) as client:
+            assert client.call("gcd", 48, 64) == 16
+            assert client.call("lcm", 4, 6, method="recursive") == 12
+            assert client.call("prime", 97) is True
+            assert client.call("prime", 10**11 + 3) is True
+            with pytest.raises(ValueError, match="Factorial is not defined for negative numbers"):
+                client.call("fact", -1)
+
+    def test_pipeline_keeps_order(self, socket_path):
+        """Test that pipelined responses come back in request order"""
+        requests = [{"op": "fact", "args": [n % 20], "id": n} for n in range(600)]
+        requests.insert(5, {"op": "prime", "args": [10**12 + 39], "id": "slow"})
+        with Client(path=socket_path, timeout=10) as client:
+            responses = client.pipeline(requests)
+        assert [r["id"] for r in responses] == [r["id"] for r in requests]
+        assert responses[5]["result"] is True
+        assert responses[6]["result"] == 120
+
+    def test_invalid_json(self, socket_path):
+        """Test that a malformed line yields an inline error"""
+        with Client(path=socket_path, timeout=10) as client:
+            client._file.write(b"not json\n")
+            client._file.flush()
+            assert client._receive()["error"].startswith("Invalid JSON")
+            assert client.call("gcd", 4, 6) == 2
+
+    @pytest.mark.parametrize("socket_path", [{"max_result_bits": 100}], indirect=True)
+    def test_budget(self, socket_path):
+        """Test that the server budget applies to inline and offloaded requests"""
+        with Client(path=socket_path, timeout=10) as client:
+            assert client.call("fact", 20) == 2432902008176640000
+            with pytest.raises(ValueError, match="budget of 100 bits"):
+                client.call("fact", 100)
+            with pytest.raises(ValueError, match="budget of 100 bits"):
+                client.call("fact", 10**6)
+            (response,) = client.pipeline(
+                [{"op": "fact", "args": [100], "max_result_bits": 1000}]
+            )
+            assert response["result"] % 10**24 == 0
+
+
+def test_runs_inline():
+    """Test the inline/offload decision"""
+    assert _runs_inline({"op": "fact", "args": [10]})
+    assert not _runs_inline({"op": "fact", "args": [10**6]})
+    assert _runs_inline({"op": "prime", "args": [97]})
+    assert not _runs_inline({"op": "prime", "args": [10**20]})
+    assert not _runs_inline({"op": "gcd", "args": [2**20000, 3]})
+    assert _runs_inline({"op": "gcd", "args": "bad"})
+    assert _runs_inline([1, 2])
+
+
+def test_metrics_endpoint():
+    """Test GET /metrics and 404 for anything else"""
+
+    async def fetch(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data.decode()
+
+    async def main():
+        server = await start_metrics_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            metrics.observe("request:fact", 0.5)
+            return await fetch(port, "/metrics"), await fetch(port, "/")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    try:
+        found, missing = asyncio.run(main())
+    finally:
+        metrics.disable()
+        metrics.reset()
+    assert found.startswith("HTTP/1.0 200 OK")
+    assert 'advmath_calls_total{function="request:fact"} 1' in found
+    assert missing.startswith("HTTP/1.0 404")
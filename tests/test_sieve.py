@@ -0,0 +1,74 @@
+"""
+Tests for the multiplicative function tables
+"""
+
+import math
+
+import pytest
+from advmath.sieve import SIEVE_FUNCTIONS, linear_sieve, open_table, sieve_segments, write_tables
+
+N = 600
+
+
+def _brute(k):
+    """(phi, mu, d, sigma) of k by definition."""
+    if k == 0:
+        return 0, 0, 0, 0
+    divisors = [x for x in range(1, k + 1) if k % x == 0]
+    phi = sum(1 for x in range(1, k + 1) if math.gcd(x, k) == 1)
+    squarefree = all(k % (x * x) for x in range(2, math.isqrt(k) + 1))
+    primes = [x for x in divisors if x > 1 and all(x % y for y in range(2, x))]
+    mu = (-1) ** len(primes) if squarefree else 0
+    return phi, mu, len(divisors), sum(divisors)
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return linear_sieve(N)
+
+
+def test_linear_sieve_matches_definitions(tables):
+    """Test every table entry against the definitions"""
+    for k in range(N + 1):
+        assert tuple(tables[name][k] for name in SIEVE_FUNCTIONS) == _brute(k)
+    assert [tables[name].typecode for name in SIEVE_FUNCTIONS] == ["I", "b", "H", "Q"]
+    assert list(linear_sieve(1, ["mu"])) == ["mu"]
+    assert linear_sieve(0)["phi"].tolist() == [0]
+
+
+def test_segments_match(tables):
+    """Test segmented tables for several segment sizes and a start"""
+    for size in (1, 7, 128, N + 10):
+        for lo, segment in sieve_segments(N, segment_size=size):
+            for name in SIEVE_FUNCTIONS:
+                values = segment[name]
+                assert values.typecode == tables[name].typecode
+                assert values.tolist() == tables[name][lo:lo + len(values)].tolist()
+    (lo, segment), = sieve_segments(N, ["sigma"], segment_size=N, start=500)
+    assert lo == 500 and segment["sigma"].tolist() == tables["sigma"][500:].tolist()
+
+
+def test_memory_mapped_tables(tables, tmp_path):
+    """Test writing tables to files and mapping them back"""
+    paths = write_tables(N, str(tmp_path), ["phi", "d"], segment_size=100)
+    assert sorted(paths) == ["d", "phi"]
+    for name in ("phi", "d"):
+        view = open_table(str(tmp_path), name)
+        assert view.tolist() == tables[name].tolist()
+        view.release()
+
+
+def test_invalid_input(tmp_path):
+    """Test rejected bounds, functions and segment sizes"""
+    with pytest.raises(TypeError):
+        linear_sieve(10.0)
+    with pytest.raises(ValueError, match="non-negative"):
+        linear_sieve(-1)
+    with pytest.raises(ValueError, match="below 2\\*\\*32"):
+        linear_sieve(2**32)
+    with pytest.raises(ValueError, match="Unknown function 'tau'"):
+        linear_sieve(10, ["tau"])
+    with pytest.raises(ValueError, match="Segment size"):
+        next(sieve_segments(10, segment_size=0))
+    with pytest.raises(ValueError, match="Unknown function"):
+        open_table(str(tmp_path), "tau")
@@ -0,0 +1,95 @@
+"""
+Tests guarding import time and the CLI fast path
+"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+from advmath.launcher import _parse
+
+# Extra wall time, over a bare interpreter start, allowed for a simple
+# fast-path invocation (best of three runs).  The fast path takes ~15 ms on a
+# typical machine; going through typer takes ~60 ms.
+STARTUP_BUDGET_SECONDS = 0.05
+
+
+def _python(*args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def _best_of(runs, *args):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        _python(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_import_is_lazy():
+    """Test that importing the package loads no submodule"""
+    result = _python(
+        "-c",
+        "import sys, advmath; print(sorted(m for m in sys.modules if m.startswith('advmath')))",
+    )
+    assert result.stdout.strip() == "['advmath']"
+
+
+def test_client_import_is_light():
+    """Test that the client loads neither the server nor asyncio"""
+    result = _python(
+        "-c",
+        "import sys, advmath.client\n"
+        "print(sorted(m for m in sys.modules if m.startswith('advmath')), 'asyncio' in sys.modules)",
+    )
+    assert result.stdout.strip() == "['advmath', 'advmath.client'] False"
+
+
+def test_lazy_attribute_access():
+    """Test that public names resolve on first access"""
+    import advmath
+
+    assert advmath.gcd_iterative(48, 64) == 16
+    assert "lcm_range" in dir(advmath)
+    with pytest.raises(AttributeError):
+        advmath.not_a_function
+
+
+def test_fast_path_skips_typer():
+    """Test that simple invocations never import typer"""
+    result = _python(
+        "-c",
+        "import sys\n"
+        "from advmath.launcher import main\n"
+        "try:\n"
+        "    main(['gcd', '48', '64'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('typer' in sys.modules, file=sys.stderr)",
+    )
+    assert result.stdout == "GCD of 48 and 64 is 16\n"
+    assert result.stderr.strip() == "False"
+
+
+def test_fast_path_parsing():
+    """Test which invocations take the fast path"""
+    assert _parse(["fact", "5", "-v"]) == ("fact", [5], "iterative", True)
+    assert _parse(["gcd", "4", "6", "--method", "recursive"]) == ("gcd", [4, 6], "recursive", False)
+    assert _parse(["lcm", "--method=x", "4", "6"]) == ("lcm", [4, 6], "x", False)
+    assert _parse(["gcd", "4"]) is None
+    assert _parse(["prime", "-v", "7"]) is None
+    assert _parse(["fact", "-1"]) is None
+    assert _parse(["fact", "--help"]) is None
+    assert _parse(["info"]) is None
+    assert _parse([]) is None
+
+
+def test_startup_budget():
+    """Benchmark: a fast-path invocation stays within the startup budget"""
+    baseline = _best_of(3, "-c", "pass")
+    fast = _best_of(3, "-m", "advmath", "fact", "10")
+    assert fast - baseline < STARTUP_BUDGET_SECONDS
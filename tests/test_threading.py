@@ -0,0 +1,117 @@
+"""
+Stress tests for concurrent use of the memoised kernels
+"""
+
+import math
+import random
+import threading
+
+import pytest
+from advmath import fast
+from advmath._memo import ShardedCache
+from advmath.factorial import factorial_recursive
+from advmath.fibonacci import fibonacci_iterative, fibonacci_recursive
+from advmath.gcd import gcd_recursive
+from advmath.lcm import lcm_recursive
+from advmath.prime import is_prime_recursive, primes_up_to
+from advmath.profiling import clear_caches
+
+THREADS = 16
+
+
+def _run_threads(target, count=THREADS):
+    errors = []
+    start = threading.Barrier(count)
+
+    def run(index):
+        try:
+            start.wait()
+            target(index)
+        except BaseException as exc:  # noqa: BLE001 – reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_sharded_cache():
+    """Test hit/miss accounting and clearing of the sharded memo"""
+    calls = []
+
+    @ShardedCache
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(x) for x in (3, 4, 3)] == [9, 16, 9]
+    info = square.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 2, None, 2)
+    assert square.__name__ == "square"
+    square.cache_clear()
+    assert square.cache_info().currsize == 0
+    assert square(3) == 9 and calls == [3, 4, 3]
+    with pytest.raises(ValueError):
+        ShardedCache(abs, shards=3)
+
+
+def test_sharded_cache_concurrent_misses():
+    """Test that racing threads all get the same stored value"""
+    cache = ShardedCache(lambda x: [x])
+    results = [None] * THREADS
+
+    def call(index):
+        for x in range(200):
+            value = cache(x)
+            assert value == [x]
+        results[index] = cache(0)
+
+    _run_threads(call)
+    assert all(value is results[0] for value in results)
+    assert cache.cache_info().currsize == 200
+
+
+def test_mixed_calls_from_many_threads():
+    """Test recursive kernels, batches and cache clears running together"""
+    primes = set(primes_up_to(5000))
+    fib = [fibonacci_iterative(n) for n in range(300)]
+
+    def work(index):
+        rng = random.Random(index)
+        for step in range(150):
+            choice = rng.randrange(6)
+            n = rng.randrange(1, 300)
+            if choice == 0:
+                assert factorial_recursive(n) == math.factorial(n)
+            elif choice == 1:
+                assert fibonacci_recursive(n) == fib[n]
+            elif choice == 2:
+                a, b = rng.getrandbits(64), rng.getrandbits(64)
+                assert gcd_recursive(a, b) == math.gcd(a, b)
+                assert lcm_recursive(a, b) == math.lcm(a, b)
+            elif choice == 3:
+                m = rng.randrange(5000)
+                assert is_prime_recursive(m) == (m in primes)
+            elif choice == 4:
+                column = [rng.randrange(5000) for _ in range(64)]
+                assert fast.batch("prime", column, workers=4) == [m in primes for m in column]
+            elif index == 0 or step % 50 == 0:
+                clear_caches()
+
+    _run_threads(work)
+
+
+def test_threaded_batch():
+    """Test that the thread-pool batch path matches the sequential one"""
+    rng = random.Random(46)
+    a = [rng.getrandbits(64) for _ in range(1000)]
+    b = [rng.getrandbits(64) for _ in range(1000)]
+    assert fast.batch("gcd", a, b, workers=8) == fast.batch("gcd", a, b)
+    assert fast.batch("factorial", [5], workers=3) == [120]
+    assert fast.batch("gcd", [], [], workers=2) == []
+    with pytest.raises(ValueError, match="workers must be a positive integer"):
+        fast.batch("gcd", a, b, workers=0)